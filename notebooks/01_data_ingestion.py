@@ -11,78 +11,26 @@
 
 # COMMAND ----------
 
-from pyspark.sql.types import StructType, StructField, StringType, IntegerType, DoubleType, BooleanType, DateType
+import os
+import sys
+
 from pyspark.sql.functions import col, sum, count, when, current_date, datediff
 
+# The notebook runs from notebooks/ in the repo: put the repo root on the path
+sys.path.append(os.path.abspath(".."))
+from src.pipelines.bronze_ingestion import compile_schema
+
 # COMMAND ----------
 # MAGIC %md
 # MAGIC ## 1. Define explicit schemas for type safety
 
 # COMMAND ----------
 
-# Campaigns Schema
-campaign_schema = StructType([
-    StructField("campaign_id", StringType(), True),
-    StructField("title_id", StringType(), True),
-    StructField("title_name", StringType(), True),
-    StructField("brand", StringType(), True),
-    StructField("brand_code", StringType(), True),
-    StructField("product", StringType(), True),
-    StructField("campaign_name", StringType(), True),
-    StructField("campaign_objective", StringType(), True),
-    StructField("targeting_geo", StringType(), True),
-    StructField("country", StringType(), True),
-    StructField("language", StringType(), True),
-    StructField("geo_cluster", StringType(), True),
-    StructField("region", StringType(), True),
-    StructField("channel", StringType(), True),
-    StructField("channel_mapped", StringType(), True),
-    StructField("platform", StringType(), True),
-    StructField("budget_usd", DoubleType(), True),
-    StructField("start_date", DateType(), True),
-    StructField("end_date", DateType(), True),
-    StructField("status", StringType(), True),
-    StructField("impressions_goal", IntegerType(), True),
-    StructField("flight_priority", IntegerType(), True),
-    StructField("audience_tactic", StringType(), True),
-    StructField("audience_strategy", StringType(), True),
-    StructField("audience_detailed", StringType(), True)
-])
-
-# Delivery Schema
-delivery_schema = StructType([
-    StructField("delivery_id", StringType(), True),
-    StructField("campaign_id", StringType(), True),
-    StructField("date", DateType(), True),
-    StructField("impressions", IntegerType(), True),
-    StructField("clicks", IntegerType(), True),
-    StructField("ctr", DoubleType(), True),
-    StructField("spend_usd", DoubleType(), True),
-    StructField("vast_errors", IntegerType(), True),
-    StructField("viewability_rate", DoubleType(), True)
-])
-
-# Tickets Schema
-ticket_schema = StructType([
-    StructField("ticket_id", StringType(), True),
-    StructField("campaign_id", StringType(), True),
-    StructField("title", StringType(), True),
-    StructField("request_type", StringType(), True),
-    StructField("routed_to_role", StringType(), True),
-    StructField("eve_eligible", BooleanType(), True),
-    StructField("urgency", StringType(), True),
-    StructField("stage", StringType(), True),
-    StructField("platform", StringType(), True),
-    StructField("targeting_geo", StringType(), True),
-    StructField("brand", StringType(), True),
-    StructField("requested_by", StringType(), True),
-    StructField("created_date", DateType(), True),
-    StructField("due_date", StringType(), True), # Storing as String datetime initially
-    StructField("assignee", StringType(), True),
-    StructField("assignee_role", StringType(), True),
-    StructField("sla_hours", IntegerType(), True),
-    StructField("notes", StringType(), True)
-])
+# Declared once in BRONZE_SCHEMAS (src/pipelines/bronze_ingestion.py) and
+# compiled to a Spark DDL string — spark.read.schema() takes it like a StructType
+campaign_schema = compile_schema("campaigns").spark_ddl
+delivery_schema = compile_schema("delivery").spark_ddl
+ticket_schema = compile_schema("tickets").spark_ddl
 
 # COMMAND ----------
 # MAGIC %md
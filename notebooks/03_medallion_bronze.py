@@ -54,89 +54,26 @@
 
 # COMMAND ----------
 
-from pyspark.sql.types import (
-    StructType, StructField, StringType, IntegerType, DoubleType,
-    BooleanType, DateType, TimestampType
-)
+import os
+import sys
+
 from pyspark.sql.functions import (
     col, current_timestamp, input_file_name, lit, to_date
 )
 from datetime import datetime
 
-# ─── Campaign Schema ──────────────────────────────────────────────────────
-campaign_schema = StructType([
-    StructField("campaign_id", StringType(), False),      # NOT NULL — primary key
-    StructField("title_id", StringType(), True),
-    StructField("title_name", StringType(), True),
-    StructField("brand", StringType(), True),
-    StructField("brand_code", StringType(), True),
-    StructField("product", StringType(), True),
-    StructField("campaign_name", StringType(), True),
-    StructField("campaign_objective", StringType(), True),
-    StructField("targeting_geo", StringType(), True),
-    StructField("country", StringType(), True),
-    StructField("language", StringType(), True),
-    StructField("geo_cluster", StringType(), True),
-    StructField("region", StringType(), True),
-    StructField("channel", StringType(), True),
-    StructField("channel_mapped", StringType(), True),
-    StructField("platform", StringType(), True),
-    StructField("budget_usd", DoubleType(), True),
-    StructField("start_date", DateType(), True),
-    StructField("end_date", DateType(), True),
-    StructField("status", StringType(), True),
-    StructField("impressions_goal", IntegerType(), True),
-    StructField("flight_priority", IntegerType(), True),
-    StructField("audience_tactic", StringType(), True),
-    StructField("audience_strategy", StringType(), True),
-    StructField("audience_detailed", StringType(), True),
-])
-
-# ─── Delivery Schema ──────────────────────────────────────────────────────
-delivery_schema = StructType([
-    StructField("delivery_id", StringType(), False),
-    StructField("campaign_id", StringType(), False),
-    StructField("date", DateType(), True),
-    StructField("impressions", IntegerType(), True),
-    StructField("clicks", IntegerType(), True),
-    StructField("ctr", DoubleType(), True),
-    StructField("spend_usd", DoubleType(), True),
-    StructField("vast_errors", IntegerType(), True),
-    StructField("viewability_rate", DoubleType(), True),
-])
-
-# ─── Tickets Schema ───────────────────────────────────────────────────────
-ticket_schema = StructType([
-    StructField("ticket_id", StringType(), False),
-    StructField("campaign_id", StringType(), True),
-    StructField("title", StringType(), True),
-    StructField("request_type", StringType(), True),
-    StructField("routed_to_role", StringType(), True),
-    StructField("eve_eligible", BooleanType(), True),
-    StructField("urgency", StringType(), True),
-    StructField("stage", StringType(), True),
-    StructField("platform", StringType(), True),
-    StructField("targeting_geo", StringType(), True),
-    StructField("brand", StringType(), True),
-    StructField("requested_by", StringType(), True),
-    StructField("created_date", DateType(), True),
-    StructField("due_date", StringType(), True),
-    StructField("assignee", StringType(), True),
-    StructField("assignee_role", StringType(), True),
-    StructField("sla_hours", IntegerType(), True),
-    StructField("notes", StringType(), True),
-])
-
-# ─── QA Checks Schema ─────────────────────────────────────────────────────
-qa_schema = StructType([
-    StructField("qa_id", StringType(), False),
-    StructField("ticket_id", StringType(), True),
-    StructField("check_name", StringType(), True),
-    StructField("check_details", StringType(), True),
-    StructField("result", StringType(), True),
-    StructField("checked_by", StringType(), True),
-    StructField("checked_at", StringType(), True),
-])
+# The notebook runs from notebooks/ in the repo: put the repo root on the path
+sys.path.append(os.path.abspath(".."))
+from src.pipelines.bronze_ingestion import compile_schema
+
+# ─── Schemas, compiled from BRONZE_SCHEMAS ────────────────────────────────
+# One declaration for the local engine, the generated SQL and this notebook.
+# spark_ddl is a DDL string ("campaign_id STRING, ..., budget_usd DOUBLE"),
+# which spark.read.schema() takes just like a StructType.
+campaign_schema = compile_schema("campaigns").spark_ddl
+delivery_schema = compile_schema("delivery").spark_ddl  # hour: hourly grain only; NULL in daily files
+ticket_schema = compile_schema("tickets").spark_ddl
+qa_schema = compile_schema("qa_checks").spark_ddl
 
 # COMMAND ----------
 # MAGIC %md
@@ -165,7 +102,7 @@ def ingest_to_bronze(file_name, table_name, schema=None, mode="overwrite", parti
     Parameters:
     - file_name: Name of the CSV in the volume
     - table_name: Target Delta table name
-    - schema: Explicit PySpark schema (StructType)
+    - schema: Explicit PySpark schema (StructType or DDL string)
     - mode: 'overwrite' for dimensions, 'append' for facts
     - partition_by: Column to partition by (use for large tables like delivery)
     """
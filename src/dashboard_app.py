@@ -42,6 +42,13 @@ st.title("Disney AdOps Command Center 📊")
 st.markdown("Automated Media Delivery & Campaign Health Monitoring (Powered by EVE)")
 st.markdown("---")
 
+# Brand/channel canonicalizers, compiled from the reference CSVs once per data dir
+@st.cache_data
+def load_canonicalizers(data_dir):
+    # Imported here: canonical pulls in pyarrow, which the rest of the app doesn't need
+    from src.pipelines.canonical import reference_canonicalizers
+    return reference_canonicalizers(data_dir)
+
 # Data Loader
 @st.cache_data
 def load_data():
@@ -61,6 +68,15 @@ def load_data():
     df_tickets = pd.read_csv(os.path.join(data_dir, "04_tickets.csv"))
     df_tickets = df_tickets.rename(columns={'ticket_id': 'id', 'created_date': 'created_at', 'stage': 'status'})
     df_tickets['created_at'] = pd.to_datetime(df_tickets['created_at'])
+
+    # Standardize brand/channel once, as categoricals: tickets carry brand
+    # names or codes, campaigns carry codes — the filters below then compare
+    # integer codes instead of raw strings
+    if os.path.exists(os.path.join(data_dir, "06_brand_mapping.csv")):
+        canonical = load_canonicalizers(data_dir)
+        df_perf['brand_code'] = canonical['brand_code'].categorical(df_perf['brand_code'])
+        df_perf['channel_mapped'] = canonical['channel_mapped'].categorical(df_perf['channel_mapped'])
+        df_tickets['brand'] = canonical['brand_code'].categorical(df_tickets['brand'])
         
     return df_perf, df_tickets
 
@@ -79,11 +95,11 @@ segments = ["All"] + list(df_perf["segment"].dropna().unique())
 selected_segment = st.sidebar.selectbox("Enterprise Segment", segments)
 
 # Get unique brands
-brands = ["All"] + list(df_perf["brand_code"].unique())
+brands = ["All"] + list(df_perf["brand_code"].dropna().unique())
 selected_brand = st.sidebar.selectbox("Brand", brands)
 
 # Get unique channels
-channels = ["All"] + list(df_perf["channel_mapped"].unique())
+channels = ["All"] + list(df_perf["channel_mapped"].dropna().unique())
 selected_channel = st.sidebar.selectbox("Channel", channels)
 
 # Filter Data
@@ -14,9 +14,23 @@ Reference data sourced from:
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import argparse
+import itertools
 import random
-import uuid
 import os
+import shutil
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from src.reference_data import BRANDS, CHANNELS, MARKETS
+except ModuleNotFoundError:
+    # Run as a script (python src/data_generator.py): src/ is on sys.path
+    from reference_data import BRANDS, CHANNELS, MARKETS
 
 random.seed(42)
 np.random.seed(42)
@@ -24,72 +38,7 @@ np.random.seed(42)
 # ═══════════════════════════════════════════════════════════════
 # REFERENCE DATA — Sourced from BOAT Backlog (AOBB)
 # ═══════════════════════════════════════════════════════════════
-
-# Markets & Regions table (from BOAT "Markets & Regions" tab)
-MARKETS = [
-    {"code": "US (ENG)", "geo": "US", "country": "United States", "lang": "ENG", "cluster": "US", "region": "North America"},
-    {"code": "US (ES)", "geo": "US", "country": "United States", "lang": "ES", "cluster": "US", "region": "North America"},
-    {"code": "CA (ENG)", "geo": "CA", "country": "Canada", "lang": "ENG", "cluster": "CA", "region": "North America"},
-    {"code": "CA (FR)", "geo": "CA", "country": "Canada", "lang": "FR", "cluster": "CA", "region": "North America"},
-    {"code": "GB (ENG-GB)", "geo": "GB", "country": "United Kingdom", "lang": "ENG-GB", "cluster": "UKI", "region": "EMEA"},
-    {"code": "IE (ENG-GB)", "geo": "IE", "country": "Ireland", "lang": "ENG-GB", "cluster": "UKI", "region": "EMEA"},
-    {"code": "DE (DE)", "geo": "DE", "country": "Germany", "lang": "DE", "cluster": "GSA", "region": "EMEA"},
-    {"code": "AT (AT)", "geo": "AT", "country": "Austria", "lang": "AT", "cluster": "GSA", "region": "EMEA"},
-    {"code": "CH (DE)", "geo": "CH", "country": "Switzerland", "lang": "DE", "cluster": "GSA", "region": "EMEA"},
-    {"code": "FR (FR)", "geo": "FR", "country": "France", "lang": "FR", "cluster": "France", "region": "EMEA"},
-    {"code": "ES (ES)", "geo": "ES", "country": "Spain", "lang": "ES", "cluster": "Iberia", "region": "EMEA"},
-    {"code": "PT (PT)", "geo": "PT", "country": "Portugal", "lang": "PT", "cluster": "Iberia", "region": "EMEA"},
-    {"code": "IT (IT)", "geo": "IT", "country": "Italy", "lang": "IT", "cluster": "Italy", "region": "EMEA"},
-    {"code": "NL (DUT)", "geo": "NL", "country": "Netherlands", "lang": "DUT", "cluster": "BeNeLux", "region": "EMEA"},
-    {"code": "BE (FR)", "geo": "BE", "country": "Belgium", "lang": "FR", "cluster": "BeNeLux", "region": "EMEA"},
-    {"code": "SE (SV)", "geo": "SE", "country": "Sweden", "lang": "SV", "cluster": "Nordics", "region": "EMEA"},
-    {"code": "NO (NB)", "geo": "NO", "country": "Norway", "lang": "NB", "cluster": "Nordics", "region": "EMEA"},
-    {"code": "DK (DA)", "geo": "DK", "country": "Denmark", "lang": "DA", "cluster": "Nordics", "region": "EMEA"},
-    {"code": "AU (ENG)", "geo": "AU", "country": "Australia", "lang": "ENG", "cluster": "AU", "region": "APAC"},
-    {"code": "NZ (ENG)", "geo": "NZ", "country": "New Zealand", "lang": "ENG", "cluster": "NZ", "region": "APAC"},
-    {"code": "SG (ENG)", "geo": "SG", "country": "Singapore", "lang": "ENG", "cluster": "SG", "region": "APAC"},
-    {"code": "JP (JA)", "geo": "JP", "country": "Japan", "lang": "JA", "cluster": "JP", "region": "APAC"},
-    {"code": "KR (KO)", "geo": "KR", "country": "Korea", "lang": "KO", "cluster": "KR", "region": "APAC"},
-    {"code": "TW (ZH)", "geo": "TW", "country": "Taiwan", "lang": "ZH", "cluster": "TW", "region": "APAC"},
-    {"code": "HK (ZH)", "geo": "HK", "country": "Hong Kong", "lang": "ZH", "cluster": "HK", "region": "APAC"},
-    {"code": "MX (ES)", "geo": "MX", "country": "Mexico", "lang": "ES", "cluster": "MX", "region": "LATAM"},
-    {"code": "BR (PT)", "geo": "BR", "country": "Brazil", "lang": "PT", "cluster": "BR", "region": "LATAM"},
-    {"code": "AR (ES)", "geo": "AR", "country": "Argentina", "lang": "ES", "cluster": "AR", "region": "LATAM"},
-    {"code": "CL (ES)", "geo": "CL", "country": "Chile", "lang": "ES", "cluster": "ClPeCo", "region": "LATAM"},
-    {"code": "CO (ES)", "geo": "CO", "country": "Colombia", "lang": "ES", "cluster": "ClPeCo", "region": "LATAM"},
-]
-
-# Brand mapping (from BOAT VLOOKUP Tables) - updated for new Enterprise Segments
-BRANDS = [
-    {"airtable_value": "Disney+ Standalone", "central_grid": "PLUS", "product": "Disney+", "code": "PLUS", "segment": "DET"},
-    {"airtable_value": "Bundle", "central_grid": "DBUN", "product": "Bundle", "code": "DBUN", "segment": "DET"},
-    {"airtable_value": "Disney", "central_grid": "DIS", "product": "Disney+", "code": "DIS", "segment": "DET"},
-    {"airtable_value": "Marvel", "central_grid": "MAR", "product": "Marvel", "code": "MAR", "segment": "Studios"},
-    {"airtable_value": "Star Wars", "central_grid": "SW", "product": "Star Wars", "code": "SW", "segment": "Studios"},
-    {"airtable_value": "Pixar", "central_grid": "PIX", "product": "Pixar", "code": "PIX", "segment": "Studios"},
-    {"airtable_value": "National Geographic", "central_grid": "NG", "product": "NatGeo", "code": "NG", "segment": "DET"},
-    {"airtable_value": "Star", "central_grid": "STAR", "product": "Star", "code": "STAR", "segment": "DET"},
-    {"airtable_value": "STAR+", "central_grid": "STAR+", "product": "Star+", "code": "STAR+", "segment": "DET"},
-    {"airtable_value": "COMBO+", "central_grid": "COMBO+", "product": "Combo+", "code": "COMBO+", "segment": "DET"},
-    {"airtable_value": "ESPN", "central_grid": "ESPN", "product": "ESPN+", "code": "ESPN", "segment": "ESPN"},
-    {"airtable_value": "Disney Parks", "central_grid": "PARKS", "product": "Theme Parks", "code": "PARKS", "segment": "Experiences"},
-    {"airtable_value": "Disney Cruise Line", "central_grid": "DCL", "product": "Cruise Line", "code": "DCL", "segment": "Experiences"},
-    {"airtable_value": "Disney Store", "central_grid": "STORE", "product": "Consumer Products", "code": "STORE", "segment": "DCP"},
-]
-
-# Channel mapping (from BOAT VLOOKUP Tables)
-CHANNELS = [
-    {"airtable_value": "Display Static", "central_grid": "ProgDisplay", "platform_tax": "CM + DV360"},
-    {"airtable_value": "Display Video", "central_grid": "ProgVideo", "platform_tax": "CM + DV360"},
-    {"airtable_value": "Display Native", "central_grid": "ProgNative", "platform_tax": "CM + DV360"},
-    {"airtable_value": "Display Animated", "central_grid": "ProgDisplay", "platform_tax": "CM + DV360"},
-    {"airtable_value": "Social Static", "central_grid": "Social", "platform_tax": "Meta/TikTok/Snap"},
-    {"airtable_value": "Social Video", "central_grid": "Social", "platform_tax": "Meta/TikTok/Snap"},
-    {"airtable_value": "Search", "central_grid": "Search", "platform_tax": "Google Ads"},
-    {"airtable_value": "CTV", "central_grid": "ProgCTV", "platform_tax": "CM + DV360"},
-    {"airtable_value": "Audio", "central_grid": "ProgAudio", "platform_tax": "CM + DV360/Spotify"},
-    {"airtable_value": "YouTube", "central_grid": "YouTube", "platform_tax": "CM + DV360"},
-]
+# MARKETS, BRANDS and CHANNELS live in src/reference_data.py (imported above)
 
 # User roles (from BOAT User Roles Glossary)
 USERS = [
@@ -200,12 +149,12 @@ TITLES = [
 # (from Performance Marketing Airtable Workflow)
 # ═══════════════════════════════════════════════════════════════
 
-def generate_titles(n=20):
+def generate_titles(n=20, rng=random):
     """Generate title records (content releases)"""
     titles = []
     for i, name in enumerate(TITLES[:n]):
-        brand = random.choice(BRANDS)
-        release = datetime(2026, 2, 1) + timedelta(days=random.randint(0, 120))
+        brand = rng.choice(BRANDS)
+        release = datetime(2026, 2, 1) + timedelta(days=rng.randint(0, 120))
         titles.append({
             "title_id": f"TTL-{i+1:04d}",
             "title_name": name,
@@ -214,22 +163,38 @@ def generate_titles(n=20):
             "segment": brand.get("segment", "Unknown"),
             "product": brand["product"],
             "release_date": release.strftime("%Y-%m-%d"),
-            "content_type": random.choice(["Series", "Film", "Special", "Live Event", "Promo", "Merch"]),
+            "content_type": rng.choice(["Series", "Film", "Special", "Live Event", "Promo", "Merch"]),
         })
     return pd.DataFrame(titles)
 
 
-def generate_campaigns(titles_df, n=60):
-    """Generate campaigns (Title x Campaign Objective)"""
+DELIVERY_PLATFORMS = ["CM360", "DV360", "Meta", "TikTok", "Amazon DSP", "Yahoo DSP"]
+
+
+def generate_campaigns(titles_df, n=60, rng=random, id_offset=0, start_window_days=28,
+                       platform_skew=None):
+    """
+    Generate campaigns (Title x Campaign Objective).
+
+    rng: any random.Random-like source (defaults to the module-level one).
+    id_offset: numbering starts at CMP-{id_offset + 1}, so shards can be
+    generated independently and concatenated.
+    start_window_days: flights start between 2026-02-01 and this many days later.
+    platform_skew: Zipf exponent over DELIVERY_PLATFORMS (in listed order, so
+    CM360 is the biggest); None picks platforms uniformly.
+    """
+    platform_weights = None
+    if platform_skew:
+        platform_weights = list(np.arange(1, len(DELIVERY_PLATFORMS) + 1, dtype=float) ** -platform_skew)
     campaigns = []
-    for i in range(n):
-        title = titles_df.sample(1).iloc[0]
-        objective = random.choice(CAMPAIGN_OBJECTIVES)
-        market = random.choice(MARKETS)
-        channel = random.choice(CHANNELS)
-        start = datetime(2026, 2, 1) + timedelta(days=random.randint(0, 28))
-        end = start + timedelta(days=random.randint(7, 90))
-        budget = random.choice([25000, 50000, 100000, 250000, 500000, 750000, 1000000])
+    for i in range(id_offset, id_offset + n):
+        title = titles_df.iloc[rng.randrange(len(titles_df))]
+        objective = rng.choice(CAMPAIGN_OBJECTIVES)
+        market = rng.choice(MARKETS)
+        channel = rng.choice(CHANNELS)
+        start = datetime(2026, 2, 1) + timedelta(days=rng.randint(0, start_window_days))
+        end = start + timedelta(days=rng.randint(7, 90))
+        budget = rng.choice([25000, 50000, 100000, 250000, 500000, 750000, 1000000])
 
         # Build campaign name using Disney taxonomy pattern
         campaign_name = f"{title['brand_code']}_{title['title_name']}_{objective}_{market['geo']}_{channel['central_grid']}"
@@ -251,142 +216,475 @@ def generate_campaigns(titles_df, n=60):
             "region": market["region"],
             "channel": channel["airtable_value"],
             "channel_mapped": channel["central_grid"],
-            "platform": random.choice(["CM360", "DV360", "Meta", "TikTok", "Amazon DSP", "Yahoo DSP"]),
+            "platform": (rng.choices(DELIVERY_PLATFORMS, weights=platform_weights)[0]
+                         if platform_weights else rng.choice(DELIVERY_PLATFORMS)),
             "budget_usd": budget,
             "start_date": start.strftime("%Y-%m-%d"),
             "end_date": end.strftime("%Y-%m-%d"),
-            "status": random.choices(
+            "status": rng.choices(
                 ["Active", "Paused", "Completed", "Pending Launch"],
                 weights=[50, 10, 20, 20]
             )[0],
-            "impressions_goal": budget * random.randint(8, 15),
-            "flight_priority": random.choice([1, 2, 3]),
-            "audience_tactic": random.choice(AUDIENCES)["tactic"],
-            "audience_strategy": random.choice(AUDIENCES)["strategy"],
-            "audience_detailed": random.choice(AUDIENCES)["detailed"],
+            "impressions_goal": budget * rng.randint(8, 15),
+            "flight_priority": rng.choice([1, 2, 3]),
+            "audience_tactic": rng.choice(AUDIENCES)["tactic"],
+            "audience_strategy": rng.choice(AUDIENCES)["strategy"],
+            "audience_detailed": rng.choice(AUDIENCES)["detailed"],
         })
     return pd.DataFrame(campaigns)
 
 
-def generate_delivery(campaigns_df, days=30):
-    """Generate daily delivery metrics per campaign"""
-    records = []
-    for _, camp in campaigns_df.iterrows():
-        if camp["status"] in ["Active", "Completed"]:
-            daily_goal = camp["impressions_goal"] / max(
-                (pd.to_datetime(camp["end_date"]) - pd.to_datetime(camp["start_date"])).days, 1
-            )
-            for day_offset in range(min(days, 30)):
-                date = pd.to_datetime(camp["start_date"]) + timedelta(days=day_offset)
-                if date > datetime(2026, 3, 1):
-                    break
-                delivery_factor = np.random.normal(1.0, 0.3)
-                if random.random() < 0.05:
-                    delivery_factor = 0.0  # Zero delivery event
-                impressions = max(0, int(daily_goal * delivery_factor))
-                clicks = int(impressions * random.uniform(0.001, 0.015))
-                records.append({
-                    "delivery_id": str(uuid.uuid4())[:8],
-                    "campaign_id": camp["campaign_id"],
-                    "date": date.strftime("%Y-%m-%d"),
-                    "impressions": impressions,
-                    "clicks": clicks,
-                    "ctr": round(clicks / max(impressions, 1), 6),
-                    "spend_usd": round(impressions * random.uniform(0.005, 0.025), 2),
-                    "vast_errors": random.choices([0, 0, 0, 0, random.randint(1, 50)], weights=[70, 10, 10, 5, 5])[0],
-                    "viewability_rate": round(random.uniform(0.40, 0.95), 3),
-                })
-    return pd.DataFrame(records)
-
-
-def generate_tickets(campaigns_df, n=120):
-    """Generate BOAT-style trafficking tickets with real ticket types and role routing"""
-    tickets = []
-    traffickers = [u for u in USERS if u["role"] == "Trafficker"]
-    engineers = [u for u in USERS if u["role"] == "Engineer"]
-    pms = [u for u in USERS if u["role"] == "Project Manager"]
-
-    STAGES = ["New", "In Review", "Trafficking", "QA", "Ready to Launch",
-              "Live", "Completed", "Blocked"]
-    REQUESTERS = ["Agency Partner", "Product Marketing", "Analytics",
-                  "Media Planning", "Account Management", "Performance Strategy"]
-
-    for i in range(n):
-        camp = campaigns_df.sample(1).iloc[0]
-        ticket_type = random.choice(TICKET_TYPES)
-        created = datetime(2026, 2, 1) + timedelta(days=random.randint(0, 25))
-        urgency = random.choices(["Critical", "High", "Medium", "Low"], weights=[5, 15, 50, 30])[0]
-
-        # Override SLA based on urgency for critical/high
-        if urgency == "Critical":
-            sla_hrs = min(ticket_type["sla_hours"], 4)
-        elif urgency == "High":
-            sla_hrs = min(ticket_type["sla_hours"], 8)
-        else:
-            sla_hrs = ticket_type["sla_hours"]
-
-        # Route to correct role
-        if ticket_type["routed_to"] == "Engineer":
-            assignee = random.choice(engineers)
-        elif ticket_type["routed_to"] == "Project Manager":
-            assignee = random.choice(pms)
-        else:
-            assignee = random.choice(traffickers + [{"name": "Unassigned", "email": "", "role": "", "team": ""}])
-
-        tickets.append({
-            "ticket_id": f"TKT-{i+1:05d}",
-            "campaign_id": camp["campaign_id"],
-            "title": f"{ticket_type['type']} - {camp['title_name']} {camp['targeting_geo']} {camp['channel_mapped']}",
-            "request_type": ticket_type["type"],
-            "routed_to_role": ticket_type["routed_to"],
-            "eve_eligible": ticket_type["eve_eligible"],
-            "urgency": urgency,
-            "stage": random.choice(STAGES),
-            "platform": camp["platform"],
-            "targeting_geo": camp["targeting_geo"],
-            "brand": camp["brand_code"],
-            "segment": camp["segment"],
-            "requested_by": random.choice(REQUESTERS),
-            "created_date": created.strftime("%Y-%m-%d"),
-            "due_date": (created + timedelta(hours=sla_hrs)).strftime("%Y-%m-%d %H:%M"),
-            "assignee": assignee["name"],
-            "assignee_role": assignee.get("role", ""),
-            "sla_hours": sla_hrs,
-            "notes": "",
-        })
-    return pd.DataFrame(tickets)
-
-
-def generate_qa_checks(tickets_df):
-    """Generate QA check records per ticket"""
-    QA_CHECKS = [
-        ("Spec Compliance", "Creative matches size/duration/format spec"),
-        ("Tracking", "All tags fire correctly on click and view events"),
-        ("Targeting", "Geo/demo/device/content targeting verified"),
-        ("Landing Page", "Click-through URL resolves and matches IO"),
-        ("Frequency Cap", "Frequency cap set per flight requirements"),
-        ("Content Exclusions", "Rating exclusions and genre blocks applied"),
-        ("Taxonomy Validation", "Placement name follows taxonomy convention"),
-        ("Floodlight Tags", "Conversion tags configured and firing"),
-    ]
-    records = []
-    qa_team = [u for u in USERS if u["role"] == "Trafficker"][:5]  # First 5 traffickers do QA
-
-    for _, ticket in tickets_df.iterrows():
-        if ticket["stage"] in ["QA", "Ready to Launch", "Live", "Completed"]:
-            checks_to_run = random.sample(QA_CHECKS, k=random.randint(3, len(QA_CHECKS)))
-            for check_name, check_detail in checks_to_run:
-                checker = random.choice(qa_team)
-                records.append({
-                    "qa_id": f"QA-{uuid.uuid4().hex[:6].upper()}",
-                    "ticket_id": ticket["ticket_id"],
-                    "check_name": check_name,
-                    "check_details": check_detail,
-                    "result": random.choices(["Pass", "Fail", "Needs Review"], weights=[60, 15, 25])[0],
-                    "checked_by": checker["name"],
-                    "checked_at": (datetime.now() - timedelta(hours=random.randint(1, 72))).isoformat(),
-                })
-    return pd.DataFrame(records)
+# Simulated "today" for the lab dataset: by default no delivery is generated
+# after this date. Pass cutoff=None (or use the prod/stress profiles) to lift it.
+DELIVERY_CUTOFF = np.datetime64("2026-03-01")
+
+# Share of a day's delivery per hour (0-23) for the hourly grain: a diurnal
+# curve that bottoms out around 3am and peaks in prime time (~8pm).
+HOURLY_SHARE = 1.0 + 0.8 * np.sin(2 * np.pi * (np.arange(24) - 14) / 24)
+HOURLY_SHARE = HOURLY_SHARE / HOURLY_SHARE.sum()
+
+# Lookup table for turning random 32-bit words into 8-char hex delivery IDs
+# without a Python-level loop (one 2-char entry per byte value).
+_HEX_BYTES = np.array([f"{b:02x}".encode() for b in range(256)], dtype="S2")
+
+
+def _mix32(keys, seed):
+    """
+    Bijective 32-bit hash of integer keys (xorshift-multiply finalizer).
+
+    Because every step is invertible, distinct keys always give distinct
+    outputs — unlike uuid4()[:8], which starts colliding after ~100k rows.
+    """
+    x = (np.asarray(keys, dtype=np.uint64) + np.uint64((seed * 0x9E3779B9) & 0xFFFFFFFF)) & np.uint64(0xFFFFFFFF)
+    for _ in range(2):
+        x ^= x >> np.uint64(16)
+        x = (x * np.uint64(0x45D9F3B)) & np.uint64(0xFFFFFFFF)
+    x ^= x >> np.uint64(16)
+    return x.astype(np.uint32)
+
+
+def _mix64(keys, seed):
+    """Bijective 64-bit hash (splitmix64 finalizer) for keyspaces beyond 2^32."""
+    with np.errstate(over="ignore"):
+        x = np.asarray(keys, dtype=np.uint64) + np.uint64((seed * 0x9E3779B97F4A7C15) % 2**64)
+        x ^= x >> np.uint64(30)
+        x *= np.uint64(0xBF58476D1CE4E5B9)
+        x ^= x >> np.uint64(27)
+        x *= np.uint64(0x94D049BB133111EB)
+        x ^= x >> np.uint64(31)
+    return x
+
+
+def _hex_ids(words):
+    """Format uint32 (8 chars) or uint64 (16 chars) words as lowercase hex, vectorized."""
+    words = np.asarray(words)
+    width = words.dtype.itemsize
+    as_bytes = words.astype(f">u{width}").view(np.uint8).reshape(-1, width)
+    return _HEX_BYTES[as_bytes].view(f"S{2 * width}").ravel().astype(str)
+
+
+def _delivery_ids(keys, seed, keyspace):
+    """8-char IDs while every key fits in 32 bits, 16-char IDs beyond that."""
+    if keyspace <= 2**32:
+        return _hex_ids(_mix32(keys, seed))
+    return _hex_ids(_mix64(keys, seed))
+
+
+def hot_key_weights(n, skew=None, seed=42):
+    """
+    Zipf weights for n keys (campaigns): rank^-skew, so the #1 key has weight
+    1.0, #2 has 2^-skew, and so on. Ranks are a seed-derived random shuffle,
+    so the tentpoles aren't simply CMP-0001, CMP-0002... Every shard computes
+    the same weights. skew=None → uniform (all 1.0).
+
+    HOT KEYS EXPLAINED:
+    In production a handful of tentpole launches (a Marvel film, the Disney+
+    bundle) carry most of the delivery rows and tickets. Uniform synthetic
+    data hides the skewed shuffles, oversized GROUP BY groups and lock
+    contention that hot keys cause.
+    """
+    if not skew:
+        return np.ones(n)
+    rank = np.random.default_rng([seed, zlib.crc32(b"hot_keys")]).permutation(n) + 1
+    return rank.astype(np.float64) ** -skew
+
+
+def _date_strings(dates):
+    """Format datetime64[D] values as YYYY-MM-DD via a lookup over the date range."""
+    if len(dates) == 0:
+        return np.array([], dtype=str)
+    lo, hi = dates.min(), dates.max()
+    labels = np.datetime_as_string(np.arange(lo, hi + 1), unit="D")
+    return labels[(dates - lo).astype(np.int64)]
+
+
+# Campaigns per RNG block. Each block draws from its own derived seed
+# ([seed, block_index]), so output is identical no matter how blocks are
+# grouped into chunks, files, or worker processes.
+DELIVERY_BLOCK_CAMPAIGNS = 512
+
+DELIVERY_COLUMNS = [
+    "delivery_id", "campaign_id", "date", "impressions", "clicks", "ctr",
+    "spend_usd", "vast_errors", "viewability_rate",
+]
+
+
+def _delivering_campaigns(campaigns_df):
+    """Only Active and Completed campaigns produce delivery rows."""
+    return campaigns_df[campaigns_df["status"].isin(["Active", "Completed"])]
+
+
+def _delivery_block(block_df, block_index, first_campaign, days, seed,
+                    cutoff=DELIVERY_CUTOFF, hourly=False, max_rows_per_day=1, id_keyspace=0):
+    """
+    Generate delivery for one block of delivering campaigns (vectorized).
+    Each campaign delivers for up to `days` days from its start date, stopping
+    at its end date and at `cutoff` if one is set. hourly=True splits every day into 24 rows with
+    an extra `hour` column. With max_rows_per_day > 1, each campaign reports
+    block_df["_rows_per_day"] placement rows per day/hour (hot-key fan-out),
+    splitting that period's goal between them.
+
+    VECTORIZATION EXPLAINED:
+    Instead of looping campaign → day → row, we build the whole campaign×day
+    grid at once with NumPy broadcasting:
+
+        offsets  = [0, 1, 2, ... max_days-1]          (1 × D)
+        n_days   = days each campaign delivers         (C × 1)
+        mask     = offsets < n_days                    (C × D)
+
+    np.nonzero(mask) gives the (campaign, day) coordinates of every delivery
+    row, and every metric is then sampled as one array. The hourly grain and
+    hot-key fan-out just repeat cells (np.repeat).
+    """
+    rng = np.random.default_rng([seed, block_index])
+
+    start = pd.to_datetime(block_df["start_date"]).to_numpy().astype("datetime64[D]")
+    end = pd.to_datetime(block_df["end_date"]).to_numpy().astype("datetime64[D]")
+    goal = block_df["impressions_goal"].to_numpy(dtype=np.float64)
+    daily_goal = goal / np.maximum((end - start).astype(np.int64), 1)
+
+    # Days delivered per campaign: up to `days`, never past its end date or the cutoff
+    n_days = np.clip((end - start).astype(np.int64) + 1, 0, days)
+    if cutoff is not None:
+        n_days = np.minimum(n_days, np.clip((np.datetime64(cutoff, "D") - start).astype(np.int64) + 1, 0, days))
+
+    # Broadcast campaign × day grid → coordinates of every delivery row
+    mask = np.arange(days)[None, :] < n_days[:, None]
+    camp_idx, day_offset = np.nonzero(mask)
+    grid_key = (first_campaign + camp_idx.astype(np.int64)) * days + day_offset
+    row_goal = daily_goal[camp_idx]
+    if hourly:
+        camp_idx = np.repeat(camp_idx, 24)
+        day_offset = np.repeat(day_offset, 24)
+        hour = np.tile(np.arange(24), len(grid_key))
+        grid_key = np.repeat(grid_key, 24) * 24 + hour
+        row_goal = np.repeat(row_goal, 24) * HOURLY_SHARE[hour]
+    if max_rows_per_day > 1:
+        fanout = block_df["_rows_per_day"].to_numpy()[camp_idx]
+        cell = np.repeat(np.arange(len(camp_idx)), fanout)
+        slot = np.arange(len(cell)) - np.repeat(np.cumsum(fanout) - fanout, fanout)
+        camp_idx, day_offset = camp_idx[cell], day_offset[cell]
+        if hourly:
+            hour = hour[cell]
+        grid_key = grid_key[cell] * max_rows_per_day + slot
+        row_goal = row_goal[cell] / fanout[cell]
+    n = len(camp_idx)
+
+    # Delivery factor ~ N(1.0, 0.3) with 5% zero-delivery events
+    delivery_factor = rng.normal(1.0, 0.3, n)
+    delivery_factor[rng.random(n) < 0.05] = 0.0
+    impressions = np.maximum(0, (row_goal * delivery_factor).astype(np.int64))
+    clicks = (impressions * rng.uniform(0.001, 0.015, n)).astype(np.int64)
+    spend = np.round(impressions * rng.uniform(0.005, 0.025, n), 2)
+
+    # VAST errors: 95% of days clean, 5% see 1-50 errors
+    vast_errors = np.where(rng.random(n) < 0.05, rng.integers(1, 51, n), 0)
+    viewability = np.round(rng.uniform(0.40, 0.95, n), 3)
+
+    # Global grid position is a unique key → hash it into a unique delivery_id
+    delivery = pd.DataFrame({
+        "delivery_id": _delivery_ids(grid_key, seed, id_keyspace),
+        "campaign_id": block_df["campaign_id"].to_numpy()[camp_idx],
+        "date": _date_strings(start[camp_idx] + day_offset),
+        "impressions": impressions,
+        "clicks": clicks,
+        "ctr": np.round(clicks / np.maximum(impressions, 1), 6),
+        "spend_usd": spend,
+        "vast_errors": vast_errors,
+        "viewability_rate": viewability,
+    })
+    if hourly:
+        delivery["hour"] = hour
+    return delivery
+
+
+def _iter_delivery_blocks(campaigns_df, days=30, seed=42, workers=1,
+                          cutoff=DELIVERY_CUTOFF, hourly=False,
+                          hot_key_skew=None, hot_key_max_rows=1):
+    """Yield one delivery DataFrame per DELIVERY_BLOCK_CAMPAIGNS campaigns, in order."""
+    delivering = _delivering_campaigns(campaigns_df)
+    if hot_key_max_rows > 1:
+        weights = hot_key_weights(len(campaigns_df), hot_key_skew, seed)
+        weights = weights[campaigns_df["status"].isin(["Active", "Completed"]).to_numpy()]
+        delivering = delivering.assign(
+            _rows_per_day=np.maximum(1, np.rint(hot_key_max_rows * weights)).astype(np.int64)
+        )
+    id_keyspace = len(delivering) * days * (24 if hourly else 1) * hot_key_max_rows
+    tasks = (
+        (block_index, first, DELIVERY_BLOCK_CAMPAIGNS, days, seed, cutoff, hourly,
+         hot_key_max_rows, id_keyspace)
+        for block_index, first in enumerate(range(0, len(delivering), DELIVERY_BLOCK_CAMPAIGNS))
+    )
+    yield from _map_shards(_delivery_shard, tasks, workers, shared=delivering)
+
+
+def generate_delivery(campaigns_df, days=30, seed=42, workers=1,
+                      cutoff=DELIVERY_CUTOFF, hourly=False,
+                      hot_key_skew=None, hot_key_max_rows=1):
+    """
+    Generate daily delivery metrics per campaign as one in-memory DataFrame.
+
+    Same rows as iter_delivery_chunks() — use that instead when the full
+    table won't fit in RAM.
+    """
+    blocks = [b for b in _iter_delivery_blocks(campaigns_df, days, seed, workers, cutoff, hourly,
+                                                hot_key_skew, hot_key_max_rows)
+              if len(b)]
+    if not blocks:
+        return pd.DataFrame(columns=DELIVERY_COLUMNS + (["hour"] if hourly else []))
+    return pd.concat(blocks, ignore_index=True)
+
+
+def iter_delivery_chunks(campaigns_df, days=30, seed=42, chunk_rows=1_000_000, workers=1,
+                         cutoff=DELIVERY_CUTOFF, hourly=False,
+                         hot_key_skew=None, hot_key_max_rows=1):
+    """
+    Stream delivery rows as DataFrames of exactly `chunk_rows` rows (the last
+    chunk may be smaller). Only one block plus one chunk is held in memory at
+    a time, so peak memory is flat however many campaigns or days you ask for.
+    With workers > 1, blocks are generated on a process pool (at most
+    2 × workers blocks in flight) and still arrive in order.
+    """
+    pending, pending_rows = [], 0
+    for block in _iter_delivery_blocks(campaigns_df, days, seed, workers, cutoff, hourly,
+                                       hot_key_skew, hot_key_max_rows):
+        pending.append(block)
+        pending_rows += len(block)
+        if pending_rows < chunk_rows:
+            continue
+        buffer = pd.concat(pending, ignore_index=True)
+        offset = 0
+        while pending_rows - offset >= chunk_rows:
+            yield buffer.iloc[offset:offset + chunk_rows].reset_index(drop=True)
+            offset += chunk_rows
+        pending = [buffer.iloc[offset:]]
+        pending_rows -= offset
+    if pending_rows:
+        yield pd.concat(pending, ignore_index=True)
+
+
+def write_delivery_partitioned(campaigns_df, out_dir="data/delivery", days=30, seed=42,
+                               chunk_rows=1_000_000, file_format="parquet", workers=1,
+                               cutoff=DELIVERY_CUTOFF, hourly=False,
+                               hot_key_skew=None, hot_key_max_rows=1):
+    """
+    Stream delivery straight to date-partitioned files, matching the
+    `partition_by: "date"` layout of BRONZE_SCHEMAS["delivery"]:
+
+        data/delivery/date=2026-02-01/part-00000.parquet
+        data/delivery/date=2026-02-01/part-00001.parquet
+        data/delivery/date=2026-02-02/part-00000.parquet
+
+    Hive-style partitioning: the `date` value lives in the directory name and
+    is dropped from the file body (Spark/Auto Loader restore it from the path).
+    Each chunk writes one part file per date it touches. Any previous output
+    in `out_dir` is replaced, just like to_csv overwrites 03_delivery.csv.
+
+    file_format: "parquet" (needs pyarrow) or "csv.gz"
+    Returns the total number of rows written.
+    """
+    if file_format not in ("parquet", "csv.gz"):
+        raise ValueError(f"Unknown file_format: {file_format}. Use 'parquet' or 'csv.gz'")
+
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+
+    total = 0
+    for chunk_no, chunk in enumerate(iter_delivery_chunks(
+            campaigns_df, days, seed, chunk_rows, workers, cutoff, hourly,
+            hot_key_skew, hot_key_max_rows)):
+        for date, part in chunk.groupby("date", sort=True):
+            partition_dir = os.path.join(out_dir, f"date={date}")
+            os.makedirs(partition_dir, exist_ok=True)
+            path = os.path.join(partition_dir, f"part-{chunk_no:05d}.{file_format}")
+            body = part.drop(columns="date")
+            if file_format == "parquet":
+                body.to_parquet(path, index=False)
+            else:
+                body.to_csv(path, index=False, compression="gzip")
+        total += len(chunk)
+    return total
+
+
+# ─── Ticket / QA lookup tables (vectorized routing rules) ───────
+TICKET_STAGES = ["New", "In Review", "Trafficking", "QA", "Ready to Launch",
+                 "Live", "Completed", "Blocked"]
+REQUESTERS = ["Agency Partner", "Product Marketing", "Analytics",
+              "Media Planning", "Account Management", "Performance Strategy"]
+
+# Urgency tiers and how often each is requested. Critical/High tickets cap the
+# ticket type's SLA at 4h/8h; Medium/Low keep the ticket type's SLA.
+URGENCIES = ["Critical", "High", "Medium", "Low"]
+URGENCY_WEIGHTS = np.array([5, 15, 50, 30]) / 100
+URGENCY_SLA_CAP = np.array([4, 8, 10_000, 10_000])
+
+# Role routing: each role's assignee pool (traffickers can also be Unassigned)
+ROUTING_ROLES = ["Trafficker", "Engineer", "Project Manager"]
+_UNASSIGNED = {"name": "Unassigned", "email": "", "role": "", "team": ""}
+_ROUTING_POOLS = [
+    [u for u in USERS if u["role"] == "Trafficker"] + [_UNASSIGNED],
+    [u for u in USERS if u["role"] == "Engineer"],
+    [u for u in USERS if u["role"] == "Project Manager"],
+]
+_POOL_SIZE = np.array([len(pool) for pool in _ROUTING_POOLS])
+_POOL_NAMES = np.array([[u["name"] for u in pool] + [""] * (_POOL_SIZE.max() - len(pool))
+                        for pool in _ROUTING_POOLS], dtype=object)
+_POOL_ROLES = np.array([[u["role"] for u in pool] + [""] * (_POOL_SIZE.max() - len(pool))
+                        for pool in _ROUTING_POOLS], dtype=object)
+
+# TICKET_TYPES as column arrays, so per-ticket lookups are fancy indexing
+_TT_NAME = np.array([t["type"] for t in TICKET_TYPES], dtype=object)
+_TT_ROLE = np.array([ROUTING_ROLES.index(t["routed_to"]) for t in TICKET_TYPES])
+_TT_SLA = np.array([t["sla_hours"] for t in TICKET_TYPES])
+_TT_EVE = np.array([t["eve_eligible"] for t in TICKET_TYPES])
+
+_HOUR_LABELS = np.array([f"{h:02d}:00" for h in range(24)], dtype=object)
+
+
+def generate_tickets(campaigns_df, n=120, rng=None, id_offset=0, created_window_days=25, seed=42,
+                     hot_key_skew=None):
+    """
+    Generate BOAT-style trafficking tickets with real ticket types and role routing.
+
+    Fully batched: campaign, ticket type, urgency, stage and assignee are drawn
+    as arrays, and the SLA-override and role-routing rules are table lookups
+    (URGENCY_SLA_CAP, _ROUTING_POOLS) instead of per-ticket if/else. Enumerated
+    columns come back as pandas Categoricals (integer codes, no per-row strings).
+
+    rng: numpy Generator (default: np.random.default_rng(seed)).
+    id_offset: numbering starts at TKT-{id_offset + 1}, as in generate_campaigns().
+    Tickets are created between 2026-02-01 and `created_window_days` days later.
+    hot_key_skew: tickets pick campaigns with hot_key_weights() instead of
+    uniformly, so tentpole campaigns get most of the tickets.
+    """
+    rng = rng if rng is not None else np.random.default_rng(seed)
+
+    if hot_key_skew:
+        weights = hot_key_weights(len(campaigns_df), hot_key_skew, seed)
+        camp = campaigns_df.iloc[rng.choice(len(campaigns_df), n, p=weights / weights.sum())]
+    else:
+        camp = campaigns_df.iloc[rng.integers(0, len(campaigns_df), n)]
+    ticket_type = rng.integers(0, len(TICKET_TYPES), n)
+    created_day = rng.integers(0, created_window_days + 1, n)
+    urgency = rng.choice(len(URGENCIES), n, p=URGENCY_WEIGHTS)
+    stage = rng.integers(0, len(TICKET_STAGES), n)
+    requester = rng.integers(0, len(REQUESTERS), n)
+
+    # SLA override: Critical → min(sla, 4), High → min(sla, 8)
+    sla_hours = np.minimum(_TT_SLA[ticket_type], URGENCY_SLA_CAP[urgency])
+
+    # Route to the ticket type's role, then pick uniformly from that role's pool
+    role = _TT_ROLE[ticket_type]
+    pick = (rng.random(n) * _POOL_SIZE[role]).astype(np.int64)
+
+    created = np.datetime64("2026-02-01") + created_day
+    ids = pd.Series(np.arange(id_offset + 1, id_offset + n + 1)).astype(str).str.zfill(5)
+    type_names = pd.Series(_TT_NAME[ticket_type])
+    title_name = pd.Series(camp["title_name"].to_numpy(dtype=object))
+    geo = pd.Series(camp["targeting_geo"].to_numpy(dtype=object))
+    channel = pd.Series(camp["channel_mapped"].to_numpy(dtype=object))
+
+    return pd.DataFrame({
+        "ticket_id": "TKT-" + ids,
+        "campaign_id": camp["campaign_id"].to_numpy(),
+        "title": type_names + " - " + title_name + " " + geo + " " + channel,
+        "request_type": type_names,
+        "routed_to_role": pd.Categorical.from_codes(role, ROUTING_ROLES),
+        "eve_eligible": _TT_EVE[ticket_type],
+        "urgency": pd.Categorical.from_codes(urgency, URGENCIES),
+        "stage": pd.Categorical.from_codes(stage, TICKET_STAGES),
+        "platform": camp["platform"].to_numpy(),
+        "targeting_geo": geo,
+        "brand": camp["brand_code"].to_numpy(),
+        "segment": camp["segment"].to_numpy(),
+        "requested_by": pd.Categorical.from_codes(requester, REQUESTERS),
+        "created_date": _date_strings(created),
+        "due_date": (pd.Series(_date_strings(created + sla_hours // 24), dtype=object)
+                     + " " + _HOUR_LABELS[sla_hours % 24]),
+        "assignee": _POOL_NAMES[role, pick],
+        "assignee_role": _POOL_ROLES[role, pick],
+        "sla_hours": sla_hours,
+        "notes": "",
+    })
+
+
+QA_CHECKS = [
+    ("Spec Compliance", "Creative matches size/duration/format spec"),
+    ("Tracking", "All tags fire correctly on click and view events"),
+    ("Targeting", "Geo/demo/device/content targeting verified"),
+    ("Landing Page", "Click-through URL resolves and matches IO"),
+    ("Frequency Cap", "Frequency cap set per flight requirements"),
+    ("Content Exclusions", "Rating exclusions and genre blocks applied"),
+    ("Taxonomy Validation", "Placement name follows taxonomy convention"),
+    ("Floodlight Tags", "Conversion tags configured and firing"),
+]
+QA_STAGES = ["QA", "Ready to Launch", "Live", "Completed"]
+QA_RESULTS = ["Pass", "Fail", "Needs Review"]
+QA_RESULT_WEIGHTS = np.array([60, 15, 25]) / 100
+QA_TEAM = [u["name"] for u in USERS if u["role"] == "Trafficker"][:5]  # First 5 traffickers do QA
+
+
+def generate_qa_checks(tickets_df, rng=None, as_of=None, ticket_offset=0, seed=42):
+    """
+    Generate QA check records for tickets that reached QA or later (batched).
+
+    Each eligible ticket runs 3-8 distinct checks: a random permutation of
+    QA_CHECKS per ticket (argsort of uniform noise) truncated to its count,
+    all as one 2-D array operation.
+
+    qa_id is a hash of (ticket position, check slot), so IDs are unique and
+    reproducible; `ticket_offset` is the position of tickets_df's first row in
+    the full ticket table. `checked_at` counts back 1-72h from `as_of`
+    (default: now).
+    """
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    as_of = np.datetime64(as_of or datetime.now(), "s")
+    n_kinds = len(QA_CHECKS)
+
+    eligible = np.flatnonzero(tickets_df["stage"].isin(QA_STAGES).to_numpy())
+    n_checks = rng.integers(3, n_kinds + 1, len(eligible))
+    permutation = np.argsort(rng.random((len(eligible), n_kinds)), axis=1)
+    row, slot = np.nonzero(np.arange(n_kinds)[None, :] < n_checks[:, None])
+    check = permutation[row, slot]
+    total = len(row)
+
+    checker = rng.integers(0, len(QA_TEAM), total)
+    result = rng.choice(len(QA_RESULTS), total, p=QA_RESULT_WEIGHTS)
+    hours_ago = rng.integers(1, 73, total)
+    checked_at_labels = np.datetime_as_string(as_of - np.arange(73).astype("timedelta64[h]"), unit="s")
+
+    position = ticket_offset + eligible[row]
+    qa_key = position.astype(np.int64) * n_kinds + slot
+
+    return pd.DataFrame({
+        "qa_id": "QA-" + pd.Series(_hex_ids(_mix32(qa_key, seed))).str.upper(),
+        "ticket_id": tickets_df["ticket_id"].to_numpy()[eligible[row]],
+        "check_name": pd.Categorical.from_codes(check, [c[0] for c in QA_CHECKS]),
+        "check_details": pd.Categorical.from_codes(check, [c[1] for c in QA_CHECKS]),
+        "result": pd.Categorical.from_codes(result, QA_RESULTS),
+        "checked_by": pd.Categorical.from_codes(checker, QA_TEAM),
+        "checked_at": checked_at_labels[hours_ago],
+    })
 
 
 def generate_brand_mapping():
@@ -419,21 +717,393 @@ def generate_audiences():
     return pd.DataFrame(AUDIENCES)
 
 
+# ═══════════════════════════════════════════════════════════════
+# SCALE PROFILES — small (lab) / prod / stress
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class ScaleProfile:
+    """
+    How much data to generate.
+
+    - days: max delivery days per campaign
+    - cutoff: no delivery after this date (None = deliver the full `days`)
+    - hourly: one delivery row per campaign × day × hour instead of per day
+    - start_window_days: campaigns (and tickets) spread over this many days
+    - hot_key_skew: Zipf exponent for delivery rows and tickets per campaign
+      (None = uniform); see hot_key_weights()
+    - hot_key_max_rows: delivery rows per day (or hour) for the hottest campaign
+    - platform_skew: Zipf exponent for campaigns per platform (None = uniform)
+    """
+    titles: int
+    campaigns: int
+    tickets: int
+    days: int
+    hourly: bool = False
+    cutoff: Optional[str] = "2026-03-01"
+    start_window_days: int = 28
+    hot_key_skew: Optional[float] = None
+    hot_key_max_rows: int = 1
+    platform_skew: Optional[float] = None
+
+
+SCALE_PROFILES = {
+    # The original lab dataset: ~600 delivery rows, opens instantly in the dashboard
+    "small": ScaleProfile(titles=20, campaigns=60, tickets=120, days=30),
+    # Roughly one year of a real Disney ad ops book of business (~1M delivery rows)
+    "prod": ScaleProfile(titles=len(TITLES), campaigns=5_000, tickets=50_000, days=365,
+                         cutoff=None, start_window_days=365),
+    # Capacity planning / benchmark load: 50k campaigns, hourly grain (~100M+ rows)
+    "stress": ScaleProfile(titles=len(TITLES), campaigns=50_000, tickets=2_000_000, days=365,
+                           hourly=True, cutoff=None, start_window_days=365),
+    # Hot-key testing: a few tentpole campaigns and CM360 dominate (~10M delivery rows,
+    # the top campaign alone ~180k) — exposes skewed joins/shuffles/MERGE partitions
+    "hotkeys": ScaleProfile(titles=len(TITLES), campaigns=5_000, tickets=200_000, days=90,
+                            cutoff=None, start_window_days=365, hot_key_skew=1.1,
+                            hot_key_max_rows=2_000, platform_skew=1.5),
+}
+
+
+def resolve_profile(name="small", **overrides):
+    """Look up a named profile and apply field overrides, e.g. campaigns=10_000."""
+    if name not in SCALE_PROFILES:
+        raise ValueError(f"Unknown profile: {name}. Available: {list(SCALE_PROFILES.keys())}")
+    return replace(SCALE_PROFILES[name], **overrides)
+
+
+# ═══════════════════════════════════════════════════════════════
+# PARALLEL GENERATION — fixed shards, derived seeds, process pool
+# ═══════════════════════════════════════════════════════════════
+#
+# Every table is cut into fixed-size shards, and every shard draws from its
+# own seed derived from (seed, table, shard index). Shard boundaries never
+# depend on the worker count, so --workers 1 and --workers 16 produce
+# byte-identical output — workers only decide WHERE each shard runs.
+
+SHARD_ROWS = 5000
+
+# Simulated "today": QA check timestamps count back from here in sharded runs
+SIM_AS_OF = datetime(2026, 3, 1)
+
+# Read-only frame shared with shard workers (set once per pool, not per task)
+_SHARED = None
+
+
+def _set_shared(frame):
+    global _SHARED
+    _SHARED = frame
+
+
+def _shard_entropy(seed, table, shard):
+    return [seed, zlib.crc32(table.encode()), shard]
+
+
+def _shard_rng(seed, table, shard):
+    """random.Random seeded from (seed, table, shard) — independent per shard."""
+    entropy = _shard_entropy(seed, table, shard)
+    return random.Random(int(np.random.SeedSequence(entropy).generate_state(1)[0]))
+
+
+def _shard_np_rng(seed, table, shard):
+    """numpy Generator seeded from (seed, table, shard), for the batched generators."""
+    return np.random.default_rng(_shard_entropy(seed, table, shard))
+
+
+def _shard_bounds(n, size=None):
+    """[(shard_index, start, stop), ...] covering range(n) in fixed-size pieces."""
+    size = size or SHARD_ROWS
+    return [(k, start, min(start + size, n)) for k, start in enumerate(range(0, n, size))]
+
+
+def _map_shards(fn, tasks, workers=1, shared=None):
+    """
+    Apply fn to each task, yielding results in task order.
+
+    workers <= 1 runs in-process. Otherwise tasks go to a process pool with at
+    most 2 × workers in flight, so a slow consumer (e.g. a file writer) never
+    lets finished results pile up in memory.
+    """
+    if workers <= 1:
+        _set_shared(shared)
+        try:
+            for task in tasks:
+                yield fn(task)
+        finally:
+            _set_shared(None)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_set_shared,
+                             initargs=(shared,)) as pool:
+        in_flight = deque()
+        for task in tasks:
+            in_flight.append(pool.submit(fn, task))
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def _concat(frames, empty=None):
+    """Concatenate shard frames; with no shards, `empty()` gives the table's empty frame (its columns)."""
+    frames = list(frames)
+    if frames:
+        return pd.concat(frames, ignore_index=True)
+    return empty() if empty else pd.DataFrame()
+
+
+def _campaign_shard(task):
+    seed, shard, start, stop, window, platform_skew = task
+    return generate_campaigns(_SHARED, stop - start, rng=_shard_rng(seed, "campaigns", shard),
+                              id_offset=start, start_window_days=window,
+                              platform_skew=platform_skew)
+
+
+def _ticket_shard(task):
+    seed, shard, start, stop, window, hot_key_skew = task
+    return generate_tickets(_SHARED, stop - start, rng=_shard_np_rng(seed, "tickets", shard),
+                            id_offset=start, created_window_days=window, seed=seed,
+                            hot_key_skew=hot_key_skew)
+
+
+def _qa_shard(task):
+    seed, shard, start, tickets_slice, as_of = task
+    return generate_qa_checks(tickets_slice, rng=_shard_np_rng(seed, "qa_checks", shard),
+                              as_of=as_of, ticket_offset=start, seed=seed)
+
+
+def _delivery_shard(task):
+    block_index, first, block_size, days, seed, cutoff, hourly, max_rows, id_keyspace = task
+    block_df = _SHARED.iloc[first:first + block_size]
+    return _delivery_block(block_df, block_index, first, days, seed, cutoff, hourly,
+                           max_rows, id_keyspace)
+
+
+def generate_core_tables(profile=None, seed=42, workers=1, include_delivery=True):
+    """
+    Generate titles, campaigns, tickets, QA checks (and delivery) for a
+    ScaleProfile (default: "small") with per-shard derived seeds, optionally
+    across a process pool.
+
+    Returns a dict of DataFrames keyed by table name. Output depends only on
+    the profile and `seed` — never on `workers`.
+    """
+    profile = profile or SCALE_PROFILES["small"]
+    titles = generate_titles(profile.titles, rng=_shard_rng(seed, "titles", 0))
+
+    campaigns = _concat(_map_shards(
+        _campaign_shard,
+        [(seed, k, start, stop, profile.start_window_days, profile.platform_skew)
+         for k, start, stop in _shard_bounds(profile.campaigns)],
+        workers, shared=titles,
+    ))
+
+    ticket_cols = ["campaign_id", "title_name", "targeting_geo", "channel_mapped",
+                   "platform", "brand_code", "segment"]
+    tickets = _concat(_map_shards(
+        _ticket_shard,
+        [(seed, k, start, stop, profile.start_window_days, profile.hot_key_skew)
+         for k, start, stop in _shard_bounds(profile.tickets)],
+        workers, shared=campaigns[ticket_cols],
+    ), empty=lambda: generate_tickets(campaigns[ticket_cols], 0, seed=seed))
+
+    qa_checks = _concat(_map_shards(
+        _qa_shard,
+        [(seed, k, start, tickets.iloc[start:stop], SIM_AS_OF)
+         for k, start, stop in _shard_bounds(len(tickets))],
+        workers,
+    ), empty=lambda: generate_qa_checks(tickets, as_of=SIM_AS_OF, seed=seed))
+
+    tables = {"titles": titles, "campaigns": campaigns, "tickets": tickets, "qa_checks": qa_checks}
+    if include_delivery:
+        tables["delivery"] = generate_delivery(campaigns, profile.days, seed, workers,
+                                               profile.cutoff, profile.hourly,
+                                               profile.hot_key_skew, profile.hot_key_max_rows)
+    return tables
+
+
+# ═══════════════════════════════════════════════════════════════
+# LIVE LANDING — simulated hourly platform drops for Auto Loader
+# ═══════════════════════════════════════════════════════════════
+
+@dataclass
+class LandingStats:
+    """What a live landing run actually wrote (for lag / dedup benchmarks)."""
+    batches: int = 0
+    rows: int = 0
+    duplicate_rows: int = 0
+    late_rows: int = 0
+    elapsed_sec: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return round(self.rows / self.elapsed_sec, 1) if self.elapsed_sec else 0.0
+
+
+def run_live_landing(campaigns_df, landing_dir="data/landing/delivery", rows_per_sec=1000,
+                     batch_seconds=1.0, duplicate_rate=0.01, late_rate=0.02,
+                     max_late_batches=5, max_batches=None, profile=None, seed=42):
+    """
+    Continuously write delivery micro-batch CSVs into `landing_dir`, the way
+    CM360/DV360/Meta exports keep dropping files for Auto Loader to pick up.
+
+    Every `batch_seconds` one file with ~rows_per_sec × batch_seconds rows lands:
+
+        data/landing/delivery/delivery_000000_20260301T090000.csv
+        data/landing/delivery/delivery_000001_20260301T090001.csv
+
+    Injected problems (so ingestion lag and dedup throughput can be measured):
+    - duplicate_rate: share of rows that are exact re-sends of a delivery_id
+      already landed (platform APIs retry and resend)
+    - late_rate: share of rows held back and landed 1..max_late_batches files
+      after the rest of their batch (late-arriving dates)
+
+    Files are written under a temp name and renamed into place, so a reader
+    never sees a half-written file. Runs until the delivery stream for
+    `profile` is exhausted or `max_batches` files have landed (Ctrl+C also
+    stops cleanly). Returns LandingStats.
+    """
+    profile = profile or SCALE_PROFILES["small"]
+    rng = np.random.default_rng([seed, zlib.crc32(b"live_landing")])
+    batch_rows = max(1, int(rows_per_sec * batch_seconds))
+    os.makedirs(landing_dir, exist_ok=True)
+
+    source = iter_delivery_chunks(campaigns_df, profile.days, seed, chunk_rows=batch_rows,
+                                  cutoff=profile.cutoff, hourly=profile.hourly,
+                                  hot_key_skew=profile.hot_key_skew,
+                                  hot_key_max_rows=profile.hot_key_max_rows)
+    held_back = []          # [(due_batch, rows)] — late rows waiting to land
+    previous = None         # last landed batch, the pool duplicates are drawn from
+    stats = LandingStats()
+    started = time.monotonic()
+
+    try:
+        for batch_no in itertools.count():
+            if max_batches is not None and batch_no >= max_batches:
+                break
+            fresh = next(source, None)
+            if fresh is None and not held_back:
+                break
+            parts = []
+
+            if fresh is not None:
+                # Hold back some rows: they land 1..max_late_batches files later
+                late = rng.random(len(fresh)) < late_rate
+                if late.any():
+                    delays = rng.integers(1, max_late_batches + 1, late.sum())
+                    for delay in np.unique(delays):
+                        held_back.append((batch_no + delay, fresh[late].iloc[delays == delay]))
+                    stats.late_rows += int(late.sum())
+                parts.append(fresh[~late])
+
+            # Release late rows that are due (all of them once the source is dry)
+            due = [rows for when, rows in held_back if fresh is None or when <= batch_no]
+            held_back = [(when, rows) for when, rows in held_back
+                         if fresh is not None and when > batch_no]
+            parts.extend(due)
+
+            # Re-send some already-landed rows verbatim
+            pool = previous if previous is not None else parts[0]
+            n_dupes = min(rng.binomial(sum(len(p) for p in parts), duplicate_rate), len(pool))
+            if n_dupes:
+                parts.append(pool.iloc[rng.choice(len(pool), n_dupes, replace=False)])
+                stats.duplicate_rows += n_dupes
+
+            batch = pd.concat(parts, ignore_index=True)
+            stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+            path = os.path.join(landing_dir, f"delivery_{batch_no:06d}_{stamp}.csv")
+            batch.to_csv(path + ".tmp", index=False)
+            os.replace(path + ".tmp", path)
+
+            stats.batches += 1
+            stats.rows += len(batch)
+            previous = batch
+
+            # Pace to the target rate; if writing is slower, we just fall behind
+            next_tick = started + (batch_no + 1) * batch_seconds
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+    except KeyboardInterrupt:
+        print("\n⏹️ Live landing stopped")
+
+    stats.elapsed_sec = round(time.monotonic() - started, 3)
+    return stats
+
+
 # ═══════════════════════════════════════════════════════════════
 # MAIN
 # ═══════════════════════════════════════════════════════════════
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate Disney Ad Ops Lab synthetic data")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream delivery to date-partitioned files under data/delivery/ "
+                             "instead of building 03_delivery.csv in memory")
+    parser.add_argument("--format", dest="file_format", default="parquet",
+                        choices=["parquet", "csv.gz"], help="File format for --stream")
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000,
+                        help="Rows per streamed chunk (bounds peak memory)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Generate shards on N processes (output is identical for any N)")
+    parser.add_argument("--seed", type=int, default=42, help="Base seed for all shards")
+    parser.add_argument("--profile", default="small", choices=list(SCALE_PROFILES.keys()),
+                        help="Named scale profile (small = original lab dataset)")
+    parser.add_argument("--campaigns", type=int, help="Override the profile's campaign count")
+    parser.add_argument("--tickets", type=int, help="Override the profile's ticket count")
+    parser.add_argument("--days", type=int, help="Override max delivery days per campaign")
+    parser.add_argument("--hourly", dest="hourly", action="store_const", const=True,
+                        help="One delivery row per campaign x day x hour")
+    parser.add_argument("--daily", dest="hourly", action="store_const", const=False,
+                        help="One delivery row per campaign x day")
+    parser.add_argument("--cutoff", help="Last delivery date (YYYY-MM-DD), or 'none' for no cutoff")
+    parser.add_argument("--skew", dest="hot_key_skew", type=float,
+                        help="Zipf exponent for delivery rows/tickets per campaign (e.g. 1.1)")
+    parser.add_argument("--hot-max-rows", dest="hot_key_max_rows", type=int,
+                        help="Delivery rows per day for the hottest campaign")
+    parser.add_argument("--platform-skew", type=float,
+                        help="Zipf exponent for campaigns per platform")
+    parser.add_argument("--live", action="store_true",
+                        help="After writing the core tables, keep landing delivery micro-batches "
+                             "in --landing-dir (simulated hourly platform drops)")
+    parser.add_argument("--landing-dir", default="data/landing/delivery")
+    parser.add_argument("--rows-per-sec", type=int, default=1000)
+    parser.add_argument("--batch-seconds", type=float, default=1.0,
+                        help="Seconds between landed files")
+    parser.add_argument("--duplicate-rate", type=float, default=0.01,
+                        help="Share of rows re-sent with an already-landed delivery_id")
+    parser.add_argument("--late-rate", type=float, default=0.02,
+                        help="Share of rows landed 1-5 files late")
+    parser.add_argument("--max-batches", type=int, help="Stop after N landed files")
+    args = parser.parse_args()
+
+    overrides = {k: getattr(args, k)
+                 for k in ("campaigns", "tickets", "days", "hourly",
+                           "hot_key_skew", "hot_key_max_rows", "platform_skew")
+                 if getattr(args, k) is not None}
+    if args.cutoff is not None:
+        overrides["cutoff"] = None if args.cutoff.lower() == "none" else args.cutoff
+    profile = resolve_profile(args.profile, **overrides)
+
     os.makedirs("data", exist_ok=True)
 
-    print("Generating Disney Ad Ops Lab data...\n")
+    print(f"Generating Disney Ad Ops Lab data (profile: {args.profile})...\n")
 
-    # Core operational data
-    titles = generate_titles(20)
-    campaigns = generate_campaigns(titles, 60)
-    delivery = generate_delivery(campaigns)
-    tickets = generate_tickets(campaigns, 120)
-    qa_checks = generate_qa_checks(tickets)
+    # Core operational data (sharded; identical output for any --workers)
+    core = generate_core_tables(profile, seed=args.seed, workers=args.workers,
+                                include_delivery=not (args.stream or args.live))
+    titles, campaigns = core["titles"], core["campaigns"]
+    tickets, qa_checks = core["tickets"], core["qa_checks"]
+    if args.live:
+        delivery, delivery_rows = None, 0
+    elif args.stream:
+        delivery = None
+        delivery_rows = write_delivery_partitioned(
+            campaigns, "data/delivery", days=profile.days, seed=args.seed,
+            chunk_rows=args.chunk_rows, file_format=args.file_format, workers=args.workers,
+            cutoff=profile.cutoff, hourly=profile.hourly,
+            hot_key_skew=profile.hot_key_skew, hot_key_max_rows=profile.hot_key_max_rows,
+        )
+    else:
+        delivery = core["delivery"]
+        delivery_rows = len(delivery)
 
     # Reference/lookup tables
     brand_map = generate_brand_mapping()
@@ -446,7 +1116,8 @@ if __name__ == "__main__":
     # Save core data
     titles.to_csv("data/01_titles.csv", index=False)
     campaigns.to_csv("data/02_campaigns.csv", index=False)
-    delivery.to_csv("data/03_delivery.csv", index=False)
+    if delivery is not None:
+        delivery.to_csv("data/03_delivery.csv", index=False)
     tickets.to_csv("data/04_tickets.csv", index=False)
     qa_checks.to_csv("data/05_qa_checks.csv", index=False)
 
@@ -464,7 +1135,7 @@ if __name__ == "__main__":
     print(f"{'='*60}")
     print(f"  Titles:        {len(titles):>6} records")
     print(f"  Campaigns:     {len(campaigns):>6} records")
-    print(f"  Delivery:      {len(delivery):>6} records")
+    print(f"  Delivery:      {delivery_rows:>6} records")
     print(f"  Tickets:       {len(tickets):>6} records")
     print(f"  QA Checks:     {len(qa_checks):>6} records")
     print(f"\n{'='*60}")
@@ -489,7 +1160,22 @@ if __name__ == "__main__":
     print(f"  EVE-eligible tickets: {tickets[tickets['eve_eligible']==True].shape[0]}")
     print(f"  Engineer tickets: {tickets[tickets['routed_to_role']=='Engineer'].shape[0]}")
     print(f"  Trafficker tickets: {tickets[tickets['routed_to_role']=='Trafficker'].shape[0]}")
-    print(f"  Zero delivery events: {(delivery['impressions']==0).sum()}")
-    print(f"  VAST error events: {(delivery['vast_errors']>0).sum()}")
+    if delivery is not None:
+        print(f"  Zero delivery events: {(delivery['impressions']==0).sum()}")
+        print(f"  VAST error events: {(delivery['vast_errors']>0).sum()}")
     print(f"  QA failures: {(qa_checks['result']=='Fail').sum()}")
     print(f"  QA needs review: {(qa_checks['result']=='Needs Review').sum()}")
+
+    if args.live:
+        print(f"\n{'='*60}")
+        print(f"LIVE LANDING → {args.landing_dir} ({args.rows_per_sec:,} rows/sec, Ctrl+C to stop)")
+        print(f"{'='*60}")
+        stats = run_live_landing(
+            campaigns, args.landing_dir, rows_per_sec=args.rows_per_sec,
+            batch_seconds=args.batch_seconds, duplicate_rate=args.duplicate_rate,
+            late_rate=args.late_rate, max_batches=args.max_batches, profile=profile, seed=args.seed,
+        )
+        print(f"  Files landed:   {stats.batches:>8}")
+        print(f"  Rows landed:    {stats.rows:>8}  ({stats.rows_per_sec:,} rows/sec)")
+        print(f"  Duplicate rows: {stats.duplicate_rows:>8}")
+        print(f"  Late rows:      {stats.late_rows:>8}")
@@ -13,11 +13,15 @@ from src.trafficking.cm360_api import CM360APIClient
 from src.tracking.adobe_launch import AdobeLaunchClient
 
 class Orchestrator:
-    def __init__(self):
+    def __init__(self, sla_tracker=None):
         self.airtable = AirtableClient()
         self.engine = TraffickingEngine()
         self.qa = QAEngine()
         self.alerter = AlertPipeline()
+        # Optional pipelines.sla_tracker.SlaTracker: the health check then alerts
+        # only on tickets breached since the last run, without an Airtable scan.
+        # Ingestion keeps it synced (local_bronze.ingest_table(..., sla_tracker=...))
+        self.sla_tracker = sla_tracker
 
     def _calculate_sla_and_routing(self, fields: dict) -> dict:
         """Calculates SLA hours and Auto-Routes based on BOAT User Roles Glossary."""
@@ -49,6 +53,16 @@ class Orchestrator:
                 
         return {"routed_to_role": role, "sla_hours": sla_hours}
 
+    def _breached_tickets(self) -> list:
+        """
+        SLA-breached tickets for the health check. With a tracker only the newly
+        breached ones come back (one tick(); ingestion keeps the index synced);
+        a tracker that has never been synced falls back to the Airtable scan.
+        """
+        if self.sla_tracker is not None and self.sla_tracker.last_sync() is not None:
+            return [b.as_alert() for b in self.sla_tracker.tick()]
+        return self.airtable.get_breached_tickets()
+
     def run_pipeline(self):
         print("Starting Ad Ops Automation Pipeline...")
         
@@ -174,7 +188,7 @@ class Orchestrator:
         
         # 7. Health Check
         print("\nRunning Health Check...")
-        breached = self.airtable.get_breached_tickets()
+        breached = self._breached_tickets()
         if breached:
             print(f"Found {len(breached)} breached tickets! Sending Alert.")
             self.alerter.send_sla_breach_alert(breached)
@@ -22,9 +22,16 @@ KEY CONCEPTS:
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 from typing import Optional
 
+try:
+    import pyarrow as pa
+except ImportError:
+    # Only the local engine needs Arrow; SQL generation works without it
+    pa = None
+
 
 # ─── Schema Registry ────────────────────────────────────────────────────────
 # In Databricks, you'd use StructType. Here we define them as dicts so this
@@ -73,7 +80,9 @@ BRONZE_SCHEMAS = {
             ("spend_usd", "DOUBLE"),
             ("vast_errors", "INT"),
             ("viewability_rate", "DOUBLE"),
+            ("hour", "INT"),  # hourly grain only (data_generator --hourly)
         ],
+        "optional": ("hour",),  # daily files don't have it: loaded as NULL
         "source_file": "03_delivery.csv",
         "partition_by": "date",  # Partition by date — this is THE key optimization
     },
@@ -118,8 +127,11 @@ BRONZE_SCHEMAS = {
         "columns": [
             ("title_id", "STRING"),
             ("title_name", "STRING"),
-            ("franchise", "STRING"),
-            ("release_window", "STRING"),
+            ("brand", "STRING"),
+            ("brand_code", "STRING"),
+            ("segment", "STRING"),
+            ("product", "STRING"),
+            ("release_date", "DATE"),
             ("content_type", "STRING"),
         ],
         "source_file": "01_titles.csv",
@@ -138,6 +150,165 @@ REFERENCE_TABLES = {
 }
 
 
+# Every Bronze table carries these lineage columns on top of its source columns
+METADATA_COLUMNS = [
+    ("_ingested_at", "TIMESTAMP"),
+    ("_source_file", "STRING"),
+    ("_batch_id", "STRING"),
+]
+
+
+# ─── Compiled Schemas ───────────────────────────────────────────────────────
+# BRONZE_SCHEMAS is the single source of truth. compile_schema() turns one
+# entry into every representation the pipeline needs — Arrow schema, Spark
+# DDL, CREATE TABLE SQL, Python/pandas casters — ONCE per table (memoized),
+# so nothing re-walks the column list or infers types at load time.
+
+PANDAS_DTYPES = {
+    "STRING": "string",
+    "INT": "Int32",
+    "BIGINT": "Int64",
+    "DOUBLE": "float64",
+    "BOOLEAN": "boolean",
+    "DATE": "datetime64[s]",
+    "TIMESTAMP": "datetime64[us]",
+}
+
+_TRUE = {"true", "1", "yes", "y", "t"}
+
+
+def _parse_bool(value: str) -> bool:
+    return value.strip().lower() in _TRUE
+
+
+# SQL type → parser for one raw CSV string
+PYTHON_CASTERS = {
+    "STRING": str,
+    "INT": int,
+    "BIGINT": int,
+    "DOUBLE": float,
+    "BOOLEAN": _parse_bool,
+    "DATE": date.fromisoformat,
+    "TIMESTAMP": datetime.fromisoformat,
+}
+
+if pa is not None:
+    ARROW_TYPES = {
+        "STRING": pa.string(),
+        "INT": pa.int32(),
+        "BIGINT": pa.int64(),
+        "DOUBLE": pa.float64(),
+        "BOOLEAN": pa.bool_(),
+        "DATE": pa.date32(),
+        "TIMESTAMP": pa.timestamp("us", tz="UTC"),
+    }
+else:
+    # Still importable without pyarrow; Arrow schemas raise a clear ImportError
+    ARROW_TYPES = {}
+
+
+@dataclass(frozen=True)
+class CompiledSchema:
+    """
+    One Bronze table's schema, pre-rendered for every consumer:
+
+    - arrow_schema / arrow_schema_with_metadata → local engine (pyarrow)
+    - spark_ddl → Auto Loader / notebook .schema(...), DLT schema= (no inference)
+    - create_table_sql() → Delta CREATE TABLE
+    - cast_row() / cast_frame() → typed Python rows / pandas frames
+    """
+    table_name: str
+    columns: tuple
+    partition_by: Optional[str]
+    source_file: str
+    optional: tuple             # declared columns a source file may leave out (→ NULL)
+    spark_ddl: str
+    _row_casters: tuple
+    _pandas_dtypes: tuple
+
+    @property
+    def names(self) -> list:
+        return [name for name, _ in self.columns]
+
+    @property
+    def arrow_schema(self):
+        return _arrow_schema(self.table_name, False)
+
+    @property
+    def arrow_schema_with_metadata(self):
+        return _arrow_schema(self.table_name, True)
+
+    def create_table_sql(self, catalog: str = "hive_metastore", schema: str = "adops_bronze") -> str:
+        col_defs = [f"    {name} {col_type}" for name, col_type in self.columns + tuple(METADATA_COLUMNS)]
+        columns_sql = ",\n".join(col_defs)
+        partition_clause = f"\nPARTITIONED BY ({self.partition_by})" if self.partition_by else ""
+        return f"""
+-- Bronze table: {self.table_name}
+-- Source: {self.source_file}
+-- Pattern: Append-only, raw data with metadata stamps
+CREATE TABLE IF NOT EXISTS {catalog}.{schema}.{self.table_name} (
+{columns_sql}
+)
+USING DELTA{partition_clause}
+TBLPROPERTIES (
+    'delta.autoOptimize.optimizeWrite' = 'true',
+    'delta.autoOptimize.autoCompact' = 'true',
+    'quality' = 'bronze'
+);
+"""
+
+    def cast_row(self, row: dict) -> dict:
+        """Cast one raw CSV row (all strings) to typed values; '' / None → None."""
+        return {name: (None if row.get(name) in ("", None) else cast(row[name]))
+                for name, cast in self._row_casters}
+
+    def cast_frame(self, df):
+        """Cast a raw pandas frame (e.g. read with dtype=str) to the declared dtypes."""
+        import pandas as pd
+
+        missing = {name: None for name in self.optional if name not in df.columns}
+        out = df.assign(**missing)[self.names].copy()
+        for name, dtype in self._pandas_dtypes:
+            column = out[name].replace("", None)
+            if dtype.startswith("datetime64"):
+                out[name] = pd.to_datetime(column, format="ISO8601").astype(dtype)
+            elif dtype == "boolean":
+                text = column.astype("string").str.strip().str.lower()
+                out[name] = text.isin(_TRUE).astype(dtype).mask(text.isna())
+            else:
+                out[name] = column.astype(dtype)
+        return out
+
+
+@lru_cache(maxsize=None)
+def _arrow_schema(table_name: str, with_metadata: bool):
+    if pa is None:
+        raise ImportError("pyarrow is required for Arrow schemas: pip install pyarrow")
+    columns = compile_schema(table_name).columns
+    if with_metadata:
+        columns += tuple(METADATA_COLUMNS)
+    return pa.schema([(name, ARROW_TYPES[col_type]) for name, col_type in columns])
+
+
+@lru_cache(maxsize=None)
+def compile_schema(table_name: str) -> CompiledSchema:
+    """Compile (once — memoized) a BRONZE_SCHEMAS entry into a CompiledSchema."""
+    if table_name not in BRONZE_SCHEMAS:
+        raise ValueError(f"Unknown table: {table_name}. Available: {list(BRONZE_SCHEMAS.keys())}")
+    config = BRONZE_SCHEMAS[table_name]
+    columns = tuple(config["columns"])
+    return CompiledSchema(
+        table_name=table_name,
+        columns=columns,
+        partition_by=config["partition_by"],
+        source_file=config["source_file"],
+        optional=tuple(config.get("optional", ())),
+        spark_ddl=", ".join(f"{name} {col_type}" for name, col_type in columns),
+        _row_casters=tuple((name, PYTHON_CASTERS[col_type]) for name, col_type in columns),
+        _pandas_dtypes=tuple((name, PANDAS_DTYPES[col_type]) for name, col_type in columns),
+    )
+
+
 @dataclass
 class IngestionRecord:
     """
@@ -155,6 +326,12 @@ class IngestionRecord:
     row_count: int = 0
     status: str = "pending"  # pending | success | failed
     error: Optional[str] = None
+    bytes_read: int = 0       # source file size — for throughput tracking
+    elapsed_sec: float = 0.0  # wall time of read + stamp + write
+
+    @property
+    def rows_per_sec(self) -> float:
+        return round(self.row_count / self.elapsed_sec, 1) if self.elapsed_sec else 0.0
 
     def mark_success(self, row_count: int):
         self.status = "success"
@@ -180,42 +357,7 @@ def generate_bronze_create_sql(table_name: str, catalog: str = "hive_metastore",
     - Time travel: Query data as it was yesterday (SELECT * FROM t VERSION AS OF 5)
     - Schema evolution: Add columns without breaking existing queries
     """
-    if table_name not in BRONZE_SCHEMAS:
-        raise ValueError(f"Unknown table: {table_name}. Available: {list(BRONZE_SCHEMAS.keys())}")
-    
-    config = BRONZE_SCHEMAS[table_name]
-    columns = config["columns"]
-    
-    # Build column definitions
-    col_defs = []
-    for col_name, col_type in columns:
-        col_defs.append(f"    {col_name} {col_type}")
-    
-    # Add metadata columns (these exist on EVERY Bronze table)
-    col_defs.append("    _ingested_at TIMESTAMP")
-    col_defs.append("    _source_file STRING")
-    col_defs.append("    _batch_id STRING")
-    
-    columns_sql = ",\n".join(col_defs)
-    
-    partition_clause = ""
-    if config["partition_by"]:
-        partition_clause = f"\nPARTITIONED BY ({config['partition_by']})"
-    
-    return f"""
--- Bronze table: {table_name}
--- Source: {config['source_file']}
--- Pattern: Append-only, raw data with metadata stamps
-CREATE TABLE IF NOT EXISTS {catalog}.{schema}.{table_name} (
-{columns_sql}
-)
-USING DELTA{partition_clause}
-TBLPROPERTIES (
-    'delta.autoOptimize.optimizeWrite' = 'true',
-    'delta.autoOptimize.autoCompact' = 'true',
-    'quality' = 'bronze'
-);
-"""
+    return compile_schema(table_name).create_table_sql(catalog, schema)
 
 
 def generate_autoloader_sql(table_name: str, volume_path: str,
@@ -236,23 +378,17 @@ def generate_autoloader_sql(table_name: str, volume_path: str,
     In Ad Ops, new delivery/impression CSVs land every hour from platform APIs.
     Auto Loader picks them up automatically without you writing cron jobs.
     """
-    if table_name not in BRONZE_SCHEMAS:
-        raise ValueError(f"Unknown table: {table_name}")
-    
-    config = BRONZE_SCHEMAS[table_name]
-    source_file = config["source_file"]
-    
+    compiled = compile_schema(table_name)
+
     return f"""
 # Auto Loader ingestion for: {table_name}
 # This runs as a STREAMING job — it continuously watches for new files
 (spark.readStream
     .format("cloudFiles")                              # Auto Loader format
     .option("cloudFiles.format", "csv")                # Source file format
-    .option("cloudFiles.schemaLocation",               # Where to store inferred schema
-            "/mnt/checkpoints/{table_name}_schema")
-    .option("cloudFiles.schemaEvolutionMode", "addNewColumns")  # Handle new columns gracefully
+    .schema("{compiled.spark_ddl}")  # Declared types: no inference
     .option("header", "true")
-    .load("{volume_path}/{source_file}")
+    .load("{volume_path}/{compiled.source_file}")
     # Add metadata columns for lineage tracking
     .withColumn("_ingested_at", current_timestamp())
     .withColumn("_source_file", input_file_name())
@@ -274,22 +410,30 @@ def generate_batch_ingest_sql(table_name: str, volume_path: str,
     """
     Generates batch (non-streaming) ingestion SQL.
     Use this when Auto Loader isn't needed — e.g., initial bulk load or small reference tables.
+
+    The CSV is read as strings (no inference) and cast to the declared types
+    in the SELECT. Optional columns (hourly `hour`) are left out: COPY INTO
+    can't reference a column a file may not have, so they stay NULL here.
     """
-    if table_name not in BRONZE_SCHEMAS:
-        raise ValueError(f"Unknown table: {table_name}")
-    
-    config = BRONZE_SCHEMAS[table_name]
-    
+    compiled = compile_schema(table_name)
+    casts = ",\n        ".join(f"CAST({name} AS {col_type}) AS {name}"
+                          for name, col_type in compiled.columns if name not in compiled.optional)
+
     return f"""
 -- Batch ingestion for: {table_name}
 -- Use this for initial data load or small reference tables
 COPY INTO {catalog}.{schema}.{table_name}
-FROM '{volume_path}/{config["source_file"]}'
+FROM (
+    SELECT
+        {casts},
+        current_timestamp() AS _ingested_at,
+        _metadata.file_path AS _source_file,
+        '{table_name}_copy_' || date_format(current_timestamp(), 'yyyyMMdd_HHmmss') AS _batch_id
+    FROM '{volume_path}/{compiled.source_file}'
+)
 FILEFORMAT = CSV
 FORMAT_OPTIONS (
     'header' = 'true',
-    'inferSchema' = 'true',
-    'mergeSchema' = 'true'
-)
-COPY_OPTIONS ('mergeSchema' = 'true');
+    'inferSchema' = 'false'
+);
 """
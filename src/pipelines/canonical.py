@@ -0,0 +1,204 @@
+"""
+Canonical Values — one standardization layer for SQL and local Silver
+=======================================================================
+PURPOSE:
+  "meta", " Facebook", "META" and "Meta" are the same platform. Before this
+  module, every Silver SQL statement carried its own hand-written
+  CASE LOWER(TRIM(platform)) ladder (and they disagreed), the local engine
+  had a third copy, and the dashboard compared raw strings.
+
+  A Canonicalizer is compiled ONCE from an alias map — PLATFORM_STANDARDIZATION,
+  or a reference table (brand_mapping, channel_mapping, markets) — and
+  produces every form the pipeline needs:
+
+      PLATFORM.sql_case("platform")   → the CASE expression for Databricks SQL
+      PLATFORM.apply(arrow_column)    → canonical strings, vectorized
+      PLATFORM.encode(arrow_column)   → dictionary-encoded (integer codes)
+      PLATFORM.categorical(series)    → pandas Categorical for the dashboard
+      PLATFORM.lookup("dcm")          → one Python value
+
+  Matching is LOWER(TRIM(value)) against the aliases; unknown values pass
+  through trimmed (the ELSE TRIM(value) branch), NULL stays NULL.
+
+WHY IT'S FAST:
+  Millions of rows only ever hold a handful of distinct raw values. encode()
+  dictionary-encodes the column (one hash pass inside Arrow), canonicalizes
+  just the distinct values, and then remaps the integer codes with a single
+  array take. No per-row string work happens in Python.
+"""
+
+import os
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Iterable, Optional
+
+import numpy as np
+
+from src.reference_data import BRANDS, CHANNELS, MARKETS
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    # Only the local engine needs Arrow; SQL generation works without it
+    pa = pc = None
+
+
+def normalize_key(value: str) -> str:
+    """The matching key, same as LOWER(TRIM(value)) in Spark (TRIM strips spaces only)."""
+    return value.strip(" ").lower()
+
+
+def _sql_literal(value: str) -> str:
+    # Spark string literals escape with backslashes
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+@dataclass(frozen=True)
+class Canonicalizer:
+    """A compiled alias → canonical mapping for one dimension."""
+    name: str
+    aliases: tuple          # ((normalized alias, canonical), ...)
+    categories: tuple       # canonical values, in first-seen order
+
+    @classmethod
+    def compile(cls, name: str, pairs: Iterable) -> "Canonicalizer":
+        """
+        Build from (alias, canonical) pairs. Every canonical value is also an
+        alias of itself. Two different canonicals for one alias is an error.
+        """
+        mapping, categories = {}, []
+        for alias, canonical in pairs:
+            if alias is None or canonical is None:
+                continue
+            canonical = canonical.strip(" ")
+            if canonical not in categories:
+                categories.append(canonical)
+            for key in (normalize_key(alias), normalize_key(canonical)):
+                if mapping.setdefault(key, canonical) != canonical:
+                    raise ValueError(f"{name}: '{key}' maps to both '{mapping[key]}' and '{canonical}'")
+        return cls(name, tuple(mapping.items()), tuple(categories))
+
+    @cached_property
+    def mapping(self) -> dict:
+        return dict(self.aliases)
+
+    def lookup(self, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return self.mapping.get(normalize_key(value), value.strip(" "))
+
+    def sql_case(self, expr: Optional[str] = None, indent: int = 8) -> str:
+        """
+        CASE expression with one WHEN per canonical value, e.g.
+
+            CASE
+                WHEN LOWER(TRIM(platform)) IN ('meta', 'facebook') THEN 'Meta'
+                ...
+                ELSE TRIM(platform)
+            END
+        """
+        expr = expr or self.name
+        grouped = {canonical: [] for canonical in self.categories}
+        for key, canonical in self.aliases:
+            grouped[canonical].append(key)
+        pad = " " * (indent + 4)
+        lines = ["CASE"]
+        for canonical, keys in grouped.items():
+            in_list = ", ".join(_sql_literal(k) for k in keys)
+            lines.append(f"{pad}WHEN LOWER(TRIM({expr})) IN ({in_list}) THEN {_sql_literal(canonical)}")
+        lines.append(f"{pad}ELSE TRIM({expr})")
+        lines.append(" " * indent + "END")
+        return "\n".join(lines)
+
+    def _arrow_lookup(self):
+        if pa is None:
+            raise ImportError("pyarrow is required for local canonicalization: pip install pyarrow")
+        keys = pa.array([k for k, _ in self.aliases], pa.string())
+        codes = np.array([self.categories.index(c) for _, c in self.aliases], dtype=np.int32)
+        return keys, codes
+
+    def encode(self, values) -> "pa.DictionaryArray":
+        """
+        Canonicalize an Arrow string column into a DictionaryArray whose
+        dictionary is `categories` followed by any unknown (trimmed) values.
+        """
+        if isinstance(values, pa.ChunkedArray):
+            values = values.combine_chunks()
+        encoded = values if pa.types.is_dictionary(values.type) else pc.dictionary_encode(values)
+        raw = encoded.dictionary
+        keys, alias_codes = self._arrow_lookup()
+
+        # Work on the distinct values only
+        hit = pc.index_in(pc.utf8_lower(pc.utf8_trim(raw, characters=" ")), value_set=keys)
+        known = hit.is_valid().to_numpy(zero_copy_only=False)
+        remap = np.empty(len(raw), dtype=np.int32)
+        remap[known] = alias_codes[pc.fill_null(hit, 0).to_numpy()[known]]
+
+        extras = pa.array([], pa.string())
+        if not known.all():
+            unknown = pc.utf8_trim(raw.filter(pa.array(~known)), characters=" ")
+            extras = pc.unique(unknown)
+            remap[~known] = len(self.categories) + pc.index_in(unknown, value_set=extras).to_numpy()
+
+        # The one integer remap over every row
+        indices = encoded.indices
+        codes = remap[pc.fill_null(indices, 0).to_numpy(zero_copy_only=False)]
+        mask = indices.is_null().to_numpy(zero_copy_only=False) if indices.null_count else None
+        dictionary = pa.concat_arrays([pa.array(self.categories, pa.string()), extras.cast(pa.string())])
+        return pa.DictionaryArray.from_arrays(pa.array(codes, pa.int32(), mask=mask), dictionary)
+
+    def apply(self, values) -> "pa.Array":
+        """Canonical values as a plain string array."""
+        return self.encode(values).dictionary_decode()
+
+    def categorical(self, series):
+        """A pandas Series of canonical values as a Categorical (comparisons are integer codes)."""
+        result = self.encode(pa.array(series, type=pa.string(), from_pandas=True)).to_pandas()
+        result.index = series.index
+        result.name = series.name
+        return result
+
+
+# ─── Reference-table dimensions ─────────────────────────────────────────────
+# Silver column → (reference table, canonical column, alias columns). Values
+# in any alias column standardize to the canonical column of the same row.
+# The dashboard compiles them from the reference CSVs; the generated Silver
+# SQL has no data dir, so it compiles them from src.reference_data (the rows
+# those CSVs are exported from) and emits their sql_case().
+REFERENCE_DIMENSIONS = {
+    "brand_code": ("brand_mapping", "code", ("airtable_value", "central_grid", "code")),
+    "channel_mapped": ("channel_mapping", "central_grid", ("airtable_value", "central_grid")),
+    "targeting_geo": ("markets", "geo", ("code", "geo", "country")),
+}
+
+
+def from_reference(name: str, rows: Iterable[dict], canonical: str, alias_columns: Iterable[str]) -> Canonicalizer:
+    """Compile a Canonicalizer from reference-table rows (dicts, e.g. DataFrame.to_dict('records'))."""
+    alias_columns = tuple(alias_columns)
+    pairs = ((row.get(col), row.get(canonical)) for row in rows for col in alias_columns)
+    return Canonicalizer.compile(name, ((a, c) for a, c in pairs if isinstance(a, str) and isinstance(c, str)))
+
+
+def _compile_reference(rows_for) -> dict:
+    return {column: from_reference(column, rows_for(table), canonical, alias_columns)
+            for column, (table, canonical, alias_columns) in REFERENCE_DIMENSIONS.items()}
+
+
+@lru_cache(maxsize=None)
+def generator_canonicalizers() -> dict:
+    """Silver column → Canonicalizer, built from reference_data's BRANDS / CHANNELS / MARKETS."""
+    rows = {"brand_mapping": BRANDS, "channel_mapping": CHANNELS, "markets": MARKETS}
+    return _compile_reference(rows.__getitem__)
+
+
+def reference_canonicalizers(source_dir: str = "data") -> dict:
+    """Silver column → Canonicalizer, built from the reference CSVs in `source_dir`."""
+    import pandas as pd
+    from src.pipelines.bronze_ingestion import REFERENCE_TABLES
+
+    def rows_for(table):
+        path = os.path.join(source_dir, REFERENCE_TABLES[table])
+        return pd.read_csv(path, dtype=str, keep_default_na=False).to_dict("records")
+
+    return _compile_reference(rows_for)
@@ -0,0 +1,285 @@
+"""
+File Index — min/max sidecar for partition & row-group pruning
+================================================================
+PURPOSE:
+  A query for one campaign or one week (fetch_pacing_data, dashboard
+  filters, Gold refresh) shouldn't open every delivery file in the lake.
+  Delta does this with data skipping: per-file min/max stats in the log.
+
+  This module keeps the same stats for the local Parquet stores in a small
+  sidecar, <table_dir>/_file_index.json, with one entry per file × row group:
+
+      {"path": "date=2026-02-01/part-optimize-...-0.parquet", "row_group": 3,
+       "num_rows": 4096, "min": {"campaign_id": "CMP-0120", "date": "2026-02-01"},
+       "max": {"campaign_id": "CMP-0171", "date": "2026-02-01"}}
+
+  Hive partition values (date=...) count as min = max for every row group
+  in that directory. prune() returns only the (file, row groups) whose
+  ranges can match a predicate; read_pruned() reads just those.
+
+  Works best after local_optimize (rows sorted by campaign_id → narrow
+  campaign ranges per row group), but is correct on any layout.
+
+FRESHNESS:
+  load_index() compares the sidecar with the files on disk every time: new or
+  changed files (size/mtime) get their footers read, deleted files drop
+  out. Only Parquet footers are read, never data pages.
+"""
+
+import bisect
+import glob
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from typing import Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+INDEX_FILE = "_file_index.json"
+# Columns worth indexing: campaign lookups, date ranges (Bronze `date`, Silver
+# `delivery_date`), ingest time (incremental Silver reads only new batches),
+# SCD2 validity (as-of reads of campaigns_history skip long-expired versions)
+# and delivery_id (the Silver MERGE finds rows a re-send moved to another date)
+INDEX_COLUMNS = ("campaign_id", "delivery_id", "date", "delivery_date", "_ingested_at",
+                 "_valid_from", "_valid_to")
+
+
+@dataclass
+class RowGroupStats:
+    """min/max of the indexed columns for one row group of one file."""
+    path: str
+    row_group: int
+    num_rows: int
+    min: dict = field(default_factory=dict)
+    max: dict = field(default_factory=dict)
+
+
+@dataclass
+class PruneResult:
+    """Which fragments a predicate can match, and how much was skipped."""
+    fragments: dict            # path → [row_group, ...]
+    row_groups_scanned: int
+    row_groups_total: int
+    rows_scanned: int
+    rows_total: int
+
+
+def _as_key(value) -> str:
+    """Index values are stored as strings; ISO dates compare correctly as strings."""
+    if isinstance(value, datetime):
+        # Fixed width, so 12:00:00 and 12:00:00.5 still compare correctly
+        return value.isoformat(timespec="microseconds")
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+class _SortedKeys(list):
+    """An IN-list predicate as sorted index keys (prune() builds it once per call)."""
+
+
+def table_files(table_dir: str) -> list:
+    """Data files of a local Parquet table, sorted; hidden/temp files (., _) are skipped."""
+    return sorted(p for p in glob.glob(os.path.join(table_dir, "**", "*.parquet"), recursive=True)
+                  if not os.path.basename(p).startswith((".", "_")))
+
+
+def partition_values(rel_path: str) -> dict:
+    """Hive partition values from a relative path: 'date=2026-02-01/x.parquet' → {'date': '2026-02-01'}."""
+    parts = {}
+    for piece in os.path.dirname(rel_path).split(os.sep):
+        if "=" in piece:
+            key, value = piece.split("=", 1)
+            parts[key] = value
+    return parts
+
+
+def _file_stats(table_dir: str, rel_path: str, columns) -> list:
+    """Read one file's footer into RowGroupStats entries."""
+    meta = pq.ParquetFile(os.path.join(table_dir, rel_path)).metadata
+    partitions = {k: v for k, v in partition_values(rel_path).items() if k in columns}
+    positions = {name: i for i, name in enumerate(meta.schema.names) if name in columns}
+    entries = []
+    for g in range(meta.num_row_groups):
+        group = meta.row_group(g)
+        entry = RowGroupStats(rel_path, g, group.num_rows, dict(partitions), dict(partitions))
+        for name, i in positions.items():
+            stats = group.column(i).statistics
+            if stats is not None and stats.has_min_max:
+                entry.min[name], entry.max[name] = _as_key(stats.min), _as_key(stats.max)
+        entries.append(entry)
+    return entries
+
+
+class FileIndex:
+    """Row-group min/max index for one local Parquet table directory."""
+
+    def __init__(self, table_dir: str, columns=INDEX_COLUMNS):
+        self.table_dir = table_dir
+        self.columns = tuple(columns)
+        self.files = {}      # rel_path → {"size", "mtime_ns", "row_groups": [RowGroupStats]}
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.table_dir, INDEX_FILE)
+
+    def refresh(self) -> bool:
+        """Sync with the files on disk; returns True if anything changed."""
+        on_disk = {}
+        for full in table_files(self.table_dir):
+            stat = os.stat(full)
+            on_disk[os.path.relpath(full, self.table_dir)] = (stat.st_size, stat.st_mtime_ns)
+
+        changed = False
+        for rel_path in list(self.files):
+            if rel_path not in on_disk:
+                del self.files[rel_path]
+                changed = True
+        for rel_path, (size, mtime_ns) in sorted(on_disk.items()):
+            known = self.files.get(rel_path)
+            if known and known["size"] == size and known["mtime_ns"] == mtime_ns:
+                continue
+            self.files[rel_path] = {
+                "size": size,
+                "mtime_ns": mtime_ns,
+                "row_groups": _file_stats(self.table_dir, rel_path, self.columns),
+            }
+            changed = True
+        return changed
+
+    def save(self):
+        payload = {
+            "columns": list(self.columns),
+            "files": {p: {**f, "row_groups": [asdict(rg) for rg in f["row_groups"]]}
+                      for p, f in self.files.items()},
+        }
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp, self.path)
+
+    @classmethod
+    def load(cls, table_dir: str, columns=INDEX_COLUMNS) -> "FileIndex":
+        index = cls(table_dir, columns)
+        if os.path.exists(index.path):
+            with open(index.path) as f:
+                payload = json.load(f)
+            if tuple(payload.get("columns", ())) == index.columns:
+                index.files = {
+                    p: {**f, "row_groups": [RowGroupStats(**rg) for rg in f["row_groups"]]}
+                    for p, f in payload["files"].items()
+                }
+        return index
+
+    @staticmethod
+    def _may_match(entry: RowGroupStats, predicates: dict) -> bool:
+        for column, wanted in predicates.items():
+            lo, hi = entry.min.get(column), entry.max.get(column)
+            if lo is None or hi is None:
+                continue        # no stats → can't rule it out
+            if isinstance(wanted, tuple):
+                low, high = wanted
+                if (high is not None and lo > _as_key(high)) or (low is not None and hi < _as_key(low)):
+                    return False
+            elif isinstance(wanted, _SortedKeys):
+                # IN list: is any key inside [lo, hi]? One binary search
+                i = bisect.bisect_left(wanted, lo)
+                if i == len(wanted) or wanted[i] > hi:
+                    return False
+            elif not lo <= _as_key(wanted) <= hi:
+                return False
+        return True
+
+    def prune(self, **predicates) -> PruneResult:
+        """
+        Fragments that can contain rows matching ALL predicates:
+
+            prune(campaign_id="CMP-0042")                    # equality
+            prune(campaign_id=["CMP-0001", "CMP-0002"])      # IN
+            prune(date=("2026-02-01", "2026-02-07"))         # inclusive range (None = open)
+        """
+        predicates = {column: _SortedKeys(sorted({_as_key(v) for v in wanted}))
+                      if isinstance(wanted, (list, set, frozenset)) else wanted
+                      for column, wanted in predicates.items()}
+        fragments, scanned, total, rows_scanned, rows_total = {}, 0, 0, 0, 0
+        for rel_path, info in self.files.items():
+            for entry in info["row_groups"]:
+                total += 1
+                rows_total += entry.num_rows
+                if self._may_match(entry, predicates):
+                    fragments.setdefault(rel_path, []).append(entry.row_group)
+                    scanned += 1
+                    rows_scanned += entry.num_rows
+        return PruneResult(fragments, scanned, total, rows_scanned, rows_total)
+
+
+def load_index(table_dir: str, columns=INDEX_COLUMNS) -> FileIndex:
+    """Load the sidecar, bring it up to date with the files on disk, and save it if it changed."""
+    index = FileIndex.load(table_dir, columns)
+    if index.refresh() or not os.path.exists(index.path):
+        index.save()
+    return index
+
+
+def _row_filter(predicates: dict, schema: pa.Schema):
+    """Exact row-level filter; predicate values are cast to the column type ("2026-02-01" → date32)."""
+    expr = None
+    for column, wanted in predicates.items():
+        field_ref, type_ = pc.field(column), schema.field(column).type
+
+        def lit(value):
+            return pa.scalar(value).cast(type_)
+
+        if isinstance(wanted, tuple):
+            low, high = wanted
+            parts = ([field_ref >= lit(low)] if low is not None else []) + \
+                    ([field_ref <= lit(high)] if high is not None else [])
+            if not parts:
+                continue
+            cond = parts[0] if len(parts) == 1 else parts[0] & parts[1]
+        elif isinstance(wanted, (list, set, frozenset)):
+            cond = field_ref.isin(pa.array([lit(v).as_py() for v in wanted], type_))
+        else:
+            cond = field_ref == lit(wanted)
+        expr = cond if expr is None else expr & cond
+    return expr
+
+
+def read_pruned(table_dir: str, schema: Optional[pa.Schema] = None, columns: Optional[list] = None,
+                **predicates) -> pa.Table:
+    """
+    Read only the row groups that can match, then apply the predicates row by
+    row. `schema` (e.g. local_bronze.arrow_schema("delivery")) types the
+    partition columns recovered from directory names; otherwise they're strings.
+    With `columns`, only those and the predicate columns are decoded from
+    the files (partition columns come from the path either way).
+    """
+    index = load_index(table_dir)
+    result = index.prune(**predicates)
+    needed = None if columns is None else set(columns) | set(predicates)
+    tables = []
+    for rel_path, row_groups in result.fragments.items():
+        parquet = pq.ParquetFile(os.path.join(table_dir, rel_path))
+        read = None if needed is None else [n for n in parquet.schema_arrow.names if n in needed]
+        table = parquet.read_row_groups(row_groups, columns=read)
+        for key, value in partition_values(rel_path).items():
+            if key in table.column_names:
+                continue
+            type_ = schema.field(key).type if schema is not None and key in schema.names else pa.string()
+            table = table.append_column(key, pa.repeat(pa.scalar(value).cast(type_), table.num_rows))
+        if schema is not None:
+            table = table.select([n for n in schema.names if n in table.column_names])
+        tables.append(table)
+
+    if not tables:
+        if schema is None:
+            return pa.table({})
+        return schema.empty_table() if columns is None else schema.empty_table().select(columns)
+    table = pa.concat_tables(tables, promote_options="default")
+    expr = _row_filter(predicates, table.schema)
+    if expr is not None:
+        table = table.filter(expr)
+    return table.select(columns) if columns else table
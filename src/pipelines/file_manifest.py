@@ -0,0 +1,155 @@
+"""
+File Manifest — local stand-in for the Auto Loader checkpoint
+==============================================================
+PURPOSE:
+  generate_autoloader_sql() relies on a cloudFiles checkpoint so each run
+  only processes NEW files. Off-cluster there's no checkpoint, so local
+  ingestion would re-read the whole history every hourly refresh.
+
+  FileManifest remembers every file already loaded, keyed by
+  path + size + mtime + content hash:
+
+  - Same path, same size and mtime → skipped without opening the file
+  - Size or mtime changed → re-hashed; same content (e.g. `touch`, a
+    re-copy) is still skipped, different content is new data — even if
+    that content was loaded before (a snapshot going A → B → A reloads A)
+  - Content already seen under another, NEW path (a platform re-sending
+    yesterday's export under a new name) → skipped, and its path is
+    recorded as an alias so the next run skips it without hashing. Only
+    for append tables (new_files(aliases=True)): a snapshot table's new
+    file replaces the table, so tickets_v3.csv equal to tickets_v1.csv is
+    reloaded — the table has to go back to that state
+
+  So an hourly refresh costs a directory listing plus reading the new files:
+  O(new data), not O(history).
+
+STORAGE:
+  An append-only JSONL log (one line per committed file), like a Delta
+  transaction log. Commits append; they never rewrite what's there, and the
+  last line for a path wins when loading.
+
+  data/bronze/_checkpoints/delivery.jsonl
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+HASH_CHUNK_BYTES = 1 << 20
+
+
+def file_sha256(path: str) -> str:
+    """Content hash, streamed in 1 MB chunks so large exports don't load into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """One processed (or about-to-be-processed) source file."""
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    batch_id: str = ""
+    committed_at: str = ""
+
+
+class FileManifest:
+    """
+    Persistent record of which source files have already been ingested.
+
+    Typical use (see local_bronze.ingest_incremental):
+
+        manifest = FileManifest("data/bronze/_checkpoints/delivery.jsonl")
+        pending = manifest.new_files(paths)
+        ... load pending files ...
+        manifest.commit(pending, batch_id)
+
+    Commit only after the load succeeded: a crash in between means the files
+    are picked up again next run (at-least-once, same as Auto Loader).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._by_path = {}
+        self._hashes = {}       # sha256 → first entry with that content
+        self._restat = []       # known content under a changed stat or a new path
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        self._remember(ManifestEntry(**json.loads(line)))
+
+    def _remember(self, entry: ManifestEntry):
+        self._by_path[entry.path] = entry
+        self._hashes.setdefault(entry.sha256, entry)
+
+    def __len__(self) -> int:
+        return len(self._by_path)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._by_path
+
+    def get(self, path: str) -> Optional[ManifestEntry]:
+        return self._by_path.get(path)
+
+    def new_files(self, paths: Iterable[str], root: str = "", aliases: bool = True) -> list:
+        """
+        Return a ManifestEntry for each path not yet ingested, in the given order.
+
+        Paths are manifest keys; `root` is prepended only to stat/read them, so
+        keys stay stable if the data directory moves. Files are hashed only
+        when their size or mtime differs from what was committed.
+
+        aliases=False is for snapshot (overwrite) tables: a new path whose
+        content was committed before is still new, and only a copy within
+        this same listing is skipped.
+        """
+        pending = []
+        seen_now = set()
+        for path in paths:
+            stat = os.stat(os.path.join(root, path))
+            known = self._by_path.get(path)
+            if known and known.size == stat.st_size and known.mtime_ns == stat.st_mtime_ns:
+                continue
+            sha = file_sha256(os.path.join(root, path))
+            if known and known.sha256 == sha:
+                # touched / re-copied: record the new stat so it isn't re-hashed next run
+                self._restat.append(ManifestEntry(path, stat.st_size, stat.st_mtime_ns, sha,
+                                                  known.batch_id, known.committed_at))
+                continue
+            original = self._hashes.get(sha) if aliases else None
+            if not known and (original or sha in seen_now):
+                # re-sent under a new path: an alias entry, so it isn't re-hashed
+                # next run (a same-run copy takes the batch_id at commit)
+                self._restat.append(ManifestEntry(path, stat.st_size, stat.st_mtime_ns, sha,
+                                                  *((original.batch_id, original.committed_at)
+                                                    if original else ())))
+                continue
+            seen_now.add(sha)
+            pending.append(ManifestEntry(path, stat.st_size, stat.st_mtime_ns, sha))
+        return pending
+
+    def commit(self, entries: Iterable[ManifestEntry], batch_id: str):
+        """Append entries to the log (fsync'd) and mark them processed."""
+        entries = list(entries)
+        committed_at = datetime.now(timezone.utc).isoformat()
+        for entry in entries + [e for e in self._restat if not e.batch_id]:
+            entry.batch_id, entry.committed_at = batch_id, committed_at
+        entries, self._restat = self._restat + entries, []
+        if not entries:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a") as f:
+            for entry in entries:
+                f.write(json.dumps(asdict(entry)) + "\n")
+                self._remember(entry)
+            f.flush()
+            os.fsync(f.fileno())
@@ -23,60 +23,388 @@ KEY CONCEPTS:
   2. Window functions: Week-over-week comparisons, running totals
   3. Materialized views: Trade storage for query speed
   4. Business-friendly naming: No abbreviations, no internal codes
+  5. Incremental state: campaign_performance reads per-campaign running
+     totals that each Silver delivery batch updates, so the hourly pacing
+     refresh touches only the campaigns that batch changed
+  6. Sliding windows: trailing-N-day sums live in their own table; moving
+     the window forward subtracts the expired days from a campaign × date
+     rollup instead of re-summing the last N days
+  7. Shared intermediates: Gold tables declare the rollup they read
+     (GOLD_TABLES); generate_gold_refresh_sql builds it once per refresh
 """
 
 
-def generate_gold_campaign_performance_sql(
+# ─── Incremental delivery state ─────────────────────────────────────────────
+# Gold keeps three small structures in step with Silver delivery, so refreshes
+# never rescan the delivery history:
+#
+#   campaign_delivery_rollup    campaign × delivery_date buckets
+#   _campaign_delivery_state    one row of running totals per campaign
+#   _campaign_trailing_window   per-campaign sums over the last N days
+#
+# All three hold the same measures. Averages are stored as sum + count of
+# non-null values (so they can be un-applied too) and divided at read time.
+ROLLUP_TABLE = "campaign_delivery_rollup"
+CAMPAIGN_STATE_TABLE = "_campaign_delivery_state"
+WINDOW_TABLE = "_campaign_trailing_window"
+DELIVERY_CHANGES_TABLE = "_delivery_changes"
+# Trailing window campaign_performance reports (the *_last_7d columns), in days
+PERFORMANCE_WINDOW_DAYS = 7
+# Trailing windows kept per campaign, in days
+TRAILING_WINDOWS = (PERFORMANCE_WINDOW_DAYS,)
+
+
+def _delivery_aggregates(sign: str) -> str:
+    """
+    Aggregate expressions over delivery rows weighted by `sign`
+    ("1" for a full build, "_sign" for ±1 change rows).
+    """
+    def weighted(expr):
+        return expr if sign == "1" else f"{sign} * {expr}"
+
+    def total(column):
+        return f"COALESCE(SUM({weighted(column)}), 0)"
+
+    def count(column):
+        return f"COALESCE(SUM(CASE WHEN {column} IS NOT NULL THEN {sign} ELSE 0 END), 0)"
+
+    return f"""SUM({sign}) as delivery_rows,
+        {total("impressions")} as total_impressions,
+        {total("clicks")} as total_clicks,
+        {total("spend_usd")} as total_spend,
+        {total("vast_errors")} as total_vast_errors,
+        {total("ctr")} as ctr_sum,
+        {count("ctr")} as ctr_count,
+        {total("viewability_rate")} as viewability_sum,
+        {count("viewability_rate")} as viewability_count,
+        {total("cpm")} as cpm_sum,
+        {count("cpm")} as cpm_count,
+        {total("cpc")} as cpc_sum,
+        {count("cpc")} as cpc_count,
+        SUM(CASE WHEN impressions = 0 THEN {sign} ELSE 0 END) as zero_delivery_days,
+        SUM(CASE WHEN _suspicious_ctr THEN {sign} ELSE 0 END) as suspicious_ctr_days"""
+
+
+# Silver delivery columns the measures are built from
+_DELIVERY_INPUTS = (
+    "campaign_id", "delivery_date", "impressions", "clicks", "spend_usd", "vast_errors",
+    "ctr", "viewability_rate", "cpm", "cpc", "_suspicious_ctr",
+)
+# The measures of _delivery_aggregates: running totals (t.x + s.x on MERGE)
+DELIVERY_MEASURES = (
+    "delivery_rows", "total_impressions", "total_clicks", "total_spend", "total_vast_errors",
+    "ctr_sum", "ctr_count", "viewability_sum", "viewability_count", "cpm_sum", "cpm_count",
+    "cpc_sum", "cpc_count", "zero_delivery_days", "suspicious_ctr_days",
+)
+
+
+def _add_measures(indent: str = "    ") -> str:
+    return f",\n{indent}".join(f"{m} = t.{m} + s.{m}" for m in DELIVERY_MEASURES)
+
+
+def _sum_measures(alias: str = "", indent: str = "        ", coalesce: bool = False) -> str:
+    prefix = f"{alias}." if alias else ""
+    template = "COALESCE(SUM({0}{1}), 0) as {1}" if coalesce else "SUM({0}{1}) as {1}"
+    return f",\n{indent}".join(template.format(prefix, m) for m in DELIVERY_MEASURES)
+
+
+def generate_gold_rollup_sql(
     catalog: str = "hive_metastore",
     silver_schema: str = "adops_silver",
     gold_schema: str = "adops_gold"
 ) -> str:
     """
-    Campaign Performance Summary — the #1 table for ad ops managers.
-    
-    This answers: "For every active campaign, what's our delivery status,
-    pacing health, and spend efficiency?"
-    
-    PACING EXPLAINED:
-    If a campaign runs Jan 1-31 with a 100K impression goal:
-    - On Jan 15 (50% of time elapsed), you should have ~50K impressions
-    - If you have 70K → Over-pacing (you'll exhaust budget early)
-    - If you have 30K → Under-pacing (you won't hit the goal)
-    - Pacing ratio = actual_delivery% / expected_delivery%
+    (Re)build the campaign × date rollup from Silver delivery — the one full
+    scan of the fact table. Silver delivery MERGEs keep it current after that.
     """
-    return f"""
--- =====================================================================
--- Gold: Campaign Performance Summary
--- Refreshed daily. This is what dashboards pull from.
--- =====================================================================
-CREATE OR REPLACE TABLE {catalog}.{gold_schema}.campaign_performance AS
+    return f"""CREATE OR REPLACE TABLE {catalog}.{gold_schema}.{ROLLUP_TABLE} AS
+SELECT
+        campaign_id,
+        delivery_date,
+        {_delivery_aggregates("1")},
+        current_timestamp() as _rollup_updated_at
+FROM {catalog}.{silver_schema}.delivery
+GROUP BY campaign_id, delivery_date;"""
 
-WITH delivery_totals AS (
-    -- Aggregate all delivery data per campaign
-    SELECT
+
+def generate_gold_campaign_state_sql(
+    catalog: str = "hive_metastore",
+    gold_schema: str = "adops_gold"
+) -> str:
+    """(Re)build the per-campaign running totals from the rollup."""
+    return f"""CREATE OR REPLACE TABLE {catalog}.{gold_schema}.{CAMPAIGN_STATE_TABLE} AS
+SELECT
         campaign_id,
-        COUNT(DISTINCT delivery_date) as days_with_delivery,
-        SUM(impressions) as total_impressions,
-        SUM(clicks) as total_clicks,
-        SUM(spend_usd) as total_spend,
-        SUM(vast_errors) as total_vast_errors,
-        AVG(viewability_rate) as avg_viewability,
-        AVG(cpm) as avg_cpm,
-        AVG(cpc) as avg_cpc,
-        MAX(delivery_date) as last_delivery_date,
+        COUNT(*) as days_with_delivery,
         MIN(delivery_date) as first_delivery_date,
-        
-        -- Trailing 7-day metrics (last week's performance)
-        SUM(CASE WHEN delivery_date >= date_sub(current_date(), 7) THEN impressions ELSE 0 END) as impressions_last_7d,
-        SUM(CASE WHEN delivery_date >= date_sub(current_date(), 7) THEN spend_usd ELSE 0 END) as spend_last_7d,
-        SUM(CASE WHEN delivery_date >= date_sub(current_date(), 7) THEN clicks ELSE 0 END) as clicks_last_7d,
-        
-        -- Count anomalous days
-        SUM(CASE WHEN impressions = 0 THEN 1 ELSE 0 END) as zero_delivery_days,
-        SUM(CASE WHEN _suspicious_ctr THEN 1 ELSE 0 END) as suspicious_ctr_days
-        
-    FROM {catalog}.{silver_schema}.delivery
-    GROUP BY campaign_id
+        MAX(delivery_date) as last_delivery_date,
+        {_sum_measures()},
+        current_timestamp() as _state_updated_at
+FROM {catalog}.{gold_schema}.{ROLLUP_TABLE}
+WHERE delivery_rows > 0
+GROUP BY campaign_id;"""
+
+
+def generate_gold_window_sql(
+    catalog: str = "hive_metastore",
+    gold_schema: str = "adops_gold",
+    windows=TRAILING_WINDOWS
+) -> str:
+    """
+    (Re)build the trailing-window sums: for each N in `windows`, every
+    campaign's measures over delivery_date >= date_sub(current_date(), N).
+    """
+    selects = "\nUNION ALL\n".join(f"""SELECT
+        campaign_id,
+        {days} as window_days,
+        date_sub(current_date(), {days}) as window_start,
+        {_sum_measures()},
+        current_timestamp() as _window_updated_at
+FROM {catalog}.{gold_schema}.{ROLLUP_TABLE}
+WHERE delivery_date >= date_sub(current_date(), {days})
+GROUP BY campaign_id""" for days in windows)
+    return f"""CREATE OR REPLACE TABLE {catalog}.{gold_schema}.{WINDOW_TABLE} AS
+{selects};"""
+
+
+def generate_gold_window_advance_sql(
+    catalog: str = "hive_metastore",
+    gold_schema: str = "adops_gold"
+) -> str:
+    """
+    Slide every trailing window up to today: subtract the buckets of the days
+    that fell out (window_start up to the new start) in one MERGE. Reads
+    only those days of the rollup, so the cost is O(campaigns × days
+    advanced) — zero work when the window already starts today.
+    """
+    window = f"{catalog}.{gold_schema}.{WINDOW_TABLE}"
+    subtract = ",\n    ".join(f"{m} = t.{m} - s.{m}" for m in DELIVERY_MEASURES)
+    return f"""MERGE INTO {window} AS t
+USING (
+    SELECT
+        w.campaign_id,
+        w.window_days,
+        date_sub(current_date(), w.window_days) as window_start,
+        {_sum_measures("r", coalesce=True)}
+    FROM {window} w
+    LEFT JOIN {catalog}.{gold_schema}.{ROLLUP_TABLE} r
+        ON r.campaign_id = w.campaign_id
+        AND r.delivery_date >= w.window_start
+        AND r.delivery_date < date_sub(current_date(), w.window_days)
+    WHERE w.window_start < date_sub(current_date(), w.window_days)
+    GROUP BY w.campaign_id, w.window_days
+) AS s
+ON t.campaign_id = s.campaign_id AND t.window_days = s.window_days
+WHEN MATCHED THEN UPDATE SET
+    window_start = s.window_start,
+    {subtract},
+    _window_updated_at = current_timestamp();"""
+
+
+def generate_gold_delivery_changes_sql(
+    upserts: str,
+    catalog: str = "hive_metastore",
+    silver_schema: str = "adops_silver",
+    gold_schema: str = "adops_gold",
+    windows=TRAILING_WINDOWS
+) -> str:
+    """
+    Fold one Silver delivery batch into the rollup, the per-campaign state
+    and the trailing windows, in O(batch).
+
+    `upserts` is the cleaned batch about to be MERGEd into Silver delivery;
+    this must run BEFORE that MERGE (generate_silver_delivery_merge_sql does
+    it with gold_schema=...). Each upsert the MERGE will apply counts +1, and
+    the Silver row it replaces counts -1, so re-sent rows are netted out.
+    The signed rows are staged once in {DELIVERY_CHANGES_TABLE}; every
+    structure then MERGEs its own GROUP BY of them.
+
+    A campaign-day counts toward days_with_delivery while its rollup bucket
+    has rows. A re-send with a corrected date (or campaign) is a -1 in its
+    old bucket and a +1 in the new one, so a bucket it empties takes the day
+    back off; a campaign that lost a day has first/last_delivery_date
+    re-read from the days it keeps in the rollup (its campaign × date rows
+    only), and one left with no days is deleted, as the full build omits it.
+    """
+    silver = f"{catalog}.{silver_schema}.delivery"
+    gold = f"{catalog}.{gold_schema}"
+    changes = f"{gold}.{DELIVERY_CHANGES_TABLE}"
+    state = ("campaign_id", "days_with_delivery", "first_delivery_date", "last_delivery_date") + DELIVERY_MEASURES
+    state_columns = ", ".join(state + ("_state_updated_at",))
+    state_values = ", ".join(f"s.{c}" for c in state)
+    new_rows = ", ".join(f"s.{c}" for c in _DELIVERY_INPUTS)
+    old_rows = ", ".join(f"o.{c}" for c in _DELIVERY_INPUTS)
+    window_merges = "\n\n".join(f"""MERGE INTO {gold}.{WINDOW_TABLE} AS t
+USING (
+    SELECT
+        c.campaign_id,
+        {days} as window_days,
+        COALESCE(MAX(w.window_start), date_sub(current_date(), {days})) as window_start,
+        {_delivery_aggregates("_sign")},
+        current_timestamp() as _window_updated_at
+    FROM {changes} c
+    LEFT JOIN {gold}.{WINDOW_TABLE} w ON w.campaign_id = c.campaign_id AND w.window_days = {days}
+    WHERE c.delivery_date >= COALESCE(w.window_start, date_sub(current_date(), {days}))
+    GROUP BY c.campaign_id
+) AS s
+ON t.campaign_id = s.campaign_id AND t.window_days = s.window_days
+WHEN MATCHED THEN UPDATE SET
+    {_add_measures()},
+    _window_updated_at = current_timestamp()
+WHEN NOT MATCHED THEN INSERT *;""" for days in windows)
+
+    return f"""-- The batch as signed rows: +1 for each upsert the MERGE will apply,
+-- -1 for each Silver row it replaces
+CREATE OR REPLACE TABLE {changes} AS
+SELECT {new_rows}, 1 as _sign
+FROM {upserts} s
+LEFT JOIN {silver} o ON o.delivery_id = s.delivery_id
+WHERE o.delivery_id IS NULL OR s._ingested_at >= o._ingested_at
+UNION ALL
+SELECT {old_rows}, -1 as _sign
+FROM {upserts} s
+JOIN {silver} o ON o.delivery_id = s.delivery_id
+WHERE s._ingested_at >= o._ingested_at;
+
+-- Per-campaign running totals. Campaign-days are counted by their rollup
+-- bucket: +1 when it gains its first row, -1 when the batch empties it
+MERGE INTO {gold}.{CAMPAIGN_STATE_TABLE} AS t
+USING (
+    WITH buckets AS (
+        SELECT
+            c.campaign_id,
+            c.delivery_date,
+            COALESCE(MAX(r.delivery_rows), 0) as rows_before,
+            COALESCE(MAX(r.delivery_rows), 0) + SUM(c._sign) as rows_after
+        FROM {changes} c
+        LEFT JOIN {gold}.{ROLLUP_TABLE} r
+            ON r.campaign_id = c.campaign_id AND r.delivery_date = c.delivery_date
+        GROUP BY c.campaign_id, c.delivery_date
+    ),
+    days AS (
+        SELECT
+            campaign_id,
+            SUM(CASE WHEN rows_before = 0 AND rows_after > 0 THEN 1
+                     WHEN rows_before > 0 AND rows_after = 0 THEN -1
+                     ELSE 0 END) as days_with_delivery,
+            MIN(CASE WHEN rows_after > 0 THEN delivery_date END) as first_delivery_date,
+            MAX(CASE WHEN rows_after > 0 THEN delivery_date END) as last_delivery_date,
+            MAX(CASE WHEN rows_before > 0 AND rows_after = 0 THEN 1 ELSE 0 END) = 1 as days_emptied
+        FROM buckets
+        GROUP BY campaign_id
+    ),
+    kept_days AS (
+        -- Only for campaigns that lost a day: first/last over the days they keep
+        SELECT
+            r.campaign_id,
+            MIN(r.delivery_date) as first_delivery_date,
+            MAX(r.delivery_date) as last_delivery_date
+        FROM {gold}.{ROLLUP_TABLE} r
+        JOIN days d ON d.campaign_id = r.campaign_id AND d.days_emptied
+        LEFT JOIN buckets b ON b.campaign_id = r.campaign_id AND b.delivery_date = r.delivery_date
+        WHERE COALESCE(b.rows_after, r.delivery_rows) > 0
+        GROUP BY r.campaign_id
+    ),
+    measures AS (
+        SELECT
+            campaign_id,
+            {_delivery_aggregates("_sign")}
+        FROM {changes}
+        GROUP BY campaign_id
+    )
+    SELECT
+        m.*,
+        d.days_with_delivery,
+        LEAST(d.first_delivery_date, k.first_delivery_date) as first_delivery_date,
+        GREATEST(d.last_delivery_date, k.last_delivery_date) as last_delivery_date,
+        d.days_emptied
+    FROM measures m
+    JOIN days d ON d.campaign_id = m.campaign_id
+    LEFT JOIN kept_days k ON k.campaign_id = m.campaign_id
+) AS s
+ON t.campaign_id = s.campaign_id
+WHEN MATCHED AND t.days_with_delivery + s.days_with_delivery <= 0 THEN DELETE
+WHEN MATCHED THEN UPDATE SET
+    days_with_delivery = t.days_with_delivery + s.days_with_delivery,
+    first_delivery_date = CASE WHEN s.days_emptied THEN s.first_delivery_date
+                               ELSE LEAST(t.first_delivery_date, s.first_delivery_date) END,
+    last_delivery_date = CASE WHEN s.days_emptied THEN s.last_delivery_date
+                              ELSE GREATEST(t.last_delivery_date, s.last_delivery_date) END,
+    {_add_measures()},
+    _state_updated_at = current_timestamp()
+WHEN NOT MATCHED THEN INSERT ({state_columns})
+    VALUES ({state_values}, current_timestamp());
+
+-- Trailing windows: only changes on or after each window's start
+{window_merges}
+
+-- Campaign × date buckets
+MERGE INTO {gold}.{ROLLUP_TABLE} AS t
+USING (
+    SELECT
+        campaign_id,
+        delivery_date,
+        {_delivery_aggregates("_sign")},
+        current_timestamp() as _rollup_updated_at
+    FROM {changes}
+    GROUP BY campaign_id, delivery_date
+) AS s
+ON t.campaign_id = s.campaign_id AND t.delivery_date = s.delivery_date
+WHEN MATCHED THEN UPDATE SET
+    {_add_measures()},
+    _rollup_updated_at = current_timestamp()
+WHEN NOT MATCHED THEN INSERT *;"""
+
+
+def _campaign_performance_select(catalog: str, silver_schema: str, gold_schema: str,
+                                 touched_only: bool = False,
+                                 window_days: int = PERFORMANCE_WINDOW_DAYS) -> str:
+    """
+    The campaign_performance rows, from the per-campaign state and the
+    `window_days` trailing window — no scan of Silver delivery.
+    touched_only limits it to campaigns whose state or window changed after
+    their current campaign_performance row was written.
+    """
+    if window_days not in TRAILING_WINDOWS:
+        raise ValueError(f"window_days={window_days} is not a maintained trailing window {TRAILING_WINDOWS}")
+    last = f"last_{window_days}d"
+    state = f"{catalog}.{gold_schema}.{CAMPAIGN_STATE_TABLE}"
+    window = f"{catalog}.{gold_schema}.{WINDOW_TABLE}"
+    touched, where = "", ""
+    if touched_only:
+        touched = f"""WITH touched AS (
+    -- Campaigns a Silver batch or a window advance changed since their row was last refreshed
+    SELECT s.campaign_id
+    FROM {state} s
+    LEFT JOIN {catalog}.{gold_schema}.campaign_performance p ON p.campaign_id = s.campaign_id
+    LEFT JOIN {window} w ON w.campaign_id = s.campaign_id AND w.window_days = {window_days}
+    WHERE p.campaign_id IS NULL
+       OR s._state_updated_at > p._gold_refreshed_at
+       OR w._window_updated_at > p._gold_refreshed_at
+),
+"""
+        where = "    WHERE c.campaign_id IN (SELECT campaign_id FROM touched)\n"
+    return f"""{touched or "WITH "}delivery_totals AS (
+    -- Running per-campaign totals and trailing-window sums: no scan of the delivery history
+    SELECT
+        s.campaign_id,
+        s.days_with_delivery,
+        s.total_impressions,
+        s.total_clicks,
+        s.total_spend,
+        s.total_vast_errors,
+        s.viewability_sum / NULLIF(s.viewability_count, 0) as avg_viewability,
+        s.cpm_sum / NULLIF(s.cpm_count, 0) as avg_cpm,
+        s.cpc_sum / NULLIF(s.cpc_count, 0) as avg_cpc,
+        s.last_delivery_date,
+        s.first_delivery_date,
+        COALESCE(w.total_impressions, 0) as impressions_{last},
+        COALESCE(w.total_spend, 0) as spend_{last},
+        COALESCE(w.total_clicks, 0) as clicks_{last},
+        s.zero_delivery_days,
+        s.suspicious_ctr_days
+    FROM {state} s
+    LEFT JOIN {window} w ON w.campaign_id = s.campaign_id AND w.window_days = {window_days}
 ),
 campaign_pacing AS (
     SELECT
@@ -114,8 +442,8 @@ campaign_pacing AS (
         COALESCE(d.zero_delivery_days, 0) as zero_delivery_days,
         
         -- Trailing window
-        COALESCE(d.impressions_last_7d, 0) as impressions_last_7d,
-        COALESCE(d.spend_last_7d, 0) as spend_last_7d,
+        COALESCE(d.impressions_{last}, 0) as impressions_{last},
+        COALESCE(d.spend_{last}, 0) as spend_{last},
         
         -- Pacing calculations
         CASE WHEN c.impressions_goal > 0 
@@ -139,7 +467,7 @@ campaign_pacing AS (
         
     FROM {catalog}.{silver_schema}.campaigns c
     LEFT JOIN delivery_totals d ON c.campaign_id = d.campaign_id
-)
+{where})
 SELECT
     *,
     
@@ -186,65 +514,196 @@ SELECT
     
     current_timestamp() as _gold_refreshed_at
 
-FROM campaign_pacing;
-"""
+FROM campaign_pacing"""
 
 
-def generate_gold_daily_ops_summary_sql(
+def generate_gold_campaign_performance_sql(
     catalog: str = "hive_metastore",
     silver_schema: str = "adops_silver",
-    gold_schema: str = "adops_gold"
+    gold_schema: str = "adops_gold",
+    incremental: bool = False,
+    window_days: int = PERFORMANCE_WINDOW_DAYS
 ) -> str:
     """
-    Daily Operations Summary — one row per day with all key metrics.
-    Perfect for time-series dashboards and trend analysis.
+    Campaign Performance Summary — the #1 table for ad ops managers.
+    
+    This answers: "For every active campaign, what's our delivery status,
+    pacing health, and spend efficiency?"
+    
+    PACING EXPLAINED:
+    If a campaign runs Jan 1-31 with a 100K impression goal:
+    - On Jan 15 (50% of time elapsed), you should have ~50K impressions
+    - If you have 70K → Over-pacing (you'll exhaust budget early)
+    - If you have 30K → Under-pacing (you won't hit the goal)
+    - Pacing ratio = actual_delivery% / expected_delivery%
+
+    FULL vs INCREMENTAL:
+    The full build (daily) rebuilds the per-campaign state and trailing
+    window from campaign_delivery_rollup, then the whole table. The rollup
+    is a declared dependency: build it first, or use
+    generate_gold_refresh_sql.
+
+    incremental=True (the hourly pacing_refresh) slides the trailing window
+    forward, subtracting only the expired days. It then re-derives pacing,
+    alert_priority and the forecast only for the campaigns whose state or
+    window changed since their last refresh, so its cost follows the batch
+    and the campaign count, not the history.
+
+    window_days picks the trailing window behind the *_last_Nd columns. It
+    must be one of TRAILING_WINDOWS, the windows the hourly path maintains.
     """
+    if incremental:
+        return f"""
+-- =====================================================================
+-- Gold: Campaign Performance Summary (incremental)
+-- Re-derive only campaigns whose delivery state changed since their last refresh
+-- =====================================================================
+-- Step 1: slide the trailing window up to today
+{generate_gold_window_advance_sql(catalog, gold_schema)}
+
+-- Step 2: refresh the touched campaigns
+MERGE INTO {catalog}.{gold_schema}.campaign_performance AS t
+USING (
+{_campaign_performance_select(catalog, silver_schema, gold_schema, touched_only=True, window_days=window_days)}
+) AS s
+ON t.campaign_id = s.campaign_id
+WHEN MATCHED THEN UPDATE SET *
+WHEN NOT MATCHED THEN INSERT *;
+"""
     return f"""
 -- =====================================================================
--- Gold: Daily Operations Summary
--- One row per day — ideal for trend charts and daily standup reports
+-- Gold: Campaign Performance Summary
+-- Refreshed daily. This is what dashboards pull from.
 -- =====================================================================
-CREATE OR REPLACE TABLE {catalog}.{gold_schema}.daily_ops_summary AS
+-- Step 1: per-campaign running totals and trailing windows, from the rollup
+{generate_gold_campaign_state_sql(catalog, gold_schema)}
 
-SELECT
-    d.delivery_date,
-    
-    -- Volume metrics
-    COUNT(DISTINCT d.campaign_id) as active_campaigns,
-    SUM(d.impressions) as total_impressions,
-    SUM(d.clicks) as total_clicks,
-    SUM(d.spend_usd) as total_spend,
-    
-    -- Efficiency metrics
-    ROUND(AVG(d.ctr) * 100, 4) as avg_ctr_pct,
-    ROUND(AVG(d.cpm), 2) as avg_cpm,
-    ROUND(AVG(d.viewability_rate) * 100, 2) as avg_viewability_pct,
-    
-    -- Quality metrics
-    SUM(d.vast_errors) as total_vast_errors,
-    ROUND(SUM(d.vast_errors) * 100.0 / NULLIF(SUM(d.impressions) + SUM(d.vast_errors), 0), 4) as vast_error_rate_pct,
-    SUM(CASE WHEN d.impressions = 0 THEN 1 ELSE 0 END) as zero_delivery_count,
-    
-    -- Platform breakdown
-    COUNT(DISTINCT CASE WHEN c.platform = 'Meta' THEN d.campaign_id END) as meta_campaigns,
-    COUNT(DISTINCT CASE WHEN c.platform = 'CM360' THEN d.campaign_id END) as cm360_campaigns,
-    COUNT(DISTINCT CASE WHEN c.platform = 'TikTok' THEN d.campaign_id END) as tiktok_campaigns,
-    COUNT(DISTINCT CASE WHEN c.platform = 'Amazon DSP' THEN d.campaign_id END) as amazon_campaigns,
+{generate_gold_window_sql(catalog, gold_schema)}
+
+-- Step 2: the summary itself
+CREATE OR REPLACE TABLE {catalog}.{gold_schema}.campaign_performance AS
+
+{_campaign_performance_select(catalog, silver_schema, gold_schema, window_days=window_days)};
+"""
+
+
+def _daily_ops_with_wow(days: str) -> str:
+    """
+    daily_ops_summary rows from a `daily` CTE (one row per delivery_date),
+    with week-over-week read from the row dated exactly 7 days earlier.
+    `days` restricts which dates are emitted (a WHERE clause, or "").
+    """
+    return f"""SELECT
+    t.*,
     
-    -- Week-over-week comparisons using window functions
-    LAG(SUM(d.impressions), 7) OVER (ORDER BY d.delivery_date) as impressions_7d_ago,
+    -- Week-over-week comparison: the same weekday last week
+    w.total_impressions as impressions_7d_ago,
     ROUND(
-        (SUM(d.impressions) - LAG(SUM(d.impressions), 7) OVER (ORDER BY d.delivery_date))
-        * 100.0 / NULLIF(LAG(SUM(d.impressions), 7) OVER (ORDER BY d.delivery_date), 0),
+        (t.total_impressions - w.total_impressions) * 100.0 / NULLIF(w.total_impressions, 0),
         2
     ) as impressions_wow_change_pct,
     
     current_timestamp() as _gold_refreshed_at
 
-FROM {catalog}.{silver_schema}.delivery d
-LEFT JOIN {catalog}.{silver_schema}.campaigns c ON d.campaign_id = c.campaign_id
-GROUP BY d.delivery_date
-ORDER BY d.delivery_date;
+FROM daily t
+LEFT JOIN daily w ON w.delivery_date = date_sub(t.delivery_date, 7)
+{days}"""
+
+
+def _daily_ops_daily_cte(catalog: str, silver_schema: str, gold_schema: str, days: str = "") -> str:
+    """The per-day aggregates, from the rollup; `days` narrows the dates read."""
+    return f"""daily AS (
+    SELECT
+        r.delivery_date,
+        
+        -- Volume metrics
+        COUNT(*) as active_campaigns,
+        SUM(r.total_impressions) as total_impressions,
+        SUM(r.total_clicks) as total_clicks,
+        SUM(r.total_spend) as total_spend,
+        
+        -- Efficiency metrics (averages over delivery rows: sum / count)
+        ROUND(SUM(r.ctr_sum) / NULLIF(SUM(r.ctr_count), 0) * 100, 4) as avg_ctr_pct,
+        ROUND(SUM(r.cpm_sum) / NULLIF(SUM(r.cpm_count), 0), 2) as avg_cpm,
+        ROUND(SUM(r.viewability_sum) / NULLIF(SUM(r.viewability_count), 0) * 100, 2) as avg_viewability_pct,
+        
+        -- Quality metrics
+        SUM(r.total_vast_errors) as total_vast_errors,
+        ROUND(SUM(r.total_vast_errors) * 100.0
+              / NULLIF(SUM(r.total_impressions) + SUM(r.total_vast_errors), 0), 4) as vast_error_rate_pct,
+        SUM(r.zero_delivery_days) as zero_delivery_count,
+        
+        -- Platform breakdown (one rollup row per campaign and day)
+        COUNT(CASE WHEN c.platform = 'Meta' THEN 1 END) as meta_campaigns,
+        COUNT(CASE WHEN c.platform = 'CM360' THEN 1 END) as cm360_campaigns,
+        COUNT(CASE WHEN c.platform = 'TikTok' THEN 1 END) as tiktok_campaigns,
+        COUNT(CASE WHEN c.platform = 'Amazon DSP' THEN 1 END) as amazon_campaigns
+    FROM {catalog}.{gold_schema}.{ROLLUP_TABLE} r
+    LEFT JOIN {catalog}.{silver_schema}.campaigns c ON r.campaign_id = c.campaign_id
+    WHERE r.delivery_rows > 0{days}
+    GROUP BY r.delivery_date
+)"""
+
+
+def generate_gold_daily_ops_summary_sql(
+    catalog: str = "hive_metastore",
+    silver_schema: str = "adops_silver",
+    gold_schema: str = "adops_gold",
+    incremental: bool = False
+) -> str:
+    """
+    Daily Operations Summary — one row per day with all key metrics.
+    Perfect for time-series dashboards and trend analysis.
+
+    Reads campaign_delivery_rollup (a declared dependency), not Silver
+    delivery. impressions_7d_ago is the row for delivery_date - 7 (a date
+    join, so a day without delivery can't shift the comparison by a row).
+    incremental=True re-derives only the days whose rollup buckets changed
+    since the last refresh, plus the days 7 later that compare against
+    them — O(campaigns × changed days).
+    """
+    if incremental:
+        rollup = f"{catalog}.{gold_schema}.{ROLLUP_TABLE}"
+        summary = f"{catalog}.{gold_schema}.daily_ops_summary"
+        days = """
+      AND r.delivery_date IN (
+          SELECT delivery_date FROM refresh
+          UNION
+          SELECT date_sub(delivery_date, 7) FROM refresh
+      )"""
+        return f"""
+-- =====================================================================
+-- Gold: Daily Operations Summary (incremental)
+-- Re-derive only the days a Silver batch touched, and their WoW days
+-- =====================================================================
+MERGE INTO {summary} AS t
+USING (
+WITH changed AS (
+    SELECT DISTINCT delivery_date
+    FROM {rollup}
+    WHERE _rollup_updated_at > (SELECT MAX(_gold_refreshed_at) FROM {summary})
+),
+refresh AS (
+    SELECT delivery_date FROM changed
+    UNION
+    SELECT date_add(delivery_date, 7) FROM changed
+),
+{_daily_ops_daily_cte(catalog, silver_schema, gold_schema, days)}
+{_daily_ops_with_wow("WHERE t.delivery_date IN (SELECT delivery_date FROM refresh)")}
+) AS s
+ON t.delivery_date = s.delivery_date
+WHEN MATCHED THEN UPDATE SET *
+WHEN NOT MATCHED THEN INSERT *;
+"""
+    return f"""
+-- =====================================================================
+-- Gold: Daily Operations Summary
+-- One row per day — ideal for trend charts and daily standup reports
+-- =====================================================================
+CREATE OR REPLACE TABLE {catalog}.{gold_schema}.daily_ops_summary AS
+
+WITH {_daily_ops_daily_cte(catalog, silver_schema, gold_schema)}
+{_daily_ops_with_wow("ORDER BY t.delivery_date")};
 """
 
 
@@ -256,6 +715,7 @@ def generate_gold_platform_scorecard_sql(
     """
     Platform Scorecard — compare performance across Meta, CM360, TikTok, etc.
     This is what gets presented in weekly platform review meetings.
+    Reads campaign_delivery_rollup (a declared dependency).
     """
     return f"""
 -- =====================================================================
@@ -293,12 +753,13 @@ FROM {catalog}.{silver_schema}.campaigns c
 LEFT JOIN (
     SELECT 
         campaign_id,
-        SUM(impressions) as total_impressions,
-        SUM(clicks) as total_clicks,
-        SUM(spend_usd) as total_spend,
-        AVG(viewability_rate) as avg_viewability,
-        SUM(vast_errors) as total_vast_errors
-    FROM {catalog}.{silver_schema}.delivery
+        SUM(total_impressions) as total_impressions,
+        SUM(total_clicks) as total_clicks,
+        SUM(total_spend) as total_spend,
+        SUM(viewability_sum) / NULLIF(SUM(viewability_count), 0) as avg_viewability,
+        SUM(total_vast_errors) as total_vast_errors
+    FROM {catalog}.{gold_schema}.{ROLLUP_TABLE}
+    WHERE delivery_rows > 0
     GROUP BY campaign_id
 ) d ON c.campaign_id = d.campaign_id
 GROUP BY c.platform, c.region
@@ -364,3 +825,45 @@ WHERE assignee IS NOT NULL AND assignee != ''
 GROUP BY assignee, assignee_role
 ORDER BY breached_tickets DESC, urgent_tickets DESC;
 """
+
+
+# ─── Full Gold refresh ──────────────────────────────────────────────────────
+# Shared intermediates, built once per refresh before any table needing them
+GOLD_INTERMEDIATES = {
+    ROLLUP_TABLE: generate_gold_rollup_sql,
+}
+
+# Gold table → (builder, intermediates it reads)
+GOLD_TABLES = {
+    "campaign_performance": (generate_gold_campaign_performance_sql, (ROLLUP_TABLE,)),
+    "daily_ops_summary": (generate_gold_daily_ops_summary_sql, (ROLLUP_TABLE,)),
+    "platform_scorecard": (generate_gold_platform_scorecard_sql, (ROLLUP_TABLE,)),
+    "ops_efficiency": (generate_gold_ops_efficiency_sql, ()),
+}
+
+
+def generate_gold_refresh_sql(
+    tables=None,
+    catalog: str = "hive_metastore",
+    silver_schema: str = "adops_silver",
+    gold_schema: str = "adops_gold"
+) -> str:
+    """
+    Full rebuild of the given Gold tables (default: all), each declared
+    intermediate built once up front. Only campaign_delivery_rollup reads
+    Silver delivery, so a refresh scans the fact table once, however many
+    tables read it.
+    """
+    tables = list(tables or GOLD_TABLES)
+    unknown = [t for t in tables if t not in GOLD_TABLES]
+    if unknown:
+        raise ValueError(f"No Gold build for table(s): {', '.join(unknown)}")
+
+    needed = []
+    for table in tables:
+        needed.extend(dep for dep in GOLD_TABLES[table][1] if dep not in needed)
+
+    steps = [f"""-- Shared intermediate: {name}
+{GOLD_INTERMEDIATES[name](catalog, silver_schema, gold_schema)}""" for name in needed]
+    steps += [GOLD_TABLES[table][0](catalog, silver_schema, gold_schema) for table in tables]
+    return "\n".join(steps)
@@ -0,0 +1,121 @@
+"""
+Ingestion Ledger — durable history of every Bronze load
+=========================================================
+PURPOSE:
+  IngestionRecord used to be thrown away after each run. The ledger keeps
+  every record in a local SQLite file, one row per table (or file) per
+  run, with bytes read, wall time and rows/sec. You can then answer:
+
+  - "Did delivery ingestion get slower in the last release?"
+  - "Which tables failed in last night's run, and why?"
+  - "How many rows did batch bronze_20260301_090000 load?"
+
+WHY SQLITE:
+  It's in the standard library, it survives crashes (each run is one
+  transaction), and it can be queried with plain SQL or pandas:
+
+      sqlite3 data/bronze/_ledger.sqlite \\
+        "SELECT release, AVG(rows_per_sec) FROM ingestion_ledger
+         WHERE table_name = 'delivery' GROUP BY release"
+"""
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from src.pipelines.bronze_ingestion import IngestionRecord
+
+LEDGER_COLUMNS = [
+    ("run_id", "TEXT NOT NULL"),
+    ("release", "TEXT"),
+    ("table_name", "TEXT NOT NULL"),
+    ("source_file", "TEXT"),
+    ("status", "TEXT NOT NULL"),
+    ("error", "TEXT"),
+    ("row_count", "INTEGER"),
+    ("bytes_read", "INTEGER"),
+    ("elapsed_sec", "REAL"),
+    ("rows_per_sec", "REAL"),
+    ("ingested_at", "TEXT"),
+    ("recorded_at", "TEXT"),
+]
+
+
+class IngestionLedger:
+    """
+    Append-only SQLite ledger of IngestionRecords.
+
+        ledger = IngestionLedger("data/bronze/_ledger.sqlite")
+        ledger.record(run_id, records, release="v1.4.0")
+        ledger.throughput("delivery")   # rows/sec per release
+    """
+
+    def __init__(self, path: str = "data/bronze/_ledger.sqlite"):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        columns_sql = ", ".join(f"{name} {col_type}" for name, col_type in LEDGER_COLUMNS)
+        with self._connect() as conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS ingestion_ledger ({columns_sql})")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_ledger_table "
+                         "ON ingestion_ledger (table_name, release)")
+
+    @contextmanager
+    def _connect(self):
+        """One transaction: committed on success, rolled back on error, always closed."""
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record(self, run_id: str, records: Iterable[IngestionRecord], release: str = ""):
+        """Write all records of one run in a single transaction."""
+        recorded_at = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (run_id, release, r.table_name, r.source_file, r.status, r.error, r.row_count,
+             r.bytes_read, r.elapsed_sec, r.rows_per_sec, r.ingested_at, recorded_at)
+            for r in records
+        ]
+        placeholders = ", ".join("?" * len(LEDGER_COLUMNS))
+        with self._connect() as conn:
+            conn.executemany(f"INSERT INTO ingestion_ledger VALUES ({placeholders})", rows)
+
+    def query(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        """Run any SELECT against the ledger (table: ingestion_ledger)."""
+        with self._connect() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def runs(self, run_id: Optional[str] = None) -> pd.DataFrame:
+        """All ledger rows (or one run's), oldest first."""
+        if run_id is None:
+            return self.query("SELECT * FROM ingestion_ledger ORDER BY rowid")
+        return self.query("SELECT * FROM ingestion_ledger WHERE run_id = ? ORDER BY rowid",
+                          (run_id,))
+
+    def throughput(self, table_name: Optional[str] = None) -> pd.DataFrame:
+        """
+        Successful-load throughput per release and table — the regression view.
+        Compare a release's avg_rows_per_sec with the one before it.
+        """
+        where = "status = 'success'" + (" AND table_name = ?" if table_name else "")
+        return self.query(
+            f"""
+            SELECT release, table_name,
+                   COUNT(DISTINCT run_id)                     AS runs,
+                   SUM(row_count)                             AS total_rows,
+                   SUM(bytes_read)                            AS total_bytes,
+                   ROUND(SUM(row_count) / SUM(elapsed_sec), 1) AS avg_rows_per_sec,
+                   ROUND(MAX(elapsed_sec), 3)                 AS max_elapsed_sec,
+                   MIN(recorded_at)                           AS first_seen
+            FROM ingestion_ledger
+            WHERE {where}
+            GROUP BY release, table_name
+            ORDER BY table_name, first_seen
+            """,
+            (table_name,) if table_name else (),
+        )
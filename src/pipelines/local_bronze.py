@@ -0,0 +1,571 @@
+"""
+Local Bronze Ingestion — Disney Ad Ops Lab
+============================================
+PURPOSE:
+  bronze_ingestion.py only *generates* SQL/PySpark for Databricks. This module
+  actually runs Bronze ingestion on a laptop or CI box with pyarrow: read each
+  BRONZE_SCHEMAS source file, stamp lineage columns, write Parquet.
+
+  Same rules as the Databricks path:
+  1. Schema enforcement: every column is read with its declared type — no
+     inference, so a bad value fails the load instead of silently becoming a string
+  2. Metadata stamping: _ingested_at, _source_file, _batch_id on every row
+  3. Partitioning: tables with `partition_by` are written Hive-style
+     (delivery/date=2026-02-01/part-....parquet), same layout as Delta
+
+  Output layout (one directory per table, one file per batch):
+    data/bronze/campaigns/part-campaigns_20260301_090000_000000-0.parquet
+    data/bronze/delivery/date=2026-02-01/part-delivery_20260301_090000_000000-0.parquet
+
+  Sources are STREAMED: pyarrow's block-based CSV reader turns every ~16 MB
+  of CSV into one typed RecordBatch, which goes straight to the Parquet
+  writer. A 500 MB hourly CM360 drop never exists as one in-memory table
+  (let alone a pandas frame), so ingest memory stays at a few blocks.
+
+  ingest_table() / ingest_all() are full-file loads and replace the table;
+  ingest_incremental() is the Auto Loader equivalent: a FileManifest
+  (file_manifest.py) checkpoint makes each run load (and, for delivery,
+  append) only unseen files.
+
+WHY IT EXISTS:
+  A fast offline stand-in for dev loops and CI performance baselines — no
+  cluster spin-up, and the same IngestionRecord lineage as production.
+"""
+
+import csv
+import glob
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+
+from src.pipelines.bronze_ingestion import (
+    ARROW_TYPES, BRONZE_SCHEMAS, REFERENCE_TABLES, IngestionRecord, compile_schema,
+)
+from src.pipelines.dedup_index import DedupIndex
+from src.pipelines.file_index import partition_values, read_pruned
+from src.pipelines.file_manifest import FileManifest
+from src.pipelines.ingestion_ledger import IngestionLedger
+from src.pipelines.sla_tracker import ALERT_COLUMNS, SlaTracker
+
+
+# CSV bytes per streamed RecordBatch — ingest memory is a few of these, not the file size
+STREAM_BLOCK_BYTES = 16 << 20
+
+# ingest_incremental's write mode: dimensions arrive as full snapshots
+# (overwrite), delivery as new landed files (append). A full-file
+# ingest_table / ingest_all load always overwrites, like the batch loads in
+# notebooks/03_medallion_bronze.py — re-running one never duplicates Bronze.
+INCREMENTAL_MODES = {"delivery": "append"}
+
+# Tickets columns the SLA deadline index reads (see _sla_feed)
+SLA_COLUMNS = ["ticket_id", "due_date", *ALERT_COLUMNS]
+
+
+def arrow_schema(table_name: str, with_metadata: bool = True) -> pa.Schema:
+    """Arrow schema for a Bronze table (+ metadata columns), from the compiled schema."""
+    compiled = compile_schema(table_name)
+    return compiled.arrow_schema_with_metadata if with_metadata else compiled.arrow_schema
+
+
+def new_batch_id(table_name: str) -> str:
+    """Batch ID in the notebook format, with microseconds so fast reruns don't collide."""
+    return f"{table_name}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S_%f')}"
+
+
+def _open_input(path: str, memory_map: bool = False):
+    """
+    Input stream for a source file; .gz is decompressed on the fly.
+
+    memory_map=True maps the file instead of doing buffered reads: the CSV
+    parser reads straight from the page cache, with no copy into Python
+    buffers. Best for big uncompressed drops on local disk.
+    """
+    if not memory_map:
+        return pa.input_stream(path)     # compression detected from the extension
+    source = pa.memory_map(path)
+    return pa.CompressedInputStream(source, "gzip") if path.endswith(".gz") else source
+
+
+@lru_cache(maxsize=None)
+def _convert_options(table_name: str, not_in_file: tuple = ()) -> pacsv.ConvertOptions:
+    """
+    Declared-type CSV conversion for a table, built once and reused for every
+    file. Columns in `not_in_file` are filled in afterwards: values from Hive
+    directory names, or NULL for an optional column the file leaves out.
+    """
+    schema = arrow_schema(table_name, with_metadata=False)
+    return pacsv.ConvertOptions(
+        column_types=schema,
+        include_columns=[name for name in schema.names if name not in not_in_file],
+        strings_can_be_null=False,
+    )
+
+
+def _header(path: str) -> list:
+    """Column names on a source file's first line (.gz decompressed)."""
+    head = b""
+    with pa.input_stream(path) as f:
+        while b"\n" not in head:
+            chunk = f.read(1 << 16)
+            if not chunk:
+                break
+            head += chunk
+    return next(csv.reader([head.split(b"\n", 1)[0].decode("utf-8-sig")]), [])
+
+
+def _missing_columns(path: str, table_name: str) -> list:
+    """Required columns the file's header lacks (checked without opening a reader)."""
+    compiled = compile_schema(table_name)
+    skip = {*partition_values(path), *compiled.optional, *_header(path)}
+    return [name for name in compiled.names if name not in skip]
+
+
+def _open_csv(source, path: str, table_name: str, block_size: int) -> pa.RecordBatchReader:
+    """The declared-type reader over an already open `source` (see open_source)."""
+    schema = arrow_schema(table_name, with_metadata=False)
+    from_path = {k: v for k, v in partition_values(path).items() if k in schema.names}
+    optional = [k for k in compile_schema(table_name).optional if k not in from_path]
+    absent = set(optional) - set(_header(path)) if optional else set()
+    reader = pacsv.open_csv(source, read_options=pacsv.ReadOptions(block_size=block_size),
+                            convert_options=_convert_options(table_name, tuple(sorted({*from_path, *absent}))))
+    if not from_path and not absent:
+        return reader
+
+    constants = {k: pa.scalar(v).cast(schema.field(k).type) for k, v in from_path.items()}
+    constants.update({k: pa.scalar(None, schema.field(k).type) for k in absent})
+
+    def with_partition_columns():
+        for batch in reader:
+            yield pa.RecordBatch.from_arrays(
+                [pa.repeat(constants[name], batch.num_rows) if name in constants
+                 else batch.column(name) for name in schema.names],
+                schema=schema,
+            )
+
+    return pa.RecordBatchReader.from_batches(schema, with_partition_columns())
+
+
+def open_source(path: str, table_name: str, block_size: int = STREAM_BLOCK_BYTES,
+                memory_map: bool = False) -> pa.RecordBatchReader:
+    """
+    Open one CSV (or .csv.gz) as a stream of RecordBatches with the declared
+    column types, ~block_size bytes of CSV per batch.
+
+    Columns the schema doesn't declare are dropped. A declared column that
+    appears as a Hive directory in the path (delivery/date=2026-02-01/
+    part-00000.csv.gz, as written by data_generator --stream) is filled from
+    the path; an optional one the file leaves out (`hour` in daily delivery)
+    is NULL. Header problems (a required column missing) fail here; a bad
+    value fails when its block is read.
+    """
+    source = _open_input(path, memory_map)
+    try:
+        return _open_csv(source, path, table_name, block_size)
+    except Exception:
+        source.close()
+        raise
+
+
+def _source_batches(path: str, table_name: str, block_size: int = STREAM_BLOCK_BYTES,
+                    memory_map: bool = False):
+    """
+    open_source() for chaining many files: the file is opened when its first
+    batch is asked for and closed once the last is read (or the consumer
+    stops), so only one file is open at a time.
+    """
+    with _open_input(path, memory_map) as source:
+        yield from _open_csv(source, path, table_name, block_size)
+
+
+def read_source(path: str, table_name: str) -> pa.Table:
+    """Read one whole source file with the declared column types (small files / tests)."""
+    return open_source(path, table_name).read_all()
+
+
+def stamp_metadata(data, source_file: str, batch_id: str, ingested_at: datetime):
+    """Append the three lineage columns every Bronze row carries (Table or RecordBatch)."""
+    n = data.num_rows
+    lineage = [
+        ("_ingested_at", pa.repeat(pa.scalar(ingested_at, ARROW_TYPES["TIMESTAMP"]), n)),
+        ("_source_file", pa.repeat(pa.scalar(source_file), n)),
+        ("_batch_id", pa.repeat(pa.scalar(batch_id), n)),
+    ]
+    for name, values in lineage:
+        data = data.append_column(name, values)
+    return data
+
+
+def _stamped_batches(sources, batch_id: str, ingested_at: datetime, row_counts: dict,
+                     dedup: Optional[DedupIndex] = None):
+    """
+    Chain (source_file, reader) streams into one stream of stamped batches,
+    counting rows per source_file as they flow through. Each reader is closed
+    when it runs out, or when the write stops early. With a DedupIndex,
+    exact re-sends are dropped first (and not counted).
+    """
+    for source_file, reader in sources:
+        row_counts.setdefault(source_file, 0)
+        try:
+            for batch in reader:
+                if dedup is not None:
+                    batch = dedup.filter(batch)
+                row_counts[source_file] += batch.num_rows
+                yield stamp_metadata(batch, source_file, batch_id, ingested_at)
+        finally:
+            reader.close()
+
+
+def write_bronze(data, table_name: str, bronze_dir: str = "data/bronze",
+                 batch_id: str = "batch", mode: str = "append",
+                 schema: Optional[pa.Schema] = None) -> str:
+    """
+    Write a stamped Table, or an iterable of stamped RecordBatches (pass
+    `schema`), to `bronze_dir/table_name` as Parquet, Hive-partitioned on the
+    table's `partition_by` column if it has one. See write_parquet_table.
+    """
+    partition_by = BRONZE_SCHEMAS.get(table_name, {}).get("partition_by")
+    return write_parquet_table(data, os.path.join(bronze_dir, table_name), batch_id, mode,
+                               schema, partition_by)
+
+
+def write_parquet_table(data, table_dir: str, batch_id: str = "batch", mode: str = "append",
+                        schema: Optional[pa.Schema] = None,
+                        partition_by: Optional[str] = None) -> str:
+    """
+    Write a Table or an iterable of RecordBatches (pass `schema`) to a local
+    Parquet table directory, Hive-partitioned on `partition_by`. Batches are
+    written as they arrive, so a streamed source is never fully materialized.
+
+    mode="append" adds this batch's files next to earlier batches;
+    mode="overwrite" writes to a staging directory and swaps it in; the
+    replaced table is set aside until the swap succeeds, and restored if not.
+    Either way a failed write leaves the table as it was: the partial files
+    of this batch_id are removed (what _batch_id is for — rollback).
+    """
+    if mode not in ("append", "overwrite"):
+        raise ValueError(f"Unknown mode: {mode}. Use 'append' or 'overwrite'")
+    target = f"{table_dir}.staging-{batch_id}" if mode == "overwrite" else table_dir
+
+    try:
+        ds.write_dataset(
+            data,
+            target,
+            schema=schema,
+            format="parquet",
+            partitioning=[partition_by] if partition_by else None,
+            partitioning_flavor="hive" if partition_by else None,
+            basename_template=f"part-{batch_id}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+    except BaseException:
+        if mode == "overwrite":
+            shutil.rmtree(target, ignore_errors=True)
+        else:
+            for path in glob.glob(os.path.join(table_dir, "**", f"part-{batch_id}-*.parquet"),
+                                  recursive=True):
+                os.remove(path)
+        raise
+
+    os.makedirs(target, exist_ok=True)     # an empty write still yields an (empty) table
+    if mode == "overwrite":
+        # Two renames (live → aside, staging → live); the old files are
+        # deleted only once the new ones are in place
+        aside = f"{table_dir}.old-{batch_id}"
+        if os.path.exists(table_dir):
+            os.replace(table_dir, aside)
+        try:
+            os.replace(target, table_dir)
+        except BaseException:
+            if os.path.exists(aside):
+                os.replace(aside, table_dir)
+            shutil.rmtree(target, ignore_errors=True)
+            raise
+        shutil.rmtree(aside, ignore_errors=True)
+    return table_dir
+
+
+def _sla_feed(sla_tracker: Optional[SlaTracker], table_name: str, batches, kept: list):
+    """
+    With a tracker and a tickets load, pass the stamped stream through while
+    keeping the columns the SLA deadline index reads — the landed batch is
+    then synced without reading Bronze back.
+    """
+    if sla_tracker is None or table_name != "tickets":
+        yield from batches
+        return
+    for batch in batches:
+        kept.append(batch.select(SLA_COLUMNS))
+        yield batch
+
+
+def _sync_sla(sla_tracker: Optional[SlaTracker], kept: list, mode: str):
+    """Sync the landed tickets batch (a full snapshot when it overwrote the table)."""
+    if sla_tracker is None:
+        return
+    schema = pa.schema([arrow_schema("tickets").field(c) for c in SLA_COLUMNS])
+    sla_tracker.sync(pa.Table.from_batches(kept, schema), snapshot=mode == "overwrite")
+
+
+def ingest_table(table_name: str, source_dir: str = "data", bronze_dir: str = "data/bronze",
+                 batch_id: Optional[str] = None, mode: str = "overwrite",
+                 source_file: Optional[str] = None, block_size: int = STREAM_BLOCK_BYTES,
+                 memory_map: bool = False, sla_tracker: Optional[SlaTracker] = None) -> IngestionRecord:
+    """
+    Stream one BRONZE_SCHEMAS table from `source_dir` into local Bronze Parquet.
+
+    source_file defaults to the schema's `source_file` (e.g. 03_delivery.csv);
+    The load replaces the table (mode="overwrite"), so re-running it is
+    idempotent; pass mode="append" to add one more file to earlier loads
+    (ingest_incremental does that with a manifest, so nothing loads twice).
+    block_size / memory_map tune the streaming reader (see open_source).
+    With an sla_tracker, a successful tickets load is synced into it.
+
+    Never raises for a bad load — like the notebook, failures are recorded on
+    the returned IngestionRecord (status="failed", error=...).
+    """
+    if table_name not in BRONZE_SCHEMAS:
+        raise ValueError(f"Unknown table: {table_name}. Available: {list(BRONZE_SCHEMAS.keys())}")
+
+    source_file = source_file or BRONZE_SCHEMAS[table_name]["source_file"]
+    record = IngestionRecord(source_file=source_file, table_name=table_name)
+    batch_id = batch_id or new_batch_id(table_name)
+    ingested_at = datetime.fromisoformat(record.ingested_at)
+    path = os.path.join(source_dir, source_file)
+
+    started = time.perf_counter()
+    landed = []
+    try:
+        record.bytes_read = os.path.getsize(path)
+        row_counts = {}
+        batches = _source_batches(path, table_name, block_size, memory_map)
+        stamped = _stamped_batches([(source_file, batches)], batch_id, ingested_at, row_counts)
+        write_bronze(_sla_feed(sla_tracker, table_name, stamped, landed),
+                     table_name, bronze_dir, batch_id, mode, schema=arrow_schema(table_name))
+        record.mark_success(row_counts[source_file])
+    except (OSError, pa.ArrowException) as e:
+        record.mark_failed(str(e))
+    record.elapsed_sec = round(time.perf_counter() - started, 4)
+    if record.status == "success" and table_name == "tickets":
+        _sync_sla(sla_tracker, landed, mode)
+    return record
+
+
+def ingest_all(source_dir: str = "data", bronze_dir: str = "data/bronze",
+               batch_id: Optional[str] = None, sla_tracker: Optional[SlaTracker] = None) -> list:
+    """Ingest every BRONZE_SCHEMAS table under one batch ID; one IngestionRecord per table."""
+    batch_id = batch_id or new_batch_id("bronze")
+    return [ingest_table(name, source_dir, bronze_dir, batch_id=batch_id, sla_tracker=sla_tracker)
+            for name in BRONZE_SCHEMAS]
+
+
+def ingest_reference_table(name: str, source_dir: str = "data", bronze_dir: str = "data/bronze",
+                           batch_id: Optional[str] = None) -> IngestionRecord:
+    """
+    Load one REFERENCE_TABLES lookup (snapshot, overwrite). These have no
+    declared schema, so every column lands as STRING — still no inference;
+    Silver decides the types.
+    """
+    if name not in REFERENCE_TABLES:
+        raise ValueError(f"Unknown reference table: {name}. Available: {list(REFERENCE_TABLES.keys())}")
+
+    source_file = REFERENCE_TABLES[name]
+    record = IngestionRecord(source_file=source_file, table_name=name)
+    batch_id = batch_id or new_batch_id(name)
+    path = os.path.join(source_dir, source_file)
+
+    started = time.perf_counter()
+    try:
+        record.bytes_read = os.path.getsize(path)
+        with open(path, newline="") as f:
+            header = next(csv.reader(f), [])
+        convert = pacsv.ConvertOptions(column_types={col: pa.string() for col in header},
+                                       strings_can_be_null=False)
+        table = pacsv.read_csv(path, convert_options=convert)
+        table = stamp_metadata(table, source_file, batch_id,
+                               datetime.fromisoformat(record.ingested_at))
+        write_bronze(table, name, bronze_dir, batch_id, mode="overwrite")
+        record.mark_success(table.num_rows)
+    except (OSError, pa.ArrowException) as e:
+        record.mark_failed(str(e))
+    record.elapsed_sec = round(time.perf_counter() - started, 4)
+    return record
+
+
+def load_all_parallel(source_dir: str = "data", bronze_dir: str = "data/bronze", workers: int = 4,
+                      ledger: Optional[IngestionLedger] = None, release: str = "",
+                      batch_id: Optional[str] = None, sla_tracker: Optional[SlaTracker] = None) -> list:
+    """
+    Ingest every BRONZE_SCHEMAS and REFERENCE_TABLES table concurrently.
+
+    Tables are independent, so they fan out over a thread pool — pyarrow's
+    CSV reader and Parquet writer release the GIL, so threads give real
+    parallelism without pickling tables between processes. The biggest
+    source files are submitted first so the long pole starts immediately.
+
+    Every IngestionRecord (in BRONZE_SCHEMAS then REFERENCE_TABLES order) is
+    written to `ledger` under run_id = batch_id, tagged with `release`.
+    A successful tickets load is synced into `sla_tracker`.
+    """
+    batch_id = batch_id or new_batch_id("bronze")
+    jobs = [(ingest_table, name, BRONZE_SCHEMAS[name]["source_file"], {"sla_tracker": sla_tracker})
+            for name in BRONZE_SCHEMAS]
+    jobs += [(ingest_reference_table, name, file_name, {}) for name, file_name in REFERENCE_TABLES.items()]
+
+    def size(job):
+        path = os.path.join(source_dir, job[2])
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {job[1]: pool.submit(job[0], job[1], source_dir, bronze_dir, batch_id=batch_id, **job[3])
+                   for job in sorted(jobs, key=size, reverse=True)}
+        records = [futures[name].result() for _, name, *_ in jobs]
+
+    if ledger is not None:
+        ledger.record(batch_id, records, release=release)
+    return records
+
+
+def checkpoint_path(table_name: str, bronze_dir: str = "data/bronze") -> str:
+    """Where a table's file manifest lives (the local cloudFiles checkpointLocation)."""
+    return os.path.join(bronze_dir, "_checkpoints", f"{table_name}.jsonl")
+
+
+def dedup_index_path(table_name: str, bronze_dir: str = "data/bronze") -> str:
+    """Where a table's cross-batch dedup index lives (see dedup_index.py)."""
+    return os.path.join(bronze_dir, "_dedup", table_name)
+
+
+def ingest_incremental(table_name: str, source_dir: str = "data", bronze_dir: str = "data/bronze",
+                       pattern: Optional[str] = None, batch_id: Optional[str] = None,
+                       mode: Optional[str] = None, block_size: int = STREAM_BLOCK_BYTES,
+                       memory_map: bool = False, dedup: Optional[DedupIndex] = None,
+                       sla_tracker: Optional[SlaTracker] = None) -> list:
+    """
+    Auto Loader-style ingestion: load only files the table's manifest hasn't seen.
+
+    pattern is a glob relative to `source_dir` (default: the schema's
+    source_file), e.g. "landing/delivery/*.csv" for live-landed micro-batches.
+    All new files are streamed into one write under one batch ID; the
+    manifest is committed after the write, so a failed run is simply retried.
+
+    Returns one IngestionRecord per new file ([] when nothing new landed).
+    A file whose header doesn't match the schema gets a failed record and
+    stays pending. A bad value found mid-stream fails (and rolls back) the
+    whole batch, since its files are written together.
+
+    dedup (e.g. DedupIndex.open(dedup_index_path("delivery", bronze_dir)))
+    drops rows an earlier batch already loaded unchanged; row_count
+    is then the rows actually written. The index is committed with the
+    manifest, and its run stats are left on `dedup.last_stats`.
+
+    sla_tracker: a loaded tickets batch is synced into it (see _sync_sla),
+    so the health check only has to tick().
+    """
+    if table_name not in BRONZE_SCHEMAS:
+        raise ValueError(f"Unknown table: {table_name}. Available: {list(BRONZE_SCHEMAS.keys())}")
+
+    pattern = pattern or BRONZE_SCHEMAS[table_name]["source_file"]
+    paths = sorted(os.path.relpath(p, source_dir)
+                   for p in glob.glob(os.path.join(source_dir, pattern), recursive=True))
+    mode = mode or INCREMENTAL_MODES.get(table_name, "overwrite")
+    manifest = FileManifest(checkpoint_path(table_name, bronze_dir))
+    # A snapshot re-sent under a new name is still the table's new state
+    pending = manifest.new_files(paths, root=source_dir, aliases=mode == "append")
+    if not pending:
+        manifest.commit([], batch_id or "")     # persists any stat refreshes
+        return []
+
+    batch_id = batch_id or new_batch_id(table_name)
+    # Headers are checked up front; each file is only opened when the write reaches it
+    records, sources, loaded = [], [], []
+    for entry in pending:
+        record = IngestionRecord(source_file=entry.path, table_name=table_name,
+                                 bytes_read=entry.size)
+        path = os.path.join(source_dir, entry.path)
+        try:
+            missing = _missing_columns(path, table_name)
+            if missing:
+                raise ValueError(f"{entry.path}: header is missing {', '.join(missing)}")
+            sources.append((entry.path, _source_batches(path, table_name, block_size, memory_map)))
+            loaded.append((entry, record))
+        except (OSError, ValueError, pa.ArrowException) as e:
+            record.mark_failed(str(e))
+        records.append(record)
+    if not sources:
+        return records
+
+    ingested_at = datetime.fromisoformat(loaded[0][1].ingested_at)
+    row_counts, landed = {}, []
+    started = time.perf_counter()
+    try:
+        stamped = _stamped_batches(sources, batch_id, ingested_at, row_counts, dedup)
+        write_bronze(_sla_feed(sla_tracker, table_name, stamped, landed),
+                     table_name, bronze_dir, batch_id, mode, schema=arrow_schema(table_name))
+    except (OSError, pa.ArrowException) as e:
+        if dedup is not None:
+            dedup.rollback()
+        for _, record in loaded:
+            record.mark_failed(str(e))
+        return records
+    elapsed = time.perf_counter() - started
+    total_rows = max(sum(row_counts.values()), 1)
+    for _, record in loaded:
+        record.mark_success(row_counts[record.source_file])
+        # One streamed write covers every file; wall time is shared out by rows
+        record.elapsed_sec = round(elapsed * record.row_count / total_rows, 4)
+    if dedup is not None:
+        dedup.commit()
+    manifest.commit([entry for entry, _ in loaded], batch_id)
+    if table_name == "tickets":
+        _sync_sla(sla_tracker, landed, mode)
+    return records
+
+
+def read_bronze(table_name: str, bronze_dir: str = "data/bronze", **predicates) -> pa.Table:
+    """
+    Read a local Bronze table back (partition column restored with its declared type).
+
+    Predicates (campaign_id="CMP-0042", date=("2026-02-01", "2026-02-07"))
+    go through the min/max file index, so only matching row groups are read.
+    """
+    schema = arrow_schema(table_name)
+    if predicates:
+        return read_pruned(os.path.join(bronze_dir, table_name), schema, **predicates)
+    partition_by = BRONZE_SCHEMAS[table_name]["partition_by"]
+    dataset = ds.dataset(
+        os.path.join(bronze_dir, table_name),
+        format="parquet",
+        schema=schema,
+        partitioning=ds.partitioning(pa.schema([schema.field(partition_by)]), flavor="hive")
+        if partition_by else None,
+    )
+    return dataset.to_table()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load data/*.csv into local Bronze Parquet")
+    parser.add_argument("--source-dir", default="data")
+    parser.add_argument("--bronze-dir", default="data/bronze")
+    parser.add_argument("--workers", type=int, default=4, help="Tables loaded concurrently")
+    parser.add_argument("--release", default=os.environ.get("PIPELINE_RELEASE", ""),
+                        help="Release tag stored in the ledger (for throughput comparisons)")
+    args = parser.parse_args()
+
+    os.makedirs(args.bronze_dir, exist_ok=True)
+    ledger = IngestionLedger(os.path.join(args.bronze_dir, "_ledger.sqlite"))
+    for rec in load_all_parallel(args.source_dir, args.bronze_dir, args.workers,
+                                 ledger=ledger, release=args.release):
+        mark = "✅" if rec.status == "success" else "❌"
+        detail = (f"{rec.row_count:,} rows in {rec.elapsed_sec:.2f}s ({rec.rows_per_sec:,.0f} rows/s)"
+                  if rec.status == "success" else rec.error)
+        print(f"{mark} {rec.table_name}: {detail}")
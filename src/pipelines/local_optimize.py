@@ -0,0 +1,207 @@
+"""
+Local OPTIMIZE / ZORDER — compaction for the local Bronze store
+=================================================================
+PURPOSE:
+  The Bronze notebook runs
+
+      OPTIMIZE adops_bronze.delivery ZORDER BY (campaign_id)
+
+  to fix the "small file problem". Locally, every hourly micro-batch from
+  ingest_incremental() adds one more tiny Parquet file per date partition,
+  and a campaign lookup has to open all of them.
+
+  optimize_table() is the local equivalent. For each partition directory it:
+  1. Reads all of the partition's files
+  2. Sorts rows by the cluster column (campaign_id) — the ZORDER stand-in;
+     with a single key, a plain sort gives the tightest per-row-group ranges
+  3. Rewrites them as a few large files with row groups of a target size
+  4. Removes the small files
+
+  Because rows are sorted, every row group covers a narrow campaign_id
+  range, and its Parquet min/max statistics let a campaign-level read skip
+  almost every row group (see file_index.py).
+
+CONSISTENCY:
+  New files are written under a dot-prefixed temp name (ignored by
+  pyarrow datasets), renamed into place, and only then are the old files
+  deleted. A concurrent reader may briefly see both the old and new files,
+  but never a partial file.
+
+  Before the first rename, a marker (_optimize-<stamp>.json, also ignored by
+  readers) records which files the compaction replaces and adds. A crash
+  between the renames and the deletes would otherwise leave every row twice
+  — and the next OPTIMIZE would compact the duplicates together — so each
+  run first finishes any marker it finds: once all added files are in
+  place the replaced ones are deleted, otherwise the partial output is.
+"""
+
+import glob
+import json
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Row groups this big (in-memory Arrow bytes) — big enough for fast scans,
+# small enough that a campaign filter skips most of each file
+TARGET_ROW_GROUP_BYTES = 32 << 20
+# Stop a compacted file at about this many bytes and start the next one
+TARGET_FILE_BYTES = 256 << 20
+
+COMPACTED_PREFIX = "part-optimize-"
+# In-flight compaction record, one per partition rewrite (see CONSISTENCY)
+MARKER_PREFIX = "_optimize-"
+
+
+@dataclass
+class OptimizeStats:
+    """What one OPTIMIZE run did (like the metrics table Databricks returns)."""
+    partitions_optimized: int = 0
+    files_removed: int = 0
+    files_added: int = 0
+    rows: int = 0
+    bytes_removed: int = 0
+    bytes_added: int = 0
+    elapsed_sec: float = 0.0
+
+
+def _data_files(table_dir: str) -> dict:
+    """Parquet files grouped by partition directory (hidden/temp files ignored)."""
+    files = defaultdict(list)
+    for path in glob.glob(os.path.join(table_dir, "**", "*.parquet"), recursive=True):
+        if not os.path.basename(path).startswith((".", "_")):
+            files[os.path.dirname(path)].append(path)
+    return {part: sorted(paths) for part, paths in sorted(files.items())}
+
+
+def _needs_optimize(paths: list, min_files: int) -> bool:
+    # Any file straight from ingestion (even a lone one) still isn't clustered
+    if not all(os.path.basename(p).startswith(COMPACTED_PREFIX) for p in paths):
+        return True
+    if len(paths) < min_files:
+        return False
+    # A compacted partition over file_bytes is full files plus one shorter
+    # tail; rewriting it would only reproduce the same files
+    rows = [pq.read_metadata(p).num_rows for p in paths]
+    return sum(r < max(rows) for r in rows) > 1
+
+
+def optimize_partition(paths: list, zorder_by: Optional[str] = "campaign_id",
+                       row_group_bytes: int = TARGET_ROW_GROUP_BYTES,
+                       file_bytes: int = TARGET_FILE_BYTES, stamp: str = "") -> tuple:
+    """
+    Compact one partition's files into sorted, right-sized files.
+    Returns (new_paths, rows).
+    """
+    partition_dir = os.path.dirname(paths[0])
+    # Partition values live in the directory name, not in the files
+    table = pa.concat_tables([pq.read_table(p, partitioning=None) for p in paths],
+                             promote_options="default")
+    if zorder_by and zorder_by in table.column_names:
+        table = table.sort_by(zorder_by)
+
+    bytes_per_row = max(table.nbytes / max(table.num_rows, 1), 1)
+    rows_per_group = max(1, int(row_group_bytes / bytes_per_row))
+    rows_per_file = max(rows_per_group, int(file_bytes / bytes_per_row) // rows_per_group * rows_per_group)
+
+    staged = []
+    for i, start in enumerate(range(0, max(table.num_rows, 1), rows_per_file)):
+        name = f"{COMPACTED_PREFIX}{stamp}-{i}.parquet"
+        tmp = os.path.join(partition_dir, f".{name}.tmp")
+        pq.write_table(table.slice(start, rows_per_file), tmp, row_group_size=rows_per_group)
+        staged.append((tmp, os.path.join(partition_dir, name)))
+    new_paths = [final for _, final in staged]
+
+    marker = os.path.join(partition_dir, f"{MARKER_PREFIX}{stamp}.json")
+    with open(f"{marker}.tmp", "w") as f:
+        json.dump({"replaced": [os.path.basename(p) for p in paths if p not in new_paths],
+                   "added": [os.path.basename(p) for p in new_paths]}, f)
+    os.replace(f"{marker}.tmp", marker)
+    for tmp, final in staged:
+        os.replace(tmp, final)
+    for path in paths:
+        if path not in new_paths:
+            os.remove(path)
+    os.remove(marker)
+    return new_paths, table.num_rows
+
+
+def finish_interrupted(table_dir: str) -> int:
+    """
+    Complete compactions a crash cut short, from their markers: delete the
+    replaced files if every added file made it into place, else delete the
+    added ones (the replaced files are all still there). Returns how many.
+    """
+    markers = glob.glob(os.path.join(table_dir, "**", f"{MARKER_PREFIX}*.json"), recursive=True)
+    for marker in markers:
+        partition_dir = os.path.dirname(marker)
+        with open(marker) as f:
+            record = json.load(f)
+        added = [os.path.join(partition_dir, name) for name in record["added"]]
+        if all(os.path.exists(p) for p in added):
+            leftovers = [os.path.join(partition_dir, name) for name in record["replaced"]]
+        else:
+            leftovers = added + [os.path.join(partition_dir, f".{name}.tmp") for name in record["added"]]
+        for path in leftovers:
+            if os.path.exists(path):
+                os.remove(path)
+        os.remove(marker)
+    return len(markers)
+
+
+def optimize_table(table_name: str, bronze_dir: str = "data/bronze",
+                   zorder_by: Optional[str] = "campaign_id", min_files: int = 2,
+                   row_group_bytes: int = TARGET_ROW_GROUP_BYTES,
+                   file_bytes: int = TARGET_FILE_BYTES) -> OptimizeStats:
+    """
+    OPTIMIZE <table> ZORDER BY (<zorder_by>) for a local Parquet table.
+
+    Partitions with files that haven't been clustered yet, or with at least
+    `min_files` compacted files of which more than one is short of full size,
+    are rewritten; already-optimized partitions (including ones compacted
+    into several files) are left alone, so re-running after each hourly load
+    only touches the new data. A compaction an earlier run left half-done is
+    finished first (see finish_interrupted).
+    """
+    table_dir = os.path.join(bronze_dir, table_name)
+    if not os.path.isdir(table_dir):
+        raise ValueError(f"No local table at {table_dir}")
+
+    stats = OptimizeStats()
+    started = time.monotonic()
+    finish_interrupted(table_dir)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
+    for paths in _data_files(table_dir).values():
+        if not _needs_optimize(paths, min_files):
+            continue
+        bytes_before = sum(os.path.getsize(p) for p in paths)
+        new_paths, rows = optimize_partition(paths, zorder_by, row_group_bytes, file_bytes, stamp)
+        stats.partitions_optimized += 1
+        stats.files_removed += len(paths)
+        stats.files_added += len(new_paths)
+        stats.rows += rows
+        stats.bytes_removed += bytes_before
+        stats.bytes_added += sum(os.path.getsize(p) for p in new_paths)
+    stats.elapsed_sec = round(time.monotonic() - started, 3)
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compact a local Bronze table (OPTIMIZE ... ZORDER BY)")
+    parser.add_argument("table", nargs="?", default="delivery")
+    parser.add_argument("--bronze-dir", default="data/bronze")
+    parser.add_argument("--zorder-by", default="campaign_id")
+    parser.add_argument("--min-files", type=int, default=2)
+    args = parser.parse_args()
+
+    result = optimize_table(args.table, args.bronze_dir, args.zorder_by, args.min_files)
+    print(f"OPTIMIZE {args.table}: {result.partitions_optimized} partitions, "
+          f"{result.files_removed} → {result.files_added} files, {result.rows:,} rows "
+          f"in {result.elapsed_sec}s")
@@ -0,0 +1,920 @@
+"""
+Local Silver Executor — Disney Ad Ops Lab
+===========================================
+PURPOSE:
+  silver_transforms.py describes the Silver rules as Databricks SQL. This
+  module runs the SAME rules over the local Bronze Parquet store with
+  vectorized pyarrow compute, so Silver works in dev loops and CI without
+  Spark. tests/test_local_silver.py checks parity against the SQL itself.
+
+HOW DELIVERY IS PROCESSED (generate_silver_delivery_sql semantics):
+  1. Dedup pass: read only (delivery_id, _ingested_at) for the whole table
+     and pick one winner per delivery_id — the latest _ingested_at, i.e.
+     ROW_NUMBER() OVER (PARTITION BY delivery_id ORDER BY _ingested_at DESC) = 1
+  2. Transform pass: stream Bronze in record batches, keep the winners,
+     clamp/recompute/flag every column as whole-array operations, and write
+     each batch straight to Parquet
+
+  Memory is the two key columns plus one batch — not the whole table —
+  and nothing is done row by row in Python.
+
+  Output: data/silver/delivery/delivery_date=2026-02-01/part-....parquet
+
+INCREMENTAL (update_silver_delivery, the hourly path):
+  Same as generate_silver_delivery_merge_sql. Only Bronze rows ingested after
+  the high-water mark in data/silver/_watermarks.json are read — the Bronze
+  file index skips every older row group — and upserted on delivery_id by
+  rewriting just the delivery_date partitions they touch. A re-send can carry
+  a corrected date, so the Silver file index (which covers delivery_id) finds
+  each upserted id's existing row in whatever partition holds it; that old
+  partition is rewritten without the row while the new one gains it.
+
+CAMPAIGN HISTORY (update_silver_campaigns, SCD Type 2):
+  Same as generate_silver_campaign_scd2_sql, with the history split in two:
+
+      data/silver/campaigns_history/current/   one row per campaign (_is_current)
+      data/silver/campaigns_history/expired/   closed versions, append-only
+
+  A run hashes the tracked columns of each new campaign version and compares
+  with `current` only; changed keys get their old row appended to `expired`
+  and a new current row. History is never rewritten, and campaigns_as_of()
+  skips expired files whose _valid_to is before the requested time.
+
+QUARANTINE SPLIT (build_silver_delivery(quarantine_dir=...)):
+  Same as generate_split_sql. The compiled quality checks are evaluated once
+  per row, in pass 1, into a _dq_failed_mask; pass 2 routes each row by its
+  mask — error bits → delivery_quarantine, the rest → Silver — without
+  evaluating any rule again. update_silver_delivery(quarantine_dir=...) routes
+  each new batch the same way before its MERGE and appends to the quarantine
+  table, as generate_silver_delivery_merge_sql(quarantine_schema=...) does.
+"""
+
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from datetime import date, datetime, time as dt_time, timezone
+from decimal import Decimal
+from typing import Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.pipelines.canonical import generator_canonicalizers
+from src.pipelines.file_index import load_index, partition_values, read_pruned, table_files
+from src.pipelines.local_bronze import arrow_schema, new_batch_id, write_parquet_table
+from src.pipelines.silver_transforms import (
+    PLATFORM,
+    SCD2_TRACKED_COLUMNS,
+    compile_quality_checks,
+    error_mask,
+)
+
+# Rows per streamed batch in the transform pass
+SILVER_BATCH_ROWS = 1_000_000
+
+# High-water marks of incrementally maintained Silver tables (the local _silver_watermarks)
+WATERMARK_FILE = "_watermarks.json"
+
+SILVER_DELIVERY_SCHEMA = pa.schema([
+    ("delivery_id", pa.string()),
+    ("campaign_id", pa.string()),
+    ("delivery_date", pa.date32()),
+    ("impressions", pa.int32()),
+    ("clicks", pa.int32()),
+    ("spend_usd", pa.float64()),
+    ("vast_errors", pa.int32()),
+    ("ctr", pa.float64()),
+    ("viewability_rate", pa.float64()),
+    ("cpm", pa.float64()),
+    ("cpc", pa.float64()),
+    ("vast_error_rate", pa.float64()),
+    ("_suspicious_ctr", pa.bool_()),
+    ("_zero_delivery_nonzero_spend", pa.bool_()),
+    ("_ingested_at", pa.timestamp("us", tz="UTC")),
+    ("_source_file", pa.string()),
+    ("_silver_processed_at", pa.timestamp("us", tz="UTC")),
+])
+
+
+_UTC_US = pa.timestamp("us", tz="UTC")
+
+# Bronze delivery + which checks failed + when (generate_split_sql's quarantine table)
+_QUARANTINE_SCHEMA = arrow_schema("delivery").append(pa.field("_dq_failed_mask", pa.int64())) \
+    .append(pa.field("_quarantined_at", _UTC_US))
+
+SILVER_CAMPAIGN_SCHEMA = pa.schema(
+    [(name, pa.string()) for name in (
+        "campaign_id", "title_id", "title_name", "brand", "brand_code", "product",
+        "campaign_name", "campaign_objective", "targeting_geo", "country", "language",
+        "geo_cluster", "region", "channel", "channel_mapped", "platform")]
+    + [
+        ("budget_usd", pa.float64()),
+        ("_budget_flagged", pa.bool_()),
+        ("start_date", pa.date32()),
+        ("end_date", pa.date32()),
+        ("status", pa.string()),
+        ("impressions_goal", pa.int32()),
+        ("flight_priority", pa.int32()),
+        ("audience_tactic", pa.string()),
+        ("audience_strategy", pa.string()),
+        ("audience_detailed", pa.string()),
+        ("flight_duration_days", pa.int32()),
+        ("target_cpm", pa.float64()),
+        ("_ingested_at", _UTC_US),
+        ("_source_file", pa.string()),
+        ("_silver_processed_at", _UTC_US),
+    ]
+)
+
+SILVER_CAMPAIGN_HISTORY_SCHEMA = SILVER_CAMPAIGN_SCHEMA.append(pa.field("_hash_diff", pa.string())) \
+    .append(pa.field("_valid_from", _UTC_US)) \
+    .append(pa.field("_valid_to", _UTC_US)) \
+    .append(pa.field("_is_current", pa.bool_()))
+
+# _valid_to of current rows (SCD2_OPEN_END in the SQL)
+SCD2_OPEN_END = datetime(9999, 12, 31, tzinfo=timezone.utc)
+
+CAMPAIGN_STATUSES = ("Active", "Paused", "Completed", "Cancelled", "Draft")
+
+
+@dataclass
+class SilverStats:
+    """What one Silver build did."""
+    rows_in: int = 0
+    rows_out: int = 0
+    duplicates_removed: int = 0
+    rows_dropped: int = 0       # null delivery_id / campaign_id
+    rows_updated: int = 0       # incremental: existing Silver rows replaced (part of rows_out)
+    rows_quarantined: int = 0   # failed an error-level quality check
+    elapsed_sec: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return round(self.rows_in / self.elapsed_sec, 1) if self.elapsed_sec else 0.0
+
+
+def load_watermark(silver_dir: str, table_name: str) -> Optional[dict]:
+    """{"last_batch_id", "last_ingested_at"} for a table, or None if it has none yet."""
+    path = os.path.join(silver_dir, WATERMARK_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f).get(table_name)
+
+
+def save_watermark(silver_dir: str, table_name: str, batch_id: str, ingested_at: datetime):
+    path = os.path.join(silver_dir, WATERMARK_FILE)
+    marks = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            marks = json.load(f)
+    marks[table_name] = {"last_batch_id": batch_id,
+                         "last_ingested_at": ingested_at.isoformat(timespec="microseconds")}
+    os.makedirs(silver_dir, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(marks, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _new_bronze_rows(table_name: str, bronze_dir: str, silver_dir: str) -> pa.Table:
+    """Bronze rows ingested after `table_name`'s high-water mark (all of them if it has none)."""
+    bronze_table_dir = os.path.join(bronze_dir, table_name)
+    if not os.path.isdir(bronze_table_dir):
+        raise ValueError(f"No local table at {bronze_table_dir}")
+    schema = arrow_schema(table_name)
+    mark = load_watermark(silver_dir, table_name)
+    if not mark:
+        return read_pruned(bronze_table_dir, schema)
+    since = datetime.fromisoformat(mark["last_ingested_at"])
+    new = read_pruned(bronze_table_dir, schema, _ingested_at=(since, None))
+    return new.filter(pc.greater(new["_ingested_at"], pa.scalar(since, schema.field("_ingested_at").type)))
+
+
+def _newest_batch(data) -> tuple:
+    """(_batch_id, _ingested_at) of the most recently ingested row, or (None, None)."""
+    if not data.num_rows:
+        return None, None
+    i = int(np.argmax(pc.cast(data["_ingested_at"], pa.int64()).to_numpy(zero_copy_only=False)))
+    return data["_batch_id"][i].as_py(), data["_ingested_at"][i].as_py()
+
+
+# ─── Quality checks as Arrow compute ────────────────────────────────────────
+
+_TOKEN = re.compile(r"\s*(?:(?P<num>\d+(?:\.\d+)?)|(?P<str>'[^']*')|(?P<op><>|!=|>=|<=|=|>|<|\(|\)|,)"
+                    r"|(?P<word>[A-Za-z_][A-Za-z_0-9]*))")
+_COMPARE = {"=": pc.equal, "<>": pc.not_equal, "!=": pc.not_equal,
+            ">": pc.greater, ">=": pc.greater_equal, "<": pc.less, "<=": pc.less_equal}
+
+
+@dataclass(frozen=True)
+class CompiledPredicate:
+    """A quality rule compiled to Arrow compute: evaluate(table) → BooleanArray (SQL NULLs)."""
+    sql: str
+    evaluate: object
+    columns: tuple
+
+
+@lru_cache(maxsize=None)
+def compile_predicate(sql: str) -> CompiledPredicate:
+    """
+    Compile the SQL subset the quality rules use — comparisons, IN (...),
+    IS [NOT] NULL, AND / OR / NOT, parentheses — into Arrow compute calls.
+    """
+    tokens, pos = [], 0
+    while pos < len(sql.rstrip()):
+        m = _TOKEN.match(sql, pos)
+        if not m:
+            raise ValueError(f"Can't compile rule at {sql[pos:]!r}: {sql}")
+        kind = m.lastgroup
+        value = m.group(kind)
+        tokens.append((kind, value.upper() if kind == "word" and value.upper() in
+                       ("AND", "OR", "NOT", "IN", "IS", "NULL") else value))
+        pos = m.end()
+    tokens.append(("end", None))
+    columns = []
+    at = [0]
+
+    def peek():
+        return tokens[at[0]][1]
+
+    def take(expected=None):
+        kind, value = tokens[at[0]]
+        if expected is not None and value != expected:
+            raise ValueError(f"Expected {expected!r}, got {value!r}: {sql}")
+        at[0] += 1
+        return kind, value
+
+    def operand():
+        kind, value = take()
+        if value == "(":
+            inner = disjunction()
+            take(")")
+            return inner
+        if kind == "num":
+            number = float(value) if "." in value else int(value)
+            return lambda t: number
+        if kind == "str":
+            return lambda t, v=value[1:-1]: v
+        if kind == "word":
+            columns.append(value)
+            return lambda t, name=value: t[name]
+        raise ValueError(f"Unexpected {value!r}: {sql}")
+
+    def comparison():
+        left = operand()
+        if peek() == "IS":
+            take()
+            negate = peek() == "NOT"
+            if negate:
+                take()
+            take("NULL")
+            return (lambda t: pc.is_valid(left(t))) if negate else (lambda t: pc.is_null(left(t)))
+        negate = peek() == "NOT"
+        if negate or peek() == "IN":
+            if negate:
+                take()
+            take("IN")
+            take("(")
+            literals = [operand()(None)]
+            while peek() == ",":
+                take()
+                literals.append(operand()(None))
+            take(")")
+
+            def is_in(t):
+                values = left(t)
+                hit = pc.is_in(values, value_set=pa.array(literals).cast(values.type))
+                # NULL IN (...) is NULL, not false
+                hit = pc.if_else(pc.is_null(values), pa.scalar(None, pa.bool_()), hit)
+                return pc.invert(hit) if negate else hit
+            return is_in
+        if peek() in _COMPARE:
+            compare = _COMPARE[take()[1]]
+            right = operand()
+            return lambda t: compare(left(t), right(t))
+        return left
+
+    def negation():
+        if peek() == "NOT":
+            take()
+            inner = negation()
+            return lambda t: pc.invert(inner(t))
+        return comparison()
+
+    def conjunction():
+        left = negation()
+        while peek() == "AND":
+            take()
+            left = (lambda a, b: lambda t: pc.and_kleene(a(t), b(t)))(left, negation())
+        return left
+
+    def disjunction():
+        left = conjunction()
+        while peek() == "OR":
+            take()
+            left = (lambda a, b: lambda t: pc.or_kleene(a(t), b(t)))(left, conjunction())
+        return left
+
+    evaluate = disjunction()
+    # Anything left over (BETWEEN, a function call, ...) is outside the subset
+    if tokens[at[0]][0] != "end":
+        raise ValueError(f"unsupported rule: {sql}")
+    return CompiledPredicate(sql, evaluate, tuple(dict.fromkeys(columns)))
+
+
+def quality_columns(table_name: str) -> list:
+    """Columns the quality checks of a table read."""
+    return list(dict.fromkeys(c for check in compile_quality_checks(table_name)
+                              for c in compile_predicate(check.rule).columns))
+
+
+def failed_mask(data, table_name: str) -> np.ndarray:
+    """_dq_failed_mask for every row: each compiled check evaluated once, as whole-array ops."""
+    mask = np.zeros(data.num_rows, dtype=np.int64)
+    for check in compile_quality_checks(table_name):
+        result = compile_predicate(check.rule).evaluate(data)
+        # Fails when NOT (rule) is true; NULL doesn't fail (as in the SQL)
+        failed = pc.fill_null(pc.invert(result), False).to_numpy(zero_copy_only=False)
+        mask |= np.where(failed, check.mask, 0)
+    return mask
+
+
+def iter_table_batches(table_dir: str, schema: pa.Schema, columns: Optional[list] = None,
+                       batch_rows: int = SILVER_BATCH_ROWS):
+    """
+    Stream a local Hive-partitioned table as RecordBatches in file order,
+    with partition columns restored from directory names (typed by `schema`).
+    """
+    columns = columns or schema.names
+    # Sorted file order — the dedup and transform passes must see rows in the same order
+    for path in table_files(table_dir):
+        partitions = partition_values(os.path.relpath(path, table_dir))
+        file = pq.ParquetFile(path)
+        in_file = [c for c in columns if c in file.schema_arrow.names]
+        for batch in file.iter_batches(batch_size=batch_rows, columns=in_file):
+            arrays = []
+            for name in columns:
+                if name in in_file:
+                    arrays.append(batch.column(name))
+                else:
+                    value = pa.scalar(partitions.get(name)).cast(schema.field(name).type)
+                    arrays.append(pa.repeat(value, batch.num_rows))
+            yield pa.RecordBatch.from_arrays(arrays, schema=pa.schema([schema.field(c) for c in columns]))
+
+
+def latest_per_key(keys: pa.ChunkedArray, order: pa.ChunkedArray) -> np.ndarray:
+    """
+    Boolean mask keeping one row per key: the one with the greatest `order`
+    (ties → first in file order). Vectorized ROW_NUMBER() ... = 1.
+    """
+    keys = keys.combine_chunks() if isinstance(keys, pa.ChunkedArray) else keys
+    codes = pc.dictionary_encode(keys).indices.to_numpy(zero_copy_only=False)
+    if keys.null_count:
+        codes = np.where(keys.is_null().to_numpy(zero_copy_only=False), -1, codes)
+    ts = pc.cast(order, pa.int64()).to_numpy()
+    position = np.arange(len(codes))
+    # Sort by key, then newest first, then file order; first row of each key wins
+    ranked = np.lexsort((position, -ts, codes))
+    first = np.ones(len(ranked), dtype=bool)
+    first[1:] = codes[ranked][1:] != codes[ranked][:-1]
+    keep = np.zeros(len(codes), dtype=bool)
+    keep[ranked[first]] = True
+    return keep
+
+
+def _round(values, digits):
+    # Spark ROUND is HALF_UP (away from zero), not banker's rounding
+    return pc.round(values, ndigits=digits, round_mode="half_towards_infinity")
+
+
+def transform_delivery(batch, processed_at: datetime) -> pa.Table:
+    """
+    The cleaned/derived columns of generate_silver_delivery_sql for already
+    deduplicated Bronze rows (Table or RecordBatch). As in the SQL, derived
+    metrics use the raw source values; only the output columns are clamped.
+    """
+    table = pa.Table.from_batches([batch]) if isinstance(batch, pa.RecordBatch) else batch
+    keep = pc.and_(pc.is_valid(table["delivery_id"]), pc.is_valid(table["campaign_id"]))
+    table = table.filter(keep)
+    n = table.num_rows
+
+    impressions, clicks = table["impressions"], table["clicks"]
+    spend, vast = table["spend_usd"], table["vast_errors"]
+    view = table["viewability_rate"]
+    imp_f = pc.cast(impressions, pa.float64())
+    clicks_f = pc.cast(clicks, pa.float64())
+    vast_f = pc.cast(vast, pa.float64())
+    null_f64 = pa.scalar(None, pa.float64())
+
+    # Null-safe conditions: a NULL comparison is "not true", like CASE WHEN
+    def when(cond):
+        return pc.fill_null(cond, False)
+
+    has_imps = when(pc.greater(impressions, 0))
+    has_clicks = when(pc.greater(clicks, 0))
+    imp_plus_vast = pc.add(imp_f, vast_f)
+
+    columns = {
+        "delivery_id": table["delivery_id"],
+        "campaign_id": table["campaign_id"],
+        "delivery_date": table["date"],
+        # GREATEST(x, 0) skips NULLs in Spark → NULL becomes 0
+        "impressions": pc.max_element_wise(impressions, pa.scalar(0, pa.int32())),
+        "clicks": pc.max_element_wise(clicks, pa.scalar(0, pa.int32())),
+        "spend_usd": pc.max_element_wise(spend, pa.scalar(0.0)),
+        "vast_errors": pc.max_element_wise(vast, pa.scalar(0, pa.int32())),
+        "ctr": pc.if_else(has_imps, _round(pc.divide(clicks_f, imp_f), 6), 0.0),
+        "viewability_rate": pc.if_else(
+            when(pc.and_(pc.greater_equal(view, 0.0), pc.less_equal(view, 1.0))), view,
+            pc.if_else(when(pc.greater(view, 1.0)), 1.0, 0.0)),
+        "cpm": pc.if_else(has_imps, _round(pc.divide(spend, pc.divide(imp_f, 1000.0)), 4), null_f64),
+        "cpc": pc.if_else(has_clicks, _round(pc.divide(spend, clicks_f), 4), null_f64),
+        "vast_error_rate": pc.if_else(when(pc.greater(imp_plus_vast, 0.0)),
+                                      _round(pc.divide(vast_f, imp_plus_vast), 6), 0.0),
+        "_suspicious_ctr": when(pc.greater(clicks, impressions)),
+        "_zero_delivery_nonzero_spend": when(pc.and_(pc.equal(impressions, 0), pc.greater(spend, 0.0))),
+        "_ingested_at": table["_ingested_at"],
+        "_source_file": table["_source_file"],
+        "_silver_processed_at": pa.repeat(
+            pa.scalar(processed_at, SILVER_DELIVERY_SCHEMA.field("_silver_processed_at").type), n),
+    }
+    return pa.table(columns, schema=SILVER_DELIVERY_SCHEMA)
+
+
+def build_silver_delivery(bronze_dir: str = "data/bronze", silver_dir: str = "data/silver",
+                          batch_rows: int = SILVER_BATCH_ROWS,
+                          processed_at: Optional[datetime] = None,
+                          quarantine_dir: Optional[str] = None) -> SilverStats:
+    """
+    Local CREATE OR REPLACE TABLE adops_silver.delivery: dedup + transform all
+    of Bronze delivery and swap in the new Silver table (date-partitioned).
+
+    With `quarantine_dir`, this is generate_split_sql instead: rows failing
+    an error-level check go to <quarantine_dir>/delivery_quarantine (with
+    their _dq_failed_mask) and are left out of Silver.
+    """
+    stats = SilverStats()
+    started = time.perf_counter()
+    processed_at = processed_at or datetime.now(timezone.utc)
+    bronze_table_dir = os.path.join(bronze_dir, "delivery")
+    bronze_schema = arrow_schema("delivery")
+
+    # Pass 1 — winners per delivery_id from the two key columns only (plus
+    # the checked columns when splitting out quarantine)
+    key_columns = ["delivery_id", "_ingested_at"]
+    if quarantine_dir:
+        key_columns += [c for c in quality_columns("delivery") if c not in key_columns]
+    masks, key_batches = [], []
+    for batch in iter_table_batches(bronze_table_dir, bronze_schema, key_columns, batch_rows):
+        if quarantine_dir:
+            masks.append(failed_mask(batch, "delivery"))
+            batch = batch.select(["delivery_id", "_ingested_at"])
+        key_batches.append(batch)
+    keys = pa.Table.from_batches(key_batches, pa.schema([bronze_schema.field("delivery_id"),
+                                                         bronze_schema.field("_ingested_at")]))
+    stats.rows_in = keys.num_rows
+    mask = np.concatenate(masks) if masks else np.zeros(keys.num_rows, dtype=np.int64)
+    clean = (mask & error_mask("delivery")) == 0
+    keep = np.zeros(keys.num_rows, dtype=bool)
+    clean_rows = np.flatnonzero(clean)
+    keep[clean_rows] = latest_per_key(keys["delivery_id"].take(clean_rows), keys["_ingested_at"].take(clean_rows))
+    stats.rows_quarantined = int((~clean).sum())
+    stats.duplicates_removed = int(clean.sum() - keep.sum())
+    del key_batches, keys
+    quarantined = []
+
+    # Pass 2 — stream, filter to winners, transform, write
+    newest = [None, None]
+
+    def silver_batches():
+        offset = 0
+        for batch in iter_table_batches(bronze_table_dir, bronze_schema, batch_rows=batch_rows):
+            batch_id, ingested_at = _newest_batch(batch)
+            if ingested_at is not None and (newest[1] is None or ingested_at > newest[1]):
+                newest[:] = [batch_id, ingested_at]
+            rows = slice(offset, offset + batch.num_rows)
+            winners = batch.filter(pa.array(keep[rows]))
+            if quarantine_dir and not clean[rows].all():
+                bad = ~clean[rows]
+                quarantined.append(batch.filter(pa.array(bad)).append_column(
+                    "_dq_failed_mask", pa.array(mask[rows][bad], pa.int64())))
+            offset += batch.num_rows
+            out = transform_delivery(winners, processed_at)
+            stats.rows_out += out.num_rows
+            yield from out.to_batches()
+
+    write_parquet_table(silver_batches(), os.path.join(silver_dir, "delivery"),
+                        batch_id=new_batch_id("silver"), mode="overwrite",
+                        schema=SILVER_DELIVERY_SCHEMA, partition_by="delivery_date")
+    if quarantine_dir:
+        # Few rows by nature — gathered during pass 2, written once
+        failed = pa.Table.from_batches(quarantined, _QUARANTINE_SCHEMA.remove(len(_QUARANTINE_SCHEMA) - 1))
+        _write_quarantine(failed, quarantine_dir, processed_at, mode="overwrite")
+    # Everything in Bronze is now in Silver — the next incremental run starts here
+    if newest[1] is not None:
+        save_watermark(silver_dir, "delivery", *newest)
+    stats.rows_dropped = stats.rows_in - stats.rows_quarantined - stats.duplicates_removed - stats.rows_out
+    stats.elapsed_sec = round(time.perf_counter() - started, 3)
+    return stats
+
+
+def _write_quarantine(failed: pa.Table, quarantine_dir: str, processed_at: datetime, mode: str):
+    """Write Bronze rows + their _dq_failed_mask to delivery_quarantine, stamped _quarantined_at."""
+    failed = failed.append_column(
+        "_quarantined_at", pa.repeat(pa.scalar(processed_at, _UTC_US), failed.num_rows))
+    write_parquet_table(failed, os.path.join(quarantine_dir, "delivery_quarantine"),
+                        batch_id=new_batch_id("quarantine"), mode=mode, schema=_QUARANTINE_SCHEMA)
+
+
+def _append_quarantine(rows: pa.Table, mask: np.ndarray, quarantine_dir: str, processed_at: datetime):
+    """The incremental route: append this run's failing Bronze rows to delivery_quarantine."""
+    rows = rows.append_column("_dq_failed_mask", pa.array(mask, pa.int64()))
+    _write_quarantine(rows, quarantine_dir, processed_at, mode="append")
+
+
+def _merged_elsewhere(table_dir: str, upserts: pa.Table) -> tuple:
+    """
+    Existing Silver rows for the upserts' delivery_ids, in ANY partition (a
+    corrected re-send can move a row to another delivery_date). Only the row
+    groups the min/max index says may hold those ids are read.
+
+    Returns (replaced ids, their partitions, stale upsert mask): existing rows
+    no newer than their upsert are replaced (WHEN MATCHED AND
+    s._ingested_at >= t._ingested_at); an upsert older than its existing row
+    is dropped.
+    """
+    ids = upserts["delivery_id"]
+    stale = np.zeros(upserts.num_rows, dtype=bool)
+    if not os.path.isdir(table_dir):
+        return pa.array([], pa.string()), set(), stale
+    pruned = load_index(table_dir).prune(delivery_id=pc.unique(ids).to_pylist())
+    found = []
+    for path, groups in pruned.fragments.items():
+        rows = pq.ParquetFile(os.path.join(table_dir, path)).read_row_groups(
+            groups, columns=["delivery_id", "_ingested_at"])
+        day = partition_values(path)["delivery_date"]
+        found.append(rows.append_column("delivery_date", pa.repeat(pa.scalar(day), rows.num_rows)))
+    if not found:
+        return pa.array([], pa.string()), set(), stale
+    existing = pa.concat_tables(found)
+    existing = existing.filter(pc.is_in(existing["delivery_id"], value_set=ids))
+
+    match = pc.index_in(existing["delivery_id"], value_set=ids)
+    replaced = pc.greater_equal(pc.take(upserts["_ingested_at"], match), existing["_ingested_at"])
+    stale[pc.filter(match, pc.invert(replaced)).to_numpy(zero_copy_only=False).astype(np.int64)] = True
+    replaced = existing.filter(replaced)
+    days = set(pc.unique(replaced["delivery_date"]).to_pylist())
+    return replaced["delivery_id"].combine_chunks(), days, stale
+
+
+def _merge_partition(part_dir: str, upserts: pa.Table, replaced_ids: pa.Array, stamp: str) -> tuple:
+    """
+    MERGE one delivery_date partition: drop its rows whose delivery_id is in
+    replaced_ids, add this partition's upserts. Returns (rows_written, rows_updated).
+    """
+    # Partition values live in the directory name, not in the files
+    upserts = upserts.drop_columns(["delivery_date"])
+    old_paths = table_files(part_dir)
+    parts, updated = [], 0
+    if old_paths:
+        existing = pa.concat_tables([pq.read_table(p, partitioning=None) for p in old_paths],
+                                    promote_options="default").select(upserts.column_names)
+        replaced = pc.is_in(existing["delivery_id"], value_set=replaced_ids)
+        updated = pc.sum(replaced).as_py() or 0
+        parts.append(existing.filter(pc.invert(replaced)))
+    if not upserts.num_rows and not updated:
+        return 0, 0
+    parts.append(upserts)
+
+    os.makedirs(part_dir, exist_ok=True)
+    name = f"part-{stamp}-0.parquet"
+    tmp = os.path.join(part_dir, f".{name}.tmp")
+    pq.write_table(pa.concat_tables(parts), tmp)
+    os.replace(tmp, os.path.join(part_dir, name))
+    for path in old_paths:
+        os.remove(path)
+    return upserts.num_rows, updated
+
+
+def update_silver_delivery(bronze_dir: str = "data/bronze", silver_dir: str = "data/silver",
+                           processed_at: Optional[datetime] = None,
+                           quarantine_dir: Optional[str] = None) -> SilverStats:
+    """
+    Local MERGE INTO adops_silver.delivery: clean only the Bronze batches
+    ingested after the high-water mark and upsert them on delivery_id.
+    With no mark yet this is a full load (through the same MERGE path).
+
+    Like MERGE ... ON delivery_id, a re-send whose delivery_date was corrected
+    replaces the row in its old partition (found through the file index)
+    instead of leaving two rows for one delivery_id.
+
+    With `quarantine_dir`, the new rows are routed like build_silver_delivery's
+    split: those failing an error-level check are appended to
+    <quarantine_dir>/delivery_quarantine and never reach the MERGE.
+    """
+    stats = SilverStats()
+    started = time.perf_counter()
+    processed_at = processed_at or datetime.now(timezone.utc)
+    new = _new_bronze_rows("delivery", bronze_dir, silver_dir)
+    stats.rows_in = new.num_rows
+
+    if new.num_rows:
+        clean = new
+        if quarantine_dir:
+            mask = failed_mask(new, "delivery")
+            bad = (mask & error_mask("delivery")) != 0
+            stats.rows_quarantined = int(bad.sum())
+            if bad.any():
+                _append_quarantine(new.filter(pa.array(bad)), mask[bad], quarantine_dir, processed_at)
+            clean = new.filter(pa.array(~bad))
+        winners = clean.filter(pa.array(latest_per_key(clean["delivery_id"], clean["_ingested_at"])))
+        stats.duplicates_removed = clean.num_rows - winners.num_rows
+        upserts = transform_delivery(winners, processed_at)
+        stats.rows_dropped = winners.num_rows - upserts.num_rows
+
+        stamp = new_batch_id("silver_merge")
+        silver_table_dir = os.path.join(silver_dir, "delivery")
+        replaced_ids, replaced_days, stale = _merged_elsewhere(silver_table_dir, upserts)
+        upserts = upserts.filter(pa.array(~stale))
+        # Partitions with upserts, plus the ones a moved row has to leave
+        days = replaced_days | {d.isoformat() for d in pc.unique(upserts["delivery_date"]).to_pylist()}
+        day_values = pc.cast(upserts["delivery_date"], pa.string())
+        for day in sorted(days):
+            part_dir = os.path.join(silver_table_dir, f"delivery_date={day}")
+            written, updated = _merge_partition(
+                part_dir, upserts.filter(pc.equal(day_values, day)), replaced_ids, stamp)
+            stats.rows_out += written
+            stats.rows_updated += updated
+        save_watermark(silver_dir, "delivery", *_newest_batch(new))
+
+    stats.elapsed_sec = round(time.perf_counter() - started, 3)
+    return stats
+
+
+def transform_campaigns(table: pa.Table, processed_at: datetime) -> pa.Table:
+    """
+    The cleaned/derived columns of generate_silver_campaign_sql for already
+    deduplicated Bronze campaign rows.
+    """
+    table = table.filter(pc.is_valid(table["campaign_id"]))
+    n = table.num_rows
+
+    def trim(name):
+        # Spark TRIM strips spaces only
+        return pc.utf8_trim(table[name], characters=" ")
+
+    status = trim("status")
+    budget, goal = table["budget_usd"], table["impressions_goal"]
+    null_f64 = pa.scalar(None, pa.float64())
+
+    def when(cond):
+        return pc.fill_null(cond, False)
+
+    reference = generator_canonicalizers()
+    columns = {
+        "campaign_id": table["campaign_id"],
+        "title_id": table["title_id"],
+        "title_name": trim("title_name"),
+        "brand": trim("brand"),
+        "brand_code": reference["brand_code"].apply(table["brand_code"]),
+        "product": trim("product"),
+        "campaign_name": trim("campaign_name"),
+        "campaign_objective": trim("campaign_objective"),
+        "targeting_geo": reference["targeting_geo"].apply(table["targeting_geo"]),
+        "country": trim("country"),
+        "language": pc.utf8_upper(trim("language")),
+        "geo_cluster": trim("geo_cluster"),
+        "region": trim("region"),
+        "channel": trim("channel"),
+        "channel_mapped": reference["channel_mapped"].apply(table["channel_mapped"]),
+        "platform": PLATFORM.apply(table["platform"]),
+        "budget_usd": pc.if_else(when(pc.greater(budget, 0.0)), budget, null_f64),
+        "_budget_flagged": when(pc.less_equal(budget, 0.0)),
+        "start_date": table["start_date"],
+        "end_date": table["end_date"],
+        "status": pc.if_else(when(pc.is_in(status, value_set=pa.array(CAMPAIGN_STATUSES))), status, "Unknown"),
+        "impressions_goal": pc.if_else(when(pc.greater(goal, 0)), goal, pa.scalar(None, pa.int32())),
+        "flight_priority": table["flight_priority"],
+        "audience_tactic": trim("audience_tactic"),
+        "audience_strategy": trim("audience_strategy"),
+        "audience_detailed": trim("audience_detailed"),
+        "flight_duration_days": pc.cast(pc.days_between(table["start_date"], table["end_date"]), pa.int32()),
+        "target_cpm": pc.if_else(
+            when(pc.and_(pc.greater(goal, 0), pc.greater(budget, 0.0))),
+            _round(pc.divide(budget, pc.divide(pc.cast(goal, pa.float64()), 1000.0)), 4), null_f64),
+        "_ingested_at": table["_ingested_at"],
+        "_source_file": table["_source_file"],
+        "_silver_processed_at": pa.repeat(pa.scalar(processed_at, _UTC_US), n),
+    }
+    return pa.table(columns, schema=SILVER_CAMPAIGN_SCHEMA)
+
+
+def _sql_string(values) -> pa.ChunkedArray:
+    """
+    CAST(values AS STRING) as Spark does it. Doubles follow Java's
+    Double.toString: shortest digits, always with a fraction ("50000.0"),
+    and d.dddE±n outside [1e-3, 1e7) — Arrow alone would give "50000".
+    """
+    values = pa.chunked_array([values]) if isinstance(values, pa.Array) else values
+    if not pa.types.is_floating(values.type):
+        return pc.cast(values, pa.string())
+    values = pc.cast(values, pa.float64())
+    text = pc.cast(values, pa.string())
+    text = pc.if_else(pc.match_substring(text, "."), text, pc.binary_join_element_wise(text, ".0", ""))
+    magnitude = pc.abs(values)
+    plain = pc.or_(pc.equal(values, 0.0), pc.and_(pc.greater_equal(magnitude, 1e-3), pc.less(magnitude, 1e7)))
+    scientific = np.flatnonzero(~pc.fill_null(plain, True).to_numpy(zero_copy_only=False))
+    if not len(scientific):
+        return text
+    # Rare (huge budgets, NaN): only these rows are formatted one by one
+    text = text.combine_chunks().to_numpy(zero_copy_only=False)
+    floats = values.combine_chunks().to_numpy(zero_copy_only=False)
+    text[scientific] = [_java_scientific(x) for x in floats[scientific]]
+    return pa.chunked_array([pa.array(text, pa.string())])
+
+
+def _java_scientific(x: float) -> str:
+    if np.isnan(x):
+        return "NaN"
+    if np.isinf(x):
+        return "Infinity" if x > 0 else "-Infinity"
+    sign, digits, exponent = Decimal(repr(float(x))).normalize().as_tuple()
+    mantissa = "".join(map(str, digits))
+    return f"{'-' if sign else ''}{mantissa[0]}.{mantissa[1:] or '0'}E{exponent + len(digits) - 1}"
+
+
+# MD5 (RFC 1321): per-step left-rotation amounts and additive constants
+_MD5_SHIFTS = [7, 12, 17, 22] * 4 + [5, 9, 14, 20] * 4 + [4, 11, 16, 23] * 4 + [6, 10, 15, 21] * 4
+_MD5_K = (np.floor(np.abs(np.sin(np.arange(1, 65))) * 2 ** 32).astype(np.uint64) & 0xFFFFFFFF).astype(np.uint32)
+_HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+
+def md5_hex(values) -> pa.Array:
+    """
+    Hex md5 of every (non-NULL) string, like SQL md5(): all rows go through
+    each MD5 step together as numpy uint32 lanes, so nothing is hashed row
+    by row in Python. Rows needing fewer 64-byte blocks keep their state
+    once their last block is done.
+    """
+    values = values.combine_chunks() if isinstance(values, pa.ChunkedArray) else values
+    values = pc.cast(values, pa.string())
+    n = len(values)
+    if not n:
+        return pa.array([], pa.string())
+    buffers = values.buffers()
+    offsets = np.frombuffer(buffers[1], dtype=np.int32)[values.offset:values.offset + n + 1].astype(np.int64)
+    data = np.frombuffer(buffers[2], dtype=np.uint8) if buffers[2] is not None else np.empty(0, np.uint8)
+
+    # Pad each message: 0x80, zeros, then its bit length (little-endian) at the end of its last block
+    lengths = np.diff(offsets)
+    blocks = (lengths + 8) // 64 + 1
+    padded = np.zeros((n, int(blocks.max(initial=1)) * 64), dtype=np.uint8)
+    rows = np.repeat(np.arange(n), lengths)
+    within = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    padded[rows, within] = data[np.repeat(offsets[:-1], lengths) + within]
+    padded[np.arange(n), lengths] = 0x80
+    bit_length = (lengths * 8).astype("<u8").view(np.uint8).reshape(n, 8)
+    padded[np.arange(n)[:, None], (blocks * 64 - 8)[:, None] + np.arange(8)] = bit_length
+    words = padded.view("<u4").reshape(n, -1, 16)
+
+    state = [np.full(n, v, dtype=np.uint32) for v in (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476)]
+    for block in range(words.shape[1]):
+        x = words[:, block]
+        a, b, c, d = state
+        for i in range(64):
+            if i < 16:
+                f, g = (b & c) | (~b & d), i
+            elif i < 32:
+                f, g = (d & b) | (~d & c), (5 * i + 1) % 16
+            elif i < 48:
+                f, g = b ^ c ^ d, (3 * i + 5) % 16
+            else:
+                f, g = c ^ (b | ~d), (7 * i) % 16
+            f = f + a + _MD5_K[i] + x[:, g]
+            shift = _MD5_SHIFTS[i]
+            a, d, c, b = d, c, b, b + ((f << shift) | (f >> (32 - shift)))
+        active = block < blocks
+        state = [np.where(active, old + new, old) for old, new in zip(state, (a, b, c, d))]
+
+    digest = np.stack(state, axis=1).astype("<u4").view(np.uint8)
+    hexed = _HEX_DIGITS[np.stack([digest >> 4, digest & 0x0F], axis=2)].reshape(n, 32)
+    return pa.StringArray.from_buffers(n, pa.py_buffer(np.arange(0, 32 * n + 1, 32, dtype=np.int32)),
+                                       pa.py_buffer(hexed.tobytes()))
+
+
+def hash_diff(table: pa.Table, columns=SCD2_TRACKED_COLUMNS) -> pa.Array:
+    """
+    The SQL's _hash_diff: md5(concat_ws('||', COALESCE(CAST(c AS STRING), '')...)),
+    with the casts formatted like Spark's (see _sql_string).
+    """
+    parts = [pc.fill_null(_sql_string(table[c]), "") for c in columns]
+    return md5_hex(pc.binary_join_element_wise(*parts, "||"))
+
+
+def _read_files(paths: list, schema: pa.Schema) -> pa.Table:
+    if not paths:
+        return schema.empty_table()
+    return pa.concat_tables([pq.read_table(p, partitioning=None) for p in paths]).select(schema.names)
+
+
+def _write_file(directory: str, table: pa.Table, stamp: str) -> tuple:
+    """Write `table` under a hidden temp name; returns (tmp, final) for the caller to rename."""
+    os.makedirs(directory, exist_ok=True)
+    name = f"part-{stamp}-0.parquet"
+    tmp = os.path.join(directory, f".{name}.tmp")
+    pq.write_table(table, tmp)
+    return tmp, os.path.join(directory, name)
+
+
+def update_silver_campaigns(bronze_dir: str = "data/bronze", silver_dir: str = "data/silver",
+                            processed_at: Optional[datetime] = None) -> SilverStats:
+    """
+    Local SCD2 MERGE into campaigns_history: only campaigns whose tracked
+    columns changed since their current version are expired and re-opened.
+    rows_out = versions opened (new + changed keys), rows_updated = versions expired.
+    """
+    stats = SilverStats()
+    started = time.perf_counter()
+    processed_at = processed_at or datetime.now(timezone.utc)
+    new = _new_bronze_rows("campaigns", bronze_dir, silver_dir)
+    stats.rows_in = new.num_rows
+    if not new.num_rows:
+        stats.elapsed_sec = round(time.perf_counter() - started, 3)
+        return stats
+
+    latest = new.filter(pa.array(latest_per_key(new["campaign_id"], new["_ingested_at"])))
+    stats.duplicates_removed = new.num_rows - latest.num_rows
+    changes = transform_campaigns(latest, processed_at)
+    stats.rows_dropped = latest.num_rows - changes.num_rows
+    changes = changes.append_column("_hash_diff", hash_diff(changes))
+
+    history_dir = os.path.join(silver_dir, "campaigns_history")
+    current_dir, expired_dir = os.path.join(history_dir, "current"), os.path.join(history_dir, "expired")
+    current_paths = table_files(current_dir)
+    current = _read_files(current_paths, SILVER_CAMPAIGN_HISTORY_SCHEMA)
+
+    match = pc.index_in(changes["campaign_id"], value_set=current["campaign_id"])
+    changed = pc.fill_null(pc.not_equal(pc.take(current["_hash_diff"], match), changes["_hash_diff"]), False)
+    opened = changes.filter(pc.or_(pc.is_null(match), changed))
+    if opened.num_rows:
+        n = opened.num_rows
+        opened = opened.append_column("_valid_from", opened["_ingested_at"]) \
+            .append_column("_valid_to", pa.repeat(pa.scalar(SCD2_OPEN_END, _UTC_US), n)) \
+            .append_column("_is_current", pa.repeat(pa.scalar(True), n))
+
+        expired_at = pc.filter(match, changed)
+        expired = current.take(expired_at)
+        expired = expired.set_column(expired.schema.get_field_index("_valid_to"), "_valid_to",
+                                     pc.filter(changes["_ingested_at"], changed))
+        expired = expired.set_column(expired.schema.get_field_index("_is_current"), "_is_current",
+                                     pa.repeat(pa.scalar(False), expired.num_rows))
+        still_current = np.ones(current.num_rows, dtype=bool)
+        still_current[expired_at.to_numpy(zero_copy_only=False).astype(np.int64)] = False
+
+        stamp = new_batch_id("silver_scd2")
+        # Both files are fully written before either is renamed into place
+        renames = [_write_file(current_dir, pa.concat_tables([current.filter(pa.array(still_current)), opened]),
+                               stamp)]
+        if expired.num_rows:
+            renames.append(_write_file(expired_dir, expired, stamp))
+        for tmp, final in renames:
+            os.replace(tmp, final)
+        for path in current_paths:
+            os.remove(path)
+        stats.rows_out, stats.rows_updated = n, expired.num_rows
+
+    save_watermark(silver_dir, "campaigns", *_newest_batch(new))
+    stats.elapsed_sec = round(time.perf_counter() - started, 3)
+    return stats
+
+
+def campaigns_as_of(as_of, silver_dir: str = "data/silver", **predicates) -> pa.Table:
+    """
+    The version of each campaign in effect at `as_of` (a datetime, or a date =
+    midnight UTC): _valid_from <= as_of < _valid_to. Extra predicates filter
+    further, e.g. campaigns_as_of(date(2026, 1, 10), status="Active").
+    """
+    if not isinstance(as_of, datetime):
+        as_of = datetime.combine(as_of if isinstance(as_of, date) else date.fromisoformat(as_of),
+                                 dt_time(), tzinfo=timezone.utc)
+    elif as_of.tzinfo is None:
+        as_of = as_of.replace(tzinfo=timezone.utc)
+    history = read_pruned(os.path.join(silver_dir, "campaigns_history"), SILVER_CAMPAIGN_HISTORY_SCHEMA,
+                          _valid_from=(None, as_of), _valid_to=(as_of, None), **predicates)
+    return history.filter(pc.greater(history["_valid_to"], pa.scalar(as_of, _UTC_US)))
+
+
+def read_silver(table_name: str, silver_dir: str = "data/silver", **predicates) -> pa.Table:
+    """Read a local Silver table back (predicates prune via the file index)."""
+    schemas = {"delivery": SILVER_DELIVERY_SCHEMA, "campaigns_history": SILVER_CAMPAIGN_HISTORY_SCHEMA}
+    table_dir = os.path.join(silver_dir, table_name)
+    if predicates:
+        return read_pruned(table_dir, schemas[table_name], **predicates)
+    return pa.Table.from_batches(list(iter_table_batches(table_dir, schemas[table_name])),
+                                 schemas[table_name])
@@ -0,0 +1,471 @@
+"""
+Local SQL Backend — Disney Ad Ops Lab
+=======================================
+PURPOSE:
+  silver_transforms.py, gold_aggregations.py and data_quality.py generate
+  Databricks SQL, so until now the only way to run (or time) it was a
+  workspace. DuckDbBackend runs that SQL in-process, with each schema
+  mapped to a local Parquet directory:
+
+      hive_metastore.adops_bronze.delivery   →  data/bronze/delivery/
+      hive_metastore.adops_silver.delivery   →  data/silver/delivery/
+      hive_metastore.adops_gold.<table>      →  data/gold/<table>/
+
+  Existing table directories (local_bronze / local_silver output, or an
+  earlier run) are attached as views over their Parquet files. Every table
+  a run() writes is written back to its directory, so the next stage — or
+  the next process — reads it from disk like any other local table.
+
+  The generated SQL is translated statement by statement (to_duckdb_sql):
+
+      hive_metastore.adops_x.t      →  adops_x.t
+      current_timestamp()           →  CAST(current_timestamp AS TIMESTAMP)   (UTC)
+      current_date()                →  current_date   (or DATE 'today' when pinned)
+      date_sub(d, n) / date_add     →  (CAST(d AS DATE) - n) / + n
+      datediff(end, start)          →  date_diff('day', CAST(start AS DATE), CAST(end AS DATE))
+      unix_timestamp(t)             →  epoch(t)
+      'it\\'s' (Spark escapes)       →  'it''s'
+      CACHE TABLE t AS ...          →  CREATE OR REPLACE TEMP TABLE t AS ...
+      UNCACHE TABLE IF EXISTS t     →  DROP TABLE IF EXISTS t
+      TRY_CAST(x AS T)              →  unchanged (DuckDB has the same null-on-failure cast)
+
+  OPTIMIZE / VACUUM / ANALYZE are Delta maintenance with no meaning here;
+  they are skipped and recorded as such.
+
+TIMINGS:
+  run() returns one StatementTiming per statement (step label, kind,
+  target table, rows, seconds). run_medallion() runs the whole
+  Bronze → Silver → Gold chain and save_timings() writes the timings as
+  JSON, so CI can keep a reproducible performance baseline per commit.
+
+  The backend is pluggable: run_medallion() only needs an object with
+  run(sql, step) and attach(), so another engine can stand in for DuckDB.
+"""
+
+import json
+import os
+import re
+import shutil
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+try:
+    import duckdb
+except ImportError:
+    # Only DuckDbBackend needs it; the SQL translation is plain Python
+    duckdb = None
+
+from src.pipelines import local_bronze as lb
+from src.pipelines.data_quality import generate_full_quality_report_sql, generate_quality_dashboard_view_sql
+from src.pipelines.gold_aggregations import generate_gold_refresh_sql
+from src.pipelines.silver_transforms import (
+    generate_silver_campaign_sql, generate_silver_delivery_sql, generate_silver_tickets_sql,
+)
+
+# Schema → directory under the backend's root
+SCHEMA_DIRS = {
+    "adops_bronze": "bronze",
+    "adops_silver": "silver",
+    "adops_gold": "gold",
+    "adops_quarantine": "quarantine",
+}
+
+# Delta maintenance statements: nothing to do against local Parquet
+SKIPPED_STATEMENTS = ("OPTIMIZE", "VACUUM", "ANALYZE")
+
+# Spark string-literal escapes other than \\' (which becomes '')
+_SPARK_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+
+_REPLACES = re.compile(r"^\s*CREATE\s+OR\s+REPLACE\s", re.IGNORECASE)
+_CREATES_VIEW = re.compile(r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\s", re.IGNORECASE)
+_TARGET = re.compile(
+    r"^\s*(?:CREATE\s+(?:OR\s+REPLACE\s+)?(?:TABLE|VIEW)\s+(?:IF\s+NOT\s+EXISTS\s+)?"
+    r"|MERGE\s+INTO\s+|INSERT\s+(?:INTO|OVERWRITE)\s+(?:TABLE\s+)?|UPDATE\s+|DELETE\s+FROM\s+)"
+    r"([\w.]+)",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class StatementTiming:
+    """One executed (or skipped) statement."""
+    step: str
+    index: int                  # position within the step
+    kind: str                   # CREATE / MERGE / UPDATE / SELECT / ... / INGEST / PERSIST
+    target: Optional[str]       # table written, if any
+    rows: Optional[int]
+    seconds: float
+    skipped: bool = False
+
+
+# ─── Translation ────────────────────────────────────────────────────────────
+
+def split_statements(sql: str) -> list:
+    """
+    Split a SQL script on top-level semicolons, ignoring those inside
+    quotes (with '' or Spark's backslash escapes) and comments.
+    Comment-only pieces are dropped.
+    """
+    statements, current, i, n = [], [], 0, len(sql)
+    while i < n:
+        ch = sql[i]
+        if ch == "'":
+            end = i + 1
+            while end < n and (sql[end] != "'" or sql[end + 1:end + 2] == "'"):
+                end += 2 if sql[end] in "'\\" else 1
+            current.append(sql[i:end + 1])
+            i = end + 1
+        elif sql.startswith("--", i):
+            end = sql.find("\n", i)
+            end = n if end < 0 else end
+            current.append(sql[i:end])
+            i = end
+        elif sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            current.append(sql[i:end])
+            i = end
+        elif ch == ";":
+            statements.append("".join(current))
+            current, i = [], i + 1
+        else:
+            current.append(ch)
+            i += 1
+    statements.append("".join(current))
+    return [s.strip() for s in statements if _strip_comments(s).strip()]
+
+
+def _strip_comments(sql: str) -> str:
+    return re.sub(r"/\*.*?\*/", "", re.sub(r"--[^\n]*", "", sql), flags=re.DOTALL)
+
+
+def _standard_literals(sql: str) -> str:
+    """
+    Rewrite Spark string literals, which escape with backslashes (\\' and
+    \\\\, see canonical._sql_literal), into standard SQL where a quote is ''
+    and a backslash is just a character. Comments are copied unchanged.
+    """
+    out, i, n = [], 0, len(sql)
+    while i < n:
+        if sql[i] == "'":
+            literal, i = ["'"], i + 1
+            while i < n and sql[i] != "'":
+                if sql[i] == "\\" and i + 1 < n:
+                    escaped = sql[i + 1]
+                    literal.append("''" if escaped == "'" else _SPARK_ESCAPES.get(escaped, escaped))
+                    i += 2
+                else:
+                    literal.append(sql[i])
+                    i += 1
+            literal.append("'")
+            out.append("".join(literal))
+            i += 1
+        elif sql.startswith("--", i):
+            end = sql.find("\n", i)
+            end = n if end < 0 else end
+            out.append(sql[i:end])
+            i = end
+        elif sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            out.append(sql[i:end])
+            i = end
+        else:
+            out.append(sql[i])
+            i += 1
+    return "".join(out)
+
+
+def _call_args(sql: str, start: int) -> tuple:
+    """
+    Top-level arguments of the call whose "(" ends just before `start`, and
+    the index after ")". Literals must already be standard ('' escapes).
+    """
+    args, depth, begin, i = [], 0, start, start
+    while i < len(sql):
+        ch = sql[i]
+        if ch == "'":
+            i = sql.index("'", i + 1)
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            if depth == 0:
+                args.append(sql[begin:i].strip())
+                return args, i + 1
+            depth -= 1
+        elif ch == "," and depth == 0:
+            args.append(sql[begin:i].strip())
+            begin = i + 1
+        i += 1
+    raise ValueError(f"Unbalanced parentheses in: {sql[start - 20:start + 60]!r}")
+
+
+def _rewrite_calls(sql: str, name: str, rewrite) -> str:
+    """Replace every name(...) call with rewrite(*args); arguments are translated first."""
+    pattern = re.compile(rf"\b{name}\s*\(", re.IGNORECASE)
+    out, pos = [], 0
+    while True:
+        match = pattern.search(sql, pos)
+        if not match:
+            break
+        if sql.count("'", 0, match.start()) % 2:     # inside a string literal
+            out.append(sql[pos:match.end()])
+            pos = match.end()
+            continue
+        args, end = _call_args(sql, match.end())
+        out.append(sql[pos:match.start()])
+        out.append(rewrite(*[_rewrite_calls(a, name, rewrite) for a in args]))
+        pos = end
+    out.append(sql[pos:])
+    return "".join(out)
+
+
+def to_duckdb_sql(sql: str, catalog: str = "hive_metastore", today: Optional[str] = None) -> str:
+    """
+    Translate one generated Databricks SQL statement (or script) to DuckDB.
+    `today` ("2026-02-28") pins current_date() to a fixed DATE literal.
+    """
+    sql = _standard_literals(sql)
+    sql = re.sub(rf"\b{re.escape(catalog)}\.(?=\w+\.)", "", sql)
+    sql = re.sub(r"\bcurrent_timestamp\(\)", "CAST(current_timestamp AS TIMESTAMP)", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bcurrent_date\(\)", f"DATE '{today}'" if today else "current_date", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bunix_timestamp\(", "epoch(", sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bCACHE\s+(?:LAZY\s+)?TABLE\s+(\w+)\s+AS\b", r"CREATE OR REPLACE TEMP TABLE \1 AS",
+                 sql, flags=re.IGNORECASE)
+    sql = re.sub(r"\bUNCACHE\s+TABLE\s+(?:IF\s+EXISTS\s+)?(\w+)", r"DROP TABLE IF EXISTS \1",
+                 sql, flags=re.IGNORECASE)
+    sql = _rewrite_calls(sql, "date_sub", lambda d, n: f"(CAST({d} AS DATE) - {n})")
+    sql = _rewrite_calls(sql, "date_add", lambda d, n: f"(CAST({d} AS DATE) + {n})")
+    return _rewrite_calls(
+        sql, "datediff",
+        lambda end, start: f"date_diff('day', CAST({start} AS DATE), CAST({end} AS DATE))",
+    )
+
+
+def statement_kind(sql: str) -> tuple:
+    """(kind, target table or None) of one statement."""
+    text = _strip_comments(sql).strip()
+    words = text.split(None, 3)
+    kind = words[0].upper() if words else ""
+    if kind == "WITH":
+        kind = "SELECT"
+    match = _TARGET.match(text)
+    return kind, match.group(1) if match else None
+
+
+# ─── Backend ────────────────────────────────────────────────────────────────
+
+def _arrow(result):
+    """A result as an Arrow table (newer DuckDB returns a reader from .arrow())."""
+    data = result.arrow()
+    return data.read_all() if hasattr(data, "read_all") else data
+
+
+class DuckDbBackend:
+    """
+    Runs generated Databricks SQL in-process against local Parquet.
+
+        backend = DuckDbBackend("data")
+        backend.run(generate_silver_delivery_sql(), step="silver.delivery")
+        backend.query("SELECT COUNT(*) FROM hive_metastore.adops_silver.delivery")
+    """
+
+    def __init__(self, root: str = "data", catalog: str = "hive_metastore",
+                 schema_dirs: Optional[dict] = None, persist: bool = True):
+        if duckdb is None:
+            raise ImportError("duckdb is required for the local SQL backend: pip install duckdb")
+        self.root = root
+        self.catalog = catalog
+        self.schema_dirs = {s: os.path.join(root, d) for s, d in (schema_dirs or SCHEMA_DIRS).items()}
+        self.persist = persist
+        self.timings = []
+        self.con = duckdb.connect()
+        # Databricks stores timestamps in UTC; match it for current_timestamp() and casts
+        self.con.execute("SET TimeZone = 'UTC'")
+        self._views = {}        # "schema.table" → Parquet directory, for attached tables
+        self.last_result = None
+        for schema in self.schema_dirs:
+            self.con.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        self.attach()
+
+    def attach(self) -> list:
+        """
+        (Re)attach every local table directory that holds Parquet files as a
+        view, replacing what was attached before. Tables this backend already
+        holds in memory (written by run()) are kept. Returns the names attached.
+        """
+        in_memory = {f"{s}.{t}" for s, t in self.con.execute(
+            "SELECT schema_name, table_name FROM duckdb_tables()").fetchall()}
+        attached = []
+        for schema, directory in self.schema_dirs.items():
+            if not os.path.isdir(directory):
+                continue
+            for table in sorted(os.listdir(directory)):
+                table_dir = os.path.join(directory, table)
+                if not re.fullmatch(r"\w+", table) or not os.path.isdir(table_dir):
+                    continue
+                pattern = os.path.join(table_dir, "**", "*.parquet")
+                if not any(name.endswith(".parquet") for _, _, files in os.walk(table_dir) for name in files):
+                    continue
+                name = f"{schema}.{table}"
+                if name in in_memory:
+                    continue
+                self.con.execute(
+                    f"CREATE OR REPLACE VIEW {name} AS SELECT * FROM read_parquet("
+                    f"'{pattern}', hive_partitioning = true, union_by_name = true)"
+                )
+                self._views[name] = table_dir
+                attached.append(name)
+        return attached
+
+    def _prepare_target(self, statement: str, target: str):
+        """A statement writing an attached view: materialize it first (or just drop it when replaced)."""
+        if target not in self._views:
+            return
+        if _REPLACES.match(_strip_comments(statement)):
+            self.con.execute(f"DROP VIEW {target}")
+        else:
+            self.con.execute(f"CREATE TABLE {target}__materialized AS SELECT * FROM {target}")
+            self.con.execute(f"DROP VIEW {target}")
+            self.con.execute(f"ALTER TABLE {target}__materialized RENAME TO {target.split('.')[1]}")
+        del self._views[target]
+
+    def _persist(self, target: str) -> str:
+        """
+        Write a table to its schema directory: staged, then swapped in by two
+        renames (live → aside, staging → live). The old files are deleted
+        only once the new ones are in place, so a failure never leaves the
+        table without data.
+        """
+        schema, table = target.split(".")
+        table_dir = os.path.join(self.schema_dirs[schema], table)
+        staging = os.path.join(self.schema_dirs[schema], f".{table}.staging")
+        aside = os.path.join(self.schema_dirs[schema], f".{table}.old")
+        for leftover in (staging, aside):
+            shutil.rmtree(leftover, ignore_errors=True)
+        os.makedirs(staging)
+        self.con.execute(f"COPY (SELECT * FROM {target}) TO "
+                         f"'{os.path.join(staging, 'part-0.parquet')}' (FORMAT parquet)")
+        if os.path.exists(table_dir):
+            os.replace(table_dir, aside)
+        try:
+            os.replace(staging, table_dir)
+        except OSError:
+            if os.path.exists(aside):
+                os.replace(aside, table_dir)
+            raise
+        shutil.rmtree(aside, ignore_errors=True)
+        return table_dir
+
+    def run(self, sql: str, step: str = "sql") -> list:
+        """
+        Translate and execute a SQL script statement by statement. Tables it
+        wrote are then written back to Parquet (persist=True). Returns (and
+        records in self.timings) one StatementTiming per statement.
+        """
+        timings, written = [], []
+        for index, statement in enumerate(split_statements(sql)):
+            kind, target = statement_kind(statement)
+            target = to_duckdb_sql(target, self.catalog) if target else None
+            if kind in SKIPPED_STATEMENTS:
+                timings.append(StatementTiming(step, index, kind, target, None, 0.0, skipped=True))
+                continue
+            if target:
+                self._prepare_target(statement, target)
+            started = time.perf_counter()
+            result = self.con.execute(to_duckdb_sql(_strip_comments(statement), self.catalog))
+            if kind == "SELECT":
+                self.last_result = _arrow(result)
+                rows = self.last_result.num_rows
+            else:
+                row = result.fetchone()
+                rows = row[0] if row else None
+            timings.append(StatementTiming(step, index, kind, target, rows,
+                                           round(time.perf_counter() - started, 4)))
+            persistent = target and target.split(".")[0] in self.schema_dirs
+            if persistent and target not in written and not _CREATES_VIEW.match(_strip_comments(statement)):
+                written.append(target)
+
+        if self.persist:
+            for target in written:
+                started = time.perf_counter()
+                self._persist(target)
+                timings.append(StatementTiming(step, len(timings), "PERSIST", target, None,
+                                               round(time.perf_counter() - started, 4)))
+        self.timings.extend(timings)
+        return timings
+
+    def query(self, sql: str):
+        """Run one (Databricks) SELECT and return it as an Arrow table."""
+        return _arrow(self.con.execute(to_duckdb_sql(sql, self.catalog)))
+
+    def close(self):
+        self.con.close()
+
+
+# ─── The medallion chain ────────────────────────────────────────────────────
+
+def run_medallion(source_dir: str = "data", root: str = "data", backend=None,
+                  batch_id: Optional[str] = None) -> list:
+    """
+    Bronze → Silver → Gold, in-process: stream the source files into local
+    Bronze Parquet (local_bronze), then run the generated Silver, quality
+    and Gold SQL on `backend` (a DuckDbBackend on `root` by default).
+    Returns every StatementTiming, Bronze loads included (kind INGEST).
+
+    Bronze is reloaded with full-file (overwrite) loads, so re-running on the
+    same root scans the same rows every time — a reproducible baseline.
+    """
+    backend = backend or DuckDbBackend(root)
+    bronze_dir = os.path.join(root, SCHEMA_DIRS["adops_bronze"])
+    timings = []
+    for index, record in enumerate(lb.ingest_all(source_dir, bronze_dir, batch_id=batch_id)):
+        if record.status != "success":
+            raise ValueError(f"Bronze load of {record.table_name} failed: {record.error}")
+        timings.append(StatementTiming("bronze", index, "INGEST", f"adops_bronze.{record.table_name}",
+                                       record.row_count, record.elapsed_sec))
+    backend.attach()
+
+    steps = [
+        ("silver.campaigns", generate_silver_campaign_sql()),
+        ("silver.delivery", generate_silver_delivery_sql()),
+        ("silver.tickets", generate_silver_tickets_sql()),
+        *((f"quality.{table}", generate_full_quality_report_sql(table))
+          for table in ("campaigns", "delivery", "tickets")),
+        ("quality.scoreboard", generate_quality_dashboard_view_sql()),
+        ("gold", generate_gold_refresh_sql()),
+    ]
+    for step, sql in steps:
+        timings.extend(backend.run(sql, step))
+    return timings
+
+
+def save_timings(timings: list, path: str, **context) -> dict:
+    """Write timings (plus per-step totals and any context, e.g. release) as JSON."""
+    steps = {}
+    for t in timings:
+        steps[t.step] = round(steps.get(t.step, 0.0) + t.seconds, 4)
+    report = {**context, "total_seconds": round(sum(steps.values()), 4), "steps": steps,
+              "statements": [asdict(t) for t in timings]}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run Bronze → Silver → Gold locally on DuckDB")
+    parser.add_argument("--source-dir", default="data")
+    parser.add_argument("--root", default="data", help="Parquet root (bronze/, silver/, gold/ under it)")
+    parser.add_argument("--timings", default="", help="Write per-statement timings as JSON here")
+    parser.add_argument("--release", default=os.environ.get("PIPELINE_RELEASE", ""))
+    args = parser.parse_args()
+
+    results = run_medallion(args.source_dir, args.root)
+    for t in results:
+        print(f"{t.seconds:>9.4f}s  {t.step:<20} {t.kind:<8} {t.target or '':<45} {t.rows if t.rows is not None else ''}")
+    if args.timings:
+        save_timings(results, args.timings, release=args.release)
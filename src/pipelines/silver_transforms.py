@@ -25,8 +25,13 @@ KEY CONCEPTS:
   4. Surrogate keys: Generate stable row IDs independent of source systems
 """
 
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, List, Optional
 
+from src.pipelines.canonical import Canonicalizer, generator_canonicalizers
+
 
 # ─── Data Quality Rules ─────────────────────────────────────────────────────
 # These rules define what "clean" data looks like.
@@ -161,32 +166,34 @@ PLATFORM_STANDARDIZATION = {
     "SNAP": "Snapchat",
 }
 
+# The compiled form every Silver statement (and local_silver) uses
+PLATFORM = Canonicalizer.compile("platform", PLATFORM_STANDARDIZATION.items())
 
-def generate_silver_campaign_sql(catalog: str = "hive_metastore",
-                                  bronze_schema: str = "adops_bronze",
-                                  silver_schema: str = "adops_silver") -> str:
-    """
-    Generates the Silver campaigns table from Bronze.
-    
-    SCD TYPE 2 EXPLAINED (Slowly Changing Dimensions):
-    When a campaign status changes from "Active" to "Paused", you don't just
-    UPDATE the row. Instead, you:
-    1. Mark the old row as expired (set _valid_to = today)
-    2. Insert a new row with the current status (set _valid_from = today)
-    
-    This gives you a complete history: "Campaign ABC was Active from Jan 1-15,
-    then Paused from Jan 15-20, then Active again from Jan 20 onward."
-    
-    Why? Because when your VP asks "how many campaigns were active on Jan 10th?"
-    you can answer that precisely instead of just knowing the current state.
-    """
-    return f"""
--- =====================================================================
--- Silver Campaigns: Cleaned, deduplicated, with SCD Type 2 history
--- =====================================================================
-CREATE OR REPLACE TABLE {catalog}.{silver_schema}.campaigns AS
 
-WITH deduplicated AS (
+# Control table holding each incremental Silver table's high-water mark
+WATERMARK_TABLE = "_silver_watermarks"
+
+# SCD2: a change in any of these opens a new version of the campaign
+SCD2_TRACKED_COLUMNS = ("status", "budget_usd", "end_date", "impressions_goal")
+# _valid_to of current rows — a real date (not NULL) keeps as-of filters prunable
+SCD2_OPEN_END = "TIMESTAMP '9999-12-31 00:00:00'"
+
+# Output columns of Silver campaigns, in order
+SILVER_CAMPAIGN_COLUMNS = [
+    "campaign_id", "title_id", "title_name", "brand", "brand_code", "product",
+    "campaign_name", "campaign_objective", "targeting_geo", "country", "language",
+    "geo_cluster", "region", "channel", "channel_mapped", "platform",
+    "budget_usd", "_budget_flagged", "start_date", "end_date", "status",
+    "impressions_goal", "flight_priority", "audience_tactic", "audience_strategy",
+    "audience_detailed", "flight_duration_days", "target_cpm",
+    "_ingested_at", "_source_file", "_silver_processed_at",
+]
+
+
+def _silver_campaign_select(source: str) -> str:
+    """The dedup + clean SELECT behind Silver campaigns, over any Bronze-shaped `source`."""
+    reference = generator_canonicalizers()
+    return f"""WITH deduplicated AS (
     -- Step 1: DEDUPLICATE
     -- Bronze might have the same campaign loaded multiple times (re-ingestion)
     -- ROW_NUMBER() keeps only the latest version of each campaign
@@ -195,7 +202,7 @@ WITH deduplicated AS (
             PARTITION BY campaign_id 
             ORDER BY _ingested_at DESC  -- Keep the most recently ingested version
         ) as row_num
-    FROM {catalog}.{bronze_schema}.campaigns
+    FROM {source}
 ),
 cleaned AS (
     -- Step 2: CLEAN & STANDARDIZE
@@ -204,28 +211,23 @@ cleaned AS (
         title_id,
         TRIM(title_name) as title_name,
         TRIM(brand) as brand,
-        UPPER(TRIM(brand_code)) as brand_code,  -- Standardize brand codes to uppercase
+        -- Brand, geo and channel: every alias in the reference tables → its code
+        -- (compiled from REFERENCE_DIMENSIONS, same as the dashboard)
+        {reference["brand_code"].sql_case("brand_code")} as brand_code,
         TRIM(product) as product,
         TRIM(campaign_name) as campaign_name,
         TRIM(campaign_objective) as campaign_objective,
-        UPPER(TRIM(targeting_geo)) as targeting_geo,  -- ISO country codes are uppercase
+        {reference["targeting_geo"].sql_case("targeting_geo")} as targeting_geo,
         TRIM(country) as country,
         UPPER(TRIM(language)) as language,
         TRIM(geo_cluster) as geo_cluster,
         TRIM(region) as region,
         TRIM(channel) as channel,
-        TRIM(channel_mapped) as channel_mapped,
+        {reference["channel_mapped"].sql_case("channel_mapped")} as channel_mapped,
         
         -- Platform standardization: "meta" → "Meta", "dcm" → "CM360"
-        CASE
-            WHEN LOWER(TRIM(platform)) IN ('meta', 'facebook', 'instagram') THEN 'Meta'
-            WHEN LOWER(TRIM(platform)) IN ('tiktok') THEN 'TikTok'
-            WHEN LOWER(TRIM(platform)) IN ('cm360', 'dcm') THEN 'CM360'
-            WHEN LOWER(TRIM(platform)) IN ('dv360') THEN 'DV360'
-            WHEN LOWER(TRIM(platform)) IN ('amazon dsp') THEN 'Amazon DSP'
-            WHEN LOWER(TRIM(platform)) IN ('snap', 'snapchat') THEN 'Snapchat'
-            ELSE TRIM(platform)
-        END as platform,
+        -- (compiled from PLATFORM_STANDARDIZATION, see canonical.py)
+        {PLATFORM.sql_case("platform")} as platform,
         
         -- Budget validation: Negative budgets → NULL with flag
         CASE WHEN budget_usd > 0 THEN budget_usd ELSE NULL END as budget_usd,
@@ -263,34 +265,133 @@ cleaned AS (
     WHERE row_num = 1  -- Only keep the latest version
 )
 SELECT * FROM cleaned
-WHERE campaign_id IS NOT NULL;  -- Final safety: drop rows with no key
-"""
+WHERE campaign_id IS NOT NULL"""
 
 
-def generate_silver_delivery_sql(catalog: str = "hive_metastore",
+def generate_silver_campaign_sql(catalog: str = "hive_metastore",
                                   bronze_schema: str = "adops_bronze",
-                                  silver_schema: str = "adops_silver") -> str:
+                                  silver_schema: str = "adops_silver",
+                                  scd2: bool = False) -> str:
     """
-    Silver delivery: Deduplicated daily delivery facts with computed metrics.
-    
-    This is the table most ad ops analysts query daily. It answers:
-    - "How many impressions did campaign X deliver yesterday?"
-    - "What's our viewability rate across Meta vs CM360?"
-    - "Are we overspending on any platform?"
+    Generates the Silver campaigns table from Bronze: the latest cleaned
+    version of every campaign (what Gold joins against).
+
+    scd2=True generates the history table instead — see
+    generate_silver_campaign_scd2_sql.
     """
+    if scd2:
+        return generate_silver_campaign_scd2_sql(catalog, bronze_schema, silver_schema)
     return f"""
 -- =====================================================================
--- Silver Delivery: Deduplicated facts with derived metrics
+-- Silver Campaigns: Cleaned, deduplicated, latest version per campaign
 -- =====================================================================
-CREATE OR REPLACE TABLE {catalog}.{silver_schema}.delivery AS
+CREATE OR REPLACE TABLE {catalog}.{silver_schema}.campaigns AS
+
+{_silver_campaign_select(f"{catalog}.{bronze_schema}.campaigns")};
+"""
+
+
+def generate_silver_campaign_scd2_sql(catalog: str = "hive_metastore",
+                                       bronze_schema: str = "adops_bronze",
+                                       silver_schema: str = "adops_silver") -> str:
+    """
+    Silver campaigns_history: SCD Type 2, maintained incrementally.
+
+    SCD TYPE 2 EXPLAINED (Slowly Changing Dimensions):
+    When a campaign status changes from "Active" to "Paused", you don't just
+    UPDATE the row. Instead, you:
+    1. Mark the old row as expired (set _valid_to = when the change landed)
+    2. Insert a new row with the current status (set _valid_from = same time)
+
+    This gives you a complete history: "Campaign ABC was Active from Jan 1-15,
+    then Paused from Jan 15-20, then Active again from Jan 20 onward."
 
-WITH deduplicated AS (
+    Why? Because when your VP asks "how many campaigns were active on Jan 10th?"
+    you can answer that precisely instead of just knowing the current state:
+
+        SELECT COUNT(*) FROM adops_silver.campaigns_history
+        WHERE status = 'Active'
+          AND _valid_from <= '2026-01-10' AND _valid_to > '2026-01-10'
+
+    HOW EACH RUN WORKS:
+    1. Stage the Bronze rows past the high-water mark (as in Silver delivery)
+    2. Clean them exactly like the snapshot table and add _hash_diff = md5 of
+       the tracked columns (SCD2_TRACKED_COLUMNS)
+    3. One MERGE: a key whose _hash_diff differs from its current row gets
+       that row expired and a new current row inserted; new keys are
+       inserted; unchanged keys are not touched at all
+    4. Advance the high-water mark
+
+    Current rows carry _valid_to = 9999-12-31 instead of NULL, so the as-of
+    predicate above is a plain range that Delta's min/max data skipping can
+    prune — old history files whose _valid_to is before the date are skipped.
+    """
+    history = f"{catalog}.{silver_schema}.campaigns_history"
+    increment = f"{catalog}.{silver_schema}._campaigns_increment"
+    changes = f"{catalog}.{silver_schema}._campaigns_changes"
+    hash_input = ", ".join(f"COALESCE(CAST({c} AS STRING), '')" for c in SCD2_TRACKED_COLUMNS)
+    columns = ", ".join(SILVER_CAMPAIGN_COLUMNS)
+    values = ", ".join(f"s.{c}" for c in SILVER_CAMPAIGN_COLUMNS)
+    return f"""
+-- =====================================================================
+-- Silver Campaigns History: SCD Type 2 via hash-diff MERGE
+-- =====================================================================
+{_create_watermarks_sql(catalog, silver_schema)}
+
+-- Step 1: STAGE the batches past the high-water mark
+CREATE OR REPLACE TABLE {increment} AS
+{_new_batches_sql(catalog, bronze_schema, silver_schema, "campaigns")};
+
+-- Step 2: CLEAN the latest version of each campaign and hash its tracked columns
+CREATE OR REPLACE TABLE {changes} AS
+SELECT *, md5(concat_ws('||', {hash_input})) as _hash_diff
+FROM (
+{_silver_campaign_select(increment)}
+) latest;
+
+CREATE TABLE IF NOT EXISTS {history} AS
+SELECT *,
+    _ingested_at as _valid_from,
+    {SCD2_OPEN_END} as _valid_to,
+    true as _is_current
+FROM {changes}
+WHERE false;
+
+-- Step 3: EXPIRE changed current rows and INSERT their new versions.
+-- Changed keys appear twice in the source: once with merge_key = campaign_id
+-- (matches and expires the current row) and once with merge_key = NULL
+-- (never matches, so it's inserted as the new current row).
+MERGE INTO {history} AS t
+USING (
+    SELECT campaign_id as merge_key, * FROM {changes}
+    UNION ALL
+    SELECT NULL as merge_key, s.*
+    FROM {changes} s
+    JOIN {history} h
+      ON h.campaign_id = s.campaign_id AND h._is_current AND h._hash_diff <> s._hash_diff
+) AS s
+ON t.campaign_id = s.merge_key AND t._is_current
+WHEN MATCHED AND t._hash_diff <> s._hash_diff THEN UPDATE SET
+    _is_current = false,
+    _valid_to = s._ingested_at
+WHEN NOT MATCHED THEN INSERT
+    ({columns}, _hash_diff, _valid_from, _valid_to, _is_current)
+    VALUES ({values}, s._hash_diff, s._ingested_at, {SCD2_OPEN_END}, true);
+
+-- Step 4: ADVANCE the high-water mark (no-op when nothing was new)
+{_advance_watermark_sql(catalog, silver_schema, "campaigns", increment)}
+"""
+
+
+def _silver_delivery_select(source: str) -> str:
+    """The dedup + clean SELECT behind Silver delivery, over any Bronze-shaped `source`."""
+    return f"""WITH deduplicated AS (
     SELECT *,
         ROW_NUMBER() OVER (
             PARTITION BY delivery_id
             ORDER BY _ingested_at DESC
         ) as row_num
-    FROM {catalog}.{bronze_schema}.delivery
+    FROM {source}
 ),
 cleaned AS (
     SELECT
@@ -347,29 +448,206 @@ cleaned AS (
 )
 SELECT * FROM cleaned
 WHERE delivery_id IS NOT NULL
-  AND campaign_id IS NOT NULL;
+  AND campaign_id IS NOT NULL"""
+
+
+def generate_silver_delivery_sql(catalog: str = "hive_metastore",
+                                  bronze_schema: str = "adops_bronze",
+                                  silver_schema: str = "adops_silver",
+                                  incremental: bool = False,
+                                  quarantine_schema: Optional[str] = None) -> str:
+    """
+    Silver delivery: Deduplicated daily delivery facts with computed metrics.
+    
+    This is the table most ad ops analysts query daily. It answers:
+    - "How many impressions did campaign X deliver yesterday?"
+    - "What's our viewability rate across Meta vs CM360?"
+    - "Are we overspending on any platform?"
+
+    incremental=True generates the hourly version instead of a full rebuild:
+    only Bronze batches ingested after the stored high-water mark are
+    cleaned and upserted with MERGE INTO on delivery_id, so the cost follows
+    the new batch, not the whole Bronze history.
+
+    With quarantine_schema, rows failing an error-level check are routed to
+    {quarantine_schema}.delivery_quarantine instead of Silver — by
+    generate_split_sql for the full build, inside the MERGE when incremental.
+    """
+    if incremental:
+        return generate_silver_delivery_merge_sql(catalog, bronze_schema, silver_schema,
+                                                  quarantine_schema=quarantine_schema)
+    if quarantine_schema:
+        return generate_split_sql("delivery", catalog, bronze_schema, silver_schema, quarantine_schema)
+    return f"""
+-- =====================================================================
+-- Silver Delivery: Deduplicated facts with derived metrics
+-- =====================================================================
+CREATE OR REPLACE TABLE {catalog}.{silver_schema}.delivery AS
+
+{_silver_delivery_select(f"{catalog}.{bronze_schema}.delivery")};
 """
 
 
-def generate_silver_tickets_sql(catalog: str = "hive_metastore",
-                                 bronze_schema: str = "adops_bronze",
-                                 silver_schema: str = "adops_silver") -> str:
+def generate_silver_delivery_merge_sql(catalog: str = "hive_metastore",
+                                        bronze_schema: str = "adops_bronze",
+                                        silver_schema: str = "adops_silver",
+                                        gold_schema: Optional[str] = None,
+                                        quarantine_schema: Optional[str] = None) -> str:
     """
-    Silver tickets: Clean trafficking tickets with SLA computations.
+    Incremental Silver delivery: MERGE only the Bronze batches that are newer
+    than the high-water mark in {silver_schema}.{WATERMARK_TABLE}.
+
+    HOW IT WORKS:
+    1. Stage: copy Bronze rows with _ingested_at past the mark into a small
+       increment table. Everything after this reads the increment, so a
+       batch that lands mid-run simply waits for the next run.
+    2. MERGE: dedup + clean the increment with the same SELECT as the full
+       build and upsert on delivery_id (a re-sent row replaces the old one).
+    3. Advance the mark to the newest batch in the increment.
+
+    Newer is judged by _ingested_at (one value per batch), not by comparing
+    _batch_id strings — batch IDs from different loaders ("bronze_...",
+    "delivery_...") don't sort by time. The mark records both.
+
+    Silver delivery must already exist (run the full build once); with no
+    mark yet, the first MERGE takes all of Bronze.
+
+    With gold_schema, the cleaned increment is staged too and folded into
+    Gold's campaign × date rollup, per-campaign state and trailing windows
+    just before the MERGE (while the rows it replaces are still there), so
+    the hourly Gold refreshes never rescan the history. See gold_aggregations.
+
+    With quarantine_schema, the increment is staged with its _dq_failed_mask
+    (as generate_split_sql checks Bronze): rows with an error bit are appended
+    to {quarantine_schema}.delivery_quarantine and only the rest are merged,
+    so the hourly path routes rows exactly like the split build.
     """
+    increment = f"{catalog}.{silver_schema}._delivery_increment"
+    staged = _new_batches_sql(catalog, bronze_schema, silver_schema, "delivery")
+    source, route = increment, ""
+    if quarantine_schema:
+        errors = error_mask("delivery")
+        quarantine = f"{catalog}.{quarantine_schema}.delivery_quarantine"
+        staged = f"""SELECT
+    *,
+    {failed_mask_sql("delivery")} as _dq_failed_mask
+FROM (
+{staged}
+) new_rows"""
+        source = f"(SELECT * FROM {increment} WHERE (_dq_failed_mask & {errors}) = 0) clean"
+        route = f"""
+-- ROUTE failing rows of the increment to quarantine (the rest are merged below)
+CREATE TABLE IF NOT EXISTS {quarantine} AS
+SELECT *, current_timestamp() as _quarantined_at FROM {increment} WHERE false;
+
+INSERT INTO {quarantine}
+SELECT *, current_timestamp() as _quarantined_at
+FROM {increment}
+WHERE (_dq_failed_mask & {errors}) <> 0;
+"""
+    if gold_schema:
+        from src.pipelines.gold_aggregations import generate_gold_delivery_changes_sql
+
+        upserts = f"{catalog}.{silver_schema}._delivery_upserts"
+        return f"""
+-- =====================================================================
+-- Silver Delivery (incremental): MERGE new Bronze batches only,
+-- keeping Gold's incremental delivery state in step
+-- =====================================================================
+{_create_watermarks_sql(catalog, silver_schema)}
+
+-- Step 1: STAGE the batches past the high-water mark, and their cleaned rows
+CREATE OR REPLACE TABLE {increment} AS
+{staged};
+{route}
+CREATE OR REPLACE TABLE {upserts} AS
+{_silver_delivery_select(source)};
+
+-- Step 2: FOLD the batch into {gold_schema}'s rollup, state and windows (before the MERGE)
+{generate_gold_delivery_changes_sql(upserts, catalog, silver_schema, gold_schema)}
+
+-- Step 3: UPSERT the cleaned increment on delivery_id
+MERGE INTO {catalog}.{silver_schema}.delivery AS t
+USING {upserts} AS s
+ON t.delivery_id = s.delivery_id
+WHEN MATCHED AND s._ingested_at >= t._ingested_at THEN UPDATE SET *
+WHEN NOT MATCHED THEN INSERT *;
+
+-- Step 4: ADVANCE the high-water mark (no-op when nothing was new)
+{_advance_watermark_sql(catalog, silver_schema, "delivery", increment)}
+"""
     return f"""
 -- =====================================================================
--- Silver Tickets: Cleaned with SLA breach calculations
+-- Silver Delivery (incremental): MERGE new Bronze batches only
 -- =====================================================================
-CREATE OR REPLACE TABLE {catalog}.{silver_schema}.tickets AS
+{_create_watermarks_sql(catalog, silver_schema)}
+
+-- Step 1: STAGE the batches past the high-water mark
+CREATE OR REPLACE TABLE {increment} AS
+{staged};
+{route}
+-- Step 2: UPSERT the cleaned increment on delivery_id
+MERGE INTO {catalog}.{silver_schema}.delivery AS t
+USING (
+{_silver_delivery_select(source)}
+) AS s
+ON t.delivery_id = s.delivery_id
+WHEN MATCHED AND s._ingested_at >= t._ingested_at THEN UPDATE SET *
+WHEN NOT MATCHED THEN INSERT *;
+
+-- Step 3: ADVANCE the high-water mark (no-op when nothing was new)
+{_advance_watermark_sql(catalog, silver_schema, "delivery", increment)}
+"""
 
-WITH deduplicated AS (
+
+def _create_watermarks_sql(catalog: str, silver_schema: str) -> str:
+    return f"""CREATE TABLE IF NOT EXISTS {catalog}.{silver_schema}.{WATERMARK_TABLE} (
+    table_name STRING,
+    last_batch_id STRING,
+    last_ingested_at TIMESTAMP,
+    updated_at TIMESTAMP
+);"""
+
+
+def _new_batches_sql(catalog: str, bronze_schema: str, silver_schema: str, table_name: str) -> str:
+    """Bronze rows ingested after `table_name`'s high-water mark."""
+    return f"""SELECT * FROM {catalog}.{bronze_schema}.{table_name}
+WHERE _ingested_at > COALESCE(
+    (SELECT MAX(last_ingested_at) FROM {catalog}.{silver_schema}.{WATERMARK_TABLE}
+     WHERE table_name = '{table_name}'),
+    TIMESTAMP '1970-01-01 00:00:00'
+)"""
+
+
+def _advance_watermark_sql(catalog: str, silver_schema: str, table_name: str, increment: str) -> str:
+    watermarks = f"{catalog}.{silver_schema}.{WATERMARK_TABLE}"
+    return f"""MERGE INTO {watermarks} AS w
+USING (
+    SELECT '{table_name}' as table_name,
+        MAX_BY(_batch_id, _ingested_at) as last_batch_id,
+        MAX(_ingested_at) as last_ingested_at
+    FROM {increment}
+) AS s
+ON w.table_name = s.table_name
+WHEN MATCHED AND s.last_ingested_at IS NOT NULL THEN UPDATE SET
+    last_batch_id = s.last_batch_id,
+    last_ingested_at = s.last_ingested_at,
+    updated_at = current_timestamp()
+WHEN NOT MATCHED AND s.last_ingested_at IS NOT NULL THEN INSERT
+    (table_name, last_batch_id, last_ingested_at, updated_at)
+    VALUES (s.table_name, s.last_batch_id, s.last_ingested_at, current_timestamp());"""
+
+
+def _silver_tickets_select(source: str) -> str:
+    """The dedup + clean SELECT behind Silver tickets, over any Bronze-shaped `source`."""
+    reference = generator_canonicalizers()
+    return f"""WITH deduplicated AS (
     SELECT *,
         ROW_NUMBER() OVER (
             PARTITION BY ticket_id
             ORDER BY _ingested_at DESC
         ) as row_num
-    FROM {catalog}.{bronze_schema}.tickets
+    FROM {source}
 ),
 cleaned AS (
     SELECT
@@ -387,16 +665,12 @@ cleaned AS (
         
         TRIM(stage) as stage,
         
-        -- Standardize platform same as campaigns
-        CASE
-            WHEN LOWER(TRIM(platform)) IN ('meta', 'facebook') THEN 'Meta'
-            WHEN LOWER(TRIM(platform)) IN ('tiktok') THEN 'TikTok'
-            WHEN LOWER(TRIM(platform)) IN ('cm360', 'dcm') THEN 'CM360'
-            ELSE TRIM(platform)
-        END as platform,
+        -- Standardize platform same as campaigns (one compiled ladder)
+        {PLATFORM.sql_case("platform")} as platform,
         
-        UPPER(TRIM(targeting_geo)) as targeting_geo,
-        TRIM(brand) as brand,
+        -- Geo and brand through the reference tables, same as campaigns
+        {reference["targeting_geo"].sql_case("targeting_geo")} as targeting_geo,
+        {reference["brand_code"].sql_case("brand")} as brand,
         TRIM(requested_by) as requested_by,
         created_date,
         
@@ -432,7 +706,153 @@ cleaned AS (
     WHERE row_num = 1
 )
 SELECT * FROM cleaned
-WHERE ticket_id IS NOT NULL;
+WHERE ticket_id IS NOT NULL"""
+
+
+def generate_silver_tickets_sql(catalog: str = "hive_metastore",
+                                 bronze_schema: str = "adops_bronze",
+                                 silver_schema: str = "adops_silver") -> str:
+    """
+    Silver tickets: Clean trafficking tickets with SLA computations.
+    """
+    return f"""
+-- =====================================================================
+-- Silver Tickets: Cleaned with SLA breach calculations
+-- =====================================================================
+CREATE OR REPLACE TABLE {catalog}.{silver_schema}.tickets AS
+
+{_silver_tickets_select(f"{catalog}.{bronze_schema}.tickets")};
+"""
+
+
+def generate_silver_tickets_breach_sql(catalog: str = "hive_metastore",
+                                        silver_schema: str = "adops_silver") -> str:
+    """
+    Keep Silver tickets' breach flags current without a rebuild.
+
+    Only open tickets that are not yet breached and are now past due are
+    rewritten: the tickets that crossed their deadline since the last run.
+    hours_until_due on other rows stays as of the last build, so read-time
+    consumers should derive it from due_date. Locally, sla_tracker.SlaTracker
+    answers the same question from a due-date index.
+    """
+    return f"""
+-- =====================================================================
+-- Silver Tickets: flag tickets that breached since the last run
+-- =====================================================================
+UPDATE {catalog}.{silver_schema}.tickets
+SET
+    is_breached = true,
+    hours_until_due = ROUND((unix_timestamp(due_date) - unix_timestamp(current_timestamp())) / 3600.0, 1),
+    _silver_processed_at = current_timestamp()
+WHERE NOT is_breached
+  AND due_date < current_timestamp()
+  AND stage NOT IN ('Completed', 'Live');
+"""
+
+
+# ─── Compiled Quality Checks ────────────────────────────────────────────────
+# QUALITY_RULES (Silver quarantine) and ADOPS_QUALITY_SUITE (data_quality.py)
+# overlap: "impressions >= 0" is in both under different names. They are
+# compiled into ONE list per table, each distinct check once, with a stable
+# bit: QUALITY_RULES first in order, then suite-only checks. Append new rules
+# at the end so existing bits (and stored masks) keep their meaning.
+#
+# Routing is unchanged by the merge: only QUALITY_RULES error checks
+# quarantine a row (what generate_quarantine_sql always did). Suite-only
+# checks such as *_has_id get a bit for reporting but never route rows.
+#
+# A row's _dq_failed_mask is the sum of the bits of every check it fails, so
+# triage is integer math: WHERE _dq_failed_mask & 4 <> 0 finds one rule's
+# failures, GROUP BY _dq_failed_mask gives the failure combinations.
+
+
+@dataclass(frozen=True)
+class QualityCheck:
+    """One distinct check of a table, with its bit in _dq_failed_mask."""
+    bit: int
+    name: str
+    rule: str
+    severity: str           # as declared by the first source (QUALITY_RULES, else the suite)
+    aliases: tuple = ()     # other names of the same check (ADOPS_QUALITY_SUITE)
+    quarantine: bool = False    # a QUALITY_RULES error check: failing rows are quarantined
+
+    @property
+    def mask(self) -> int:
+        return 1 << self.bit
+
+
+def _rule_key(rule: str) -> str:
+    return re.sub(r"\s*,\s*", ",", " ".join(rule.split()))
+
+
+@lru_cache(maxsize=None)
+def compile_quality_checks(table_name: str) -> tuple:
+    """Every distinct quality check of a table, each with its own bit."""
+    from src.pipelines.data_quality import ADOPS_QUALITY_SUITE
+
+    checks = {}
+    sources = [(r["name"], r["rule"], r["severity"], r["severity"] == "error")
+               for r in QUALITY_RULES.get(table_name, [])]
+    sources += [(e.name, e.check_sql, e.severity.value, False)
+                for e in ADOPS_QUALITY_SUITE if e.table == table_name]
+    for name, rule, severity, quarantine in sources:
+        key = _rule_key(rule)
+        if key in checks:
+            check = checks[key]
+            checks[key] = QualityCheck(check.bit, check.name, check.rule, check.severity,
+                                       check.aliases + (name,), check.quarantine)
+        else:
+            checks[key] = QualityCheck(len(checks), name, rule, severity, quarantine=quarantine)
+    if len(checks) > 63:
+        raise ValueError(f"{table_name}: {len(checks)} checks don't fit a BIGINT mask")
+    return tuple(checks.values())
+
+
+def error_mask(table_name: str) -> int:
+    """Bits of the QUALITY_RULES error checks: a row failing any of them is quarantined."""
+    return sum(c.mask for c in compile_quality_checks(table_name) if c.quarantine)
+
+
+def decode_failed_mask(table_name: str, mask: int) -> list:
+    """Names of the checks set in a _dq_failed_mask value."""
+    return [c.name for c in compile_quality_checks(table_name) if mask & c.mask]
+
+
+def failed_mask_sql(table_name: str, indent: int = 4) -> str:
+    """
+    The _dq_failed_mask expression: every check evaluated once. A check fails
+    when NOT (rule) is true — a NULL result doesn't fail, as in the
+    quarantine WHERE clause.
+    """
+    pad = " " * indent
+    terms = [f"CASE WHEN NOT ({c.rule}) THEN {c.mask} ELSE 0 END" for c in compile_quality_checks(table_name)]
+    if not terms:
+        return "CAST(0 AS BIGINT)"
+    return "CAST(\n" + "".join(f"{pad}    {'+ ' if i else ''}{t}\n" for i, t in enumerate(terms)) + f"{pad}AS BIGINT)"
+
+
+def generate_quality_checks_sql(catalog: str = "hive_metastore",
+                                quarantine_schema: str = "adops_quarantine") -> str:
+    """
+    A lookup table of every compiled check, for joining masks to names:
+
+        SELECT q.*, c.name FROM adops_quarantine.delivery_quarantine q
+        JOIN adops_quarantine._quality_checks c
+          ON c.table_name = 'delivery' AND q._dq_failed_mask & c.mask <> 0
+    """
+    rows = []
+    for table_name in sorted(QUALITY_RULES):
+        for c in compile_quality_checks(table_name):
+            rule = c.rule.replace("'", "\\'")
+            rows.append(f"    ('{table_name}', {c.bit}, CAST({c.mask} AS BIGINT), '{c.name}', "
+                        f"'{c.severity}', {str(c.quarantine).lower()}, '{rule}')")
+    values = ",\n".join(rows)
+    return f"""
+CREATE OR REPLACE TABLE {catalog}.{quarantine_schema}._quality_checks AS
+SELECT * FROM VALUES
+{values}
+AS checks(table_name, bit, mask, name, severity, quarantine, rule);
 """
 
 
@@ -450,29 +870,83 @@ def generate_quarantine_sql(table_name: str, catalog: str = "hive_metastore",
     1. Fix the source system and re-ingest
     2. Apply manual corrections and promote to Silver
     3. Confirm they're truly bad and archive them
+
+    Each row records exactly which checks it failed in _dq_failed_mask (see
+    decode_failed_mask / generate_quality_checks_sql). To quarantine and
+    build Silver from a single Bronze scan, use generate_split_sql.
     """
     if table_name not in QUALITY_RULES:
         return f"-- No quality rules defined for {table_name}"
-    
-    rules = QUALITY_RULES[table_name]
-    error_rules = [r for r in rules if r["severity"] == "error"]
-    
-    conditions = []
-    for rule in error_rules:
-        conditions.append(f"NOT ({rule['rule']})")
-    
-    if not conditions:
+    if not error_mask(table_name):
         return f"-- No error-level rules for {table_name}"
-    
-    where_clause = " OR ".join(conditions)
-    
+
     return f"""
 -- Quarantine: Rows from {table_name} that fail critical quality checks
 CREATE OR REPLACE TABLE {catalog}.{quarantine_schema}.{table_name}_quarantine AS
-SELECT 
+SELECT *, current_timestamp() as _quarantined_at
+FROM (
+    SELECT
+        *,
+        {failed_mask_sql(table_name, indent=8)} as _dq_failed_mask
+    FROM {catalog}.{bronze_schema}.{table_name}
+) checked
+WHERE (_dq_failed_mask & {error_mask(table_name)}) <> 0;
+"""
+
+
+# Silver SELECT builder per table, for the split below
+SILVER_SELECTS = {
+    "campaigns": _silver_campaign_select,
+    "delivery": _silver_delivery_select,
+    "tickets": _silver_tickets_select,
+}
+
+
+def generate_split_sql(table_name: str, catalog: str = "hive_metastore",
+                       bronze_schema: str = "adops_bronze",
+                       silver_schema: str = "adops_silver",
+                       quarantine_schema: str = "adops_quarantine") -> str:
+    """
+    One Bronze scan for both Silver and quarantine (replaces running
+    generate_quarantine_sql AND the Silver build, which each scan Bronze).
+
+    1. CHECK: read Bronze once, evaluating every compiled check once per row
+       into _dq_failed_mask, and CACHE the result
+    2. ROUTE: rows with any error bit → {table_name}_quarantine; the rest →
+       the usual Silver build. Every row lands in exactly one of the two.
+
+    Warn-level bits stay in the cached mask for reporting; they don't route.
+
+    The checked relation is a CACHE TABLE (a cached temp view), not a Delta
+    table: both routing statements read it from the cache, so Bronze is
+    scanned once and nothing extra is written. Step 3 UNCACHEs it.
+    """
+    if table_name not in SILVER_SELECTS:
+        raise ValueError(f"No Silver build for table: {table_name}")
+    checked = f"_{table_name}_checked"
+    errors = error_mask(table_name)
+    return f"""
+-- =====================================================================
+-- Silver {table_name} + quarantine from ONE Bronze scan
+-- =====================================================================
+-- Step 1: CHECK every row once (cached for both routes)
+CACHE TABLE {checked} AS
+SELECT
     *,
-    current_timestamp() as _quarantined_at,
-    '{', '.join(r['name'] for r in error_rules)}' as _failed_checks
-FROM {catalog}.{bronze_schema}.{table_name}
-WHERE {where_clause};
+    {failed_mask_sql(table_name)} as _dq_failed_mask
+FROM {catalog}.{bronze_schema}.{table_name};
+
+-- Step 2a: ROUTE failing rows to quarantine
+CREATE OR REPLACE TABLE {catalog}.{quarantine_schema}.{table_name}_quarantine AS
+SELECT *, current_timestamp() as _quarantined_at
+FROM {checked}
+WHERE (_dq_failed_mask & {errors}) <> 0;
+
+-- Step 2b: ROUTE the rest to Silver
+CREATE OR REPLACE TABLE {catalog}.{silver_schema}.{table_name} AS
+
+{SILVER_SELECTS[table_name](f"(SELECT * FROM {checked} WHERE (_dq_failed_mask & {errors}) = 0) clean")};
+
+-- Step 3: release the cache
+UNCACHE TABLE IF EXISTS {checked};
 """
@@ -0,0 +1,234 @@
+"""
+SLA Tracker — deadline-indexed breach detection for tickets
+=============================================================
+PURPOSE:
+  Silver tickets computes is_breached from current_timestamp() at build time,
+  so keeping breach flags current meant rebuilding the whole table, and the
+  orchestrator's health check asked Airtable for breached tickets with
+  another full formula scan. Both cost O(all tickets) per check.
+
+  SlaTracker keeps the open tickets' deadlines in a small SQLite file beside
+  Silver, indexed by due time:
+
+      data/silver/_sla_deadlines.sqlite
+        sla_deadlines   one row per open ticket (due_at, alert fields, breached_at)
+        sla_ticks       one row per tick (when, how many newly breached)
+        sla_syncs       one row per sync (when, how many tracked / removed)
+
+  tick(now) answers "which tickets crossed their deadline since the last
+  tick?" with one range scan of the partial index
+  (due_at WHERE breached_at IS NULL): it reads exactly the newly breached
+  rows, stamps breached_at on them, and returns them for alerting. Cost is
+  O(log n + newly breached), however many tickets are open.
+
+  sync(tickets) feeds it from a tickets batch when it lands in Bronze
+  (local_bronze.ingest_table / ingest_incremental with sla_tracker=...):
+  new and changed deadlines are upserted, and completed or live tickets
+  leave the index — as do tickets missing from a full snapshot (deleted
+  upstream). An unchanged deadline keeps its breached_at, so a re-sync
+  never re-alerts. A moved deadline re-arms the ticket. Until the first
+  sync the index is empty, so last_sync() is None and callers (the
+  orchestrator's health check) keep asking Airtable instead.
+
+  On Databricks, generate_silver_tickets_breach_sql() (silver_transforms.py)
+  is the equivalent incremental UPDATE: only open, not-yet-breached tickets
+  past due are rewritten.
+"""
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    # Only sync() reads Arrow tables; tick() and breached() are plain SQLite
+    pa = pc = None
+
+SLA_FILE = "_sla_deadlines.sqlite"
+# Stages where a ticket's SLA no longer applies (same as the Silver SQL)
+CLOSED_STAGES = ("Completed", "Live")
+# due_date arrives as text ("2026-02-13 08:00"); tried in order, like TRY_CAST
+DUE_DATE_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d")
+ALERT_COLUMNS = ("campaign_id", "urgency", "assignee", "stage")
+
+
+def _as_key(value: datetime) -> str:
+    """Fixed-width naive-UTC text, so SQLite string order is time order."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(sep=" ", timespec="seconds")
+
+
+def parse_due_dates(values) -> "pa.TimestampArray":
+    """TRY_CAST(due_date AS TIMESTAMP) for an Arrow string column: unparseable → null."""
+    if pa.types.is_timestamp(values.type):
+        return values
+    values = pc.utf8_trim(values.cast(pa.string()), characters=" ")
+    parsed = [pc.strptime(values, format=f, unit="s", error_is_null=True) for f in DUE_DATE_FORMATS]
+    return pc.coalesce(*parsed)
+
+
+@dataclass
+class SlaBreach:
+    """A ticket that crossed its deadline."""
+    ticket_id: str
+    due_at: str
+    breached_at: str
+    campaign_id: Optional[str] = None
+    urgency: Optional[str] = None
+    assignee: Optional[str] = None
+    stage: Optional[str] = None
+
+    def as_alert(self) -> dict:
+        """Airtable-record shape, as AlertPipeline.send_sla_breach_alert expects."""
+        return {"id": self.ticket_id, "fields": {
+            "Ticket ID": self.ticket_id,
+            "Urgency": self.urgency or "N/A",
+            "Assignee": self.assignee or "Unassigned",
+        }}
+
+
+class SlaTracker:
+    """
+    Deadline index over open tickets.
+
+        tracker = SlaTracker.for_silver("data/silver")
+        lb.ingest_table("tickets", sla_tracker=tracker)   # syncs the landed snapshot
+        for breach in tracker.tick():        # only the newly breached
+            ...
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS sla_deadlines (
+                ticket_id TEXT PRIMARY KEY,
+                due_at TEXT NOT NULL,
+                campaign_id TEXT, urgency TEXT, assignee TEXT, stage TEXT,
+                breached_at TEXT
+            )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_sla_pending "
+                         "ON sla_deadlines (due_at) WHERE breached_at IS NULL")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_sla_breached "
+                         "ON sla_deadlines (breached_at) WHERE breached_at IS NOT NULL")
+            conn.execute("CREATE TABLE IF NOT EXISTS sla_ticks "
+                         "(tick_at TEXT NOT NULL, newly_breached INTEGER NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS sla_syncs "
+                         "(sync_at TEXT NOT NULL, tracked INTEGER NOT NULL, removed INTEGER NOT NULL)")
+
+    @classmethod
+    def for_silver(cls, silver_dir: str = "data/silver") -> "SlaTracker":
+        return cls(os.path.join(silver_dir, SLA_FILE))
+
+    @contextmanager
+    def _connect(self):
+        """One transaction: committed on success, rolled back on error, always closed."""
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def sync(self, tickets, snapshot: bool = True) -> dict:
+        """
+        Upsert deadlines from a tickets table (Arrow; Bronze or Silver shape).
+        Closed tickets and tickets without a parseable due_date are removed;
+        with snapshot=True (`tickets` is the full table, as Bronze tickets
+        are) so are tracked tickets it no longer contains. Pass
+        snapshot=False for a partial batch. Returns {"tracked": n, "removed": n}.
+        """
+        stage = pc.utf8_trim(tickets.column("stage"), characters=" ")
+        closed = pc.fill_null(pc.is_in(stage, value_set=pa.array(CLOSED_STAGES)), False)
+        due = parse_due_dates(tickets.column("due_date"))
+        drop = pc.or_(closed, pc.is_null(due))
+
+        def column(name, mask):
+            if name == "stage":
+                values = stage
+            elif name in tickets.column_names:
+                values = pc.utf8_trim(tickets.column(name).cast(pa.string()), characters=" ")
+            else:
+                values = pa.nulls(tickets.num_rows, pa.string())
+            return values.filter(mask).to_pylist()
+
+        keep = pc.invert(drop)
+        due_keys = [_as_key(d) for d in due.filter(keep).to_pylist()]
+        rows = list(zip(column("ticket_id", keep), due_keys, *(column(c, keep) for c in ALERT_COLUMNS)))
+        removed = [(t,) for t in column("ticket_id", drop)]
+
+        with self._connect() as conn:
+            conn.executemany("""
+                INSERT INTO sla_deadlines (ticket_id, due_at, campaign_id, urgency, assignee, stage)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (ticket_id) DO UPDATE SET
+                    campaign_id = excluded.campaign_id,
+                    urgency = excluded.urgency,
+                    assignee = excluded.assignee,
+                    stage = excluded.stage,
+                    breached_at = CASE WHEN sla_deadlines.due_at = excluded.due_at
+                                       THEN sla_deadlines.breached_at END,
+                    due_at = excluded.due_at
+            """, rows)
+            conn.executemany("DELETE FROM sla_deadlines WHERE ticket_id = ?", removed)
+            dropped = len(removed)
+            if snapshot:
+                conn.execute("CREATE TEMP TABLE sla_snapshot (ticket_id TEXT PRIMARY KEY)")
+                conn.executemany("INSERT OR IGNORE INTO sla_snapshot VALUES (?)",
+                                 [row[:1] for row in rows] + removed)
+                dropped += conn.execute("DELETE FROM sla_deadlines WHERE ticket_id NOT IN "
+                                        "(SELECT ticket_id FROM sla_snapshot)").rowcount
+            conn.execute("INSERT INTO sla_syncs VALUES (?, ?, ?)",
+                         (_as_key(datetime.now(timezone.utc)), len(rows), dropped))
+        return {"tracked": len(rows), "removed": dropped}
+
+    def tick(self, now: Optional[datetime] = None) -> list:
+        """
+        Tickets whose deadline passed (due_at < now) since the last tick, in
+        due order; they're marked breached so the next tick skips them.
+        """
+        now_key = _as_key(now or datetime.now(timezone.utc))
+        with self._connect() as conn:
+            cursor = conn.execute("""
+                SELECT ticket_id, due_at, campaign_id, urgency, assignee, stage
+                FROM sla_deadlines INDEXED BY ix_sla_pending
+                WHERE breached_at IS NULL AND due_at < ?
+                ORDER BY due_at
+            """, (now_key,))
+            breaches = [SlaBreach(t, due, now_key, c, u, a, s) for t, due, c, u, a, s in cursor]
+            conn.executemany("UPDATE sla_deadlines SET breached_at = ? WHERE ticket_id = ?",
+                             [(now_key, b.ticket_id) for b in breaches])
+            conn.execute("INSERT INTO sla_ticks VALUES (?, ?)", (now_key, len(breaches)))
+        return breaches
+
+    def breached(self) -> list:
+        """Every open ticket currently in breach (not just the newly breached)."""
+        with self._connect() as conn:
+            cursor = conn.execute("""
+                SELECT ticket_id, due_at, breached_at, campaign_id, urgency, assignee, stage
+                FROM sla_deadlines WHERE breached_at IS NOT NULL ORDER BY due_at
+            """)
+            return [SlaBreach(*row) for row in cursor]
+
+    def last_tick(self) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(tick_at) FROM sla_ticks").fetchone()
+        return row[0]
+
+    def last_sync(self) -> Optional[str]:
+        """When sync() last ran; None means the index has never been fed."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(sync_at) FROM sla_syncs").fetchone()
+        return row[0]
+
+    def next_due(self) -> Optional[str]:
+        """The earliest pending deadline — when the next breach can happen at the soonest."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT MIN(due_at) FROM sla_deadlines WHERE breached_at IS NULL").fetchone()
+        return row[0]
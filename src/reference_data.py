@@ -0,0 +1,74 @@
+"""
+Reference Data — BOAT lookup tables
+===================================
+The Markets & Regions and VLOOKUP tables the ad ops lab is modeled on. The
+data generator samples campaigns from them (and exports them as the
+reference CSVs); the Silver canonicalizers compile their alias maps from
+them. Kept here so production SQL generation doesn't import the generator.
+"""
+
+# Markets & Regions table (from BOAT "Markets & Regions" tab)
+MARKETS = [
+    {"code": "US (ENG)", "geo": "US", "country": "United States", "lang": "ENG", "cluster": "US", "region": "North America"},
+    {"code": "US (ES)", "geo": "US", "country": "United States", "lang": "ES", "cluster": "US", "region": "North America"},
+    {"code": "CA (ENG)", "geo": "CA", "country": "Canada", "lang": "ENG", "cluster": "CA", "region": "North America"},
+    {"code": "CA (FR)", "geo": "CA", "country": "Canada", "lang": "FR", "cluster": "CA", "region": "North America"},
+    {"code": "GB (ENG-GB)", "geo": "GB", "country": "United Kingdom", "lang": "ENG-GB", "cluster": "UKI", "region": "EMEA"},
+    {"code": "IE (ENG-GB)", "geo": "IE", "country": "Ireland", "lang": "ENG-GB", "cluster": "UKI", "region": "EMEA"},
+    {"code": "DE (DE)", "geo": "DE", "country": "Germany", "lang": "DE", "cluster": "GSA", "region": "EMEA"},
+    {"code": "AT (AT)", "geo": "AT", "country": "Austria", "lang": "AT", "cluster": "GSA", "region": "EMEA"},
+    {"code": "CH (DE)", "geo": "CH", "country": "Switzerland", "lang": "DE", "cluster": "GSA", "region": "EMEA"},
+    {"code": "FR (FR)", "geo": "FR", "country": "France", "lang": "FR", "cluster": "France", "region": "EMEA"},
+    {"code": "ES (ES)", "geo": "ES", "country": "Spain", "lang": "ES", "cluster": "Iberia", "region": "EMEA"},
+    {"code": "PT (PT)", "geo": "PT", "country": "Portugal", "lang": "PT", "cluster": "Iberia", "region": "EMEA"},
+    {"code": "IT (IT)", "geo": "IT", "country": "Italy", "lang": "IT", "cluster": "Italy", "region": "EMEA"},
+    {"code": "NL (DUT)", "geo": "NL", "country": "Netherlands", "lang": "DUT", "cluster": "BeNeLux", "region": "EMEA"},
+    {"code": "BE (FR)", "geo": "BE", "country": "Belgium", "lang": "FR", "cluster": "BeNeLux", "region": "EMEA"},
+    {"code": "SE (SV)", "geo": "SE", "country": "Sweden", "lang": "SV", "cluster": "Nordics", "region": "EMEA"},
+    {"code": "NO (NB)", "geo": "NO", "country": "Norway", "lang": "NB", "cluster": "Nordics", "region": "EMEA"},
+    {"code": "DK (DA)", "geo": "DK", "country": "Denmark", "lang": "DA", "cluster": "Nordics", "region": "EMEA"},
+    {"code": "AU (ENG)", "geo": "AU", "country": "Australia", "lang": "ENG", "cluster": "AU", "region": "APAC"},
+    {"code": "NZ (ENG)", "geo": "NZ", "country": "New Zealand", "lang": "ENG", "cluster": "NZ", "region": "APAC"},
+    {"code": "SG (ENG)", "geo": "SG", "country": "Singapore", "lang": "ENG", "cluster": "SG", "region": "APAC"},
+    {"code": "JP (JA)", "geo": "JP", "country": "Japan", "lang": "JA", "cluster": "JP", "region": "APAC"},
+    {"code": "KR (KO)", "geo": "KR", "country": "Korea", "lang": "KO", "cluster": "KR", "region": "APAC"},
+    {"code": "TW (ZH)", "geo": "TW", "country": "Taiwan", "lang": "ZH", "cluster": "TW", "region": "APAC"},
+    {"code": "HK (ZH)", "geo": "HK", "country": "Hong Kong", "lang": "ZH", "cluster": "HK", "region": "APAC"},
+    {"code": "MX (ES)", "geo": "MX", "country": "Mexico", "lang": "ES", "cluster": "MX", "region": "LATAM"},
+    {"code": "BR (PT)", "geo": "BR", "country": "Brazil", "lang": "PT", "cluster": "BR", "region": "LATAM"},
+    {"code": "AR (ES)", "geo": "AR", "country": "Argentina", "lang": "ES", "cluster": "AR", "region": "LATAM"},
+    {"code": "CL (ES)", "geo": "CL", "country": "Chile", "lang": "ES", "cluster": "ClPeCo", "region": "LATAM"},
+    {"code": "CO (ES)", "geo": "CO", "country": "Colombia", "lang": "ES", "cluster": "ClPeCo", "region": "LATAM"},
+]
+
+# Brand mapping (from BOAT VLOOKUP Tables) - updated for new Enterprise Segments
+BRANDS = [
+    {"airtable_value": "Disney+ Standalone", "central_grid": "PLUS", "product": "Disney+", "code": "PLUS", "segment": "DET"},
+    {"airtable_value": "Bundle", "central_grid": "DBUN", "product": "Bundle", "code": "DBUN", "segment": "DET"},
+    {"airtable_value": "Disney", "central_grid": "DIS", "product": "Disney+", "code": "DIS", "segment": "DET"},
+    {"airtable_value": "Marvel", "central_grid": "MAR", "product": "Marvel", "code": "MAR", "segment": "Studios"},
+    {"airtable_value": "Star Wars", "central_grid": "SW", "product": "Star Wars", "code": "SW", "segment": "Studios"},
+    {"airtable_value": "Pixar", "central_grid": "PIX", "product": "Pixar", "code": "PIX", "segment": "Studios"},
+    {"airtable_value": "National Geographic", "central_grid": "NG", "product": "NatGeo", "code": "NG", "segment": "DET"},
+    {"airtable_value": "Star", "central_grid": "STAR", "product": "Star", "code": "STAR", "segment": "DET"},
+    {"airtable_value": "STAR+", "central_grid": "STAR+", "product": "Star+", "code": "STAR+", "segment": "DET"},
+    {"airtable_value": "COMBO+", "central_grid": "COMBO+", "product": "Combo+", "code": "COMBO+", "segment": "DET"},
+    {"airtable_value": "ESPN", "central_grid": "ESPN", "product": "ESPN+", "code": "ESPN", "segment": "ESPN"},
+    {"airtable_value": "Disney Parks", "central_grid": "PARKS", "product": "Theme Parks", "code": "PARKS", "segment": "Experiences"},
+    {"airtable_value": "Disney Cruise Line", "central_grid": "DCL", "product": "Cruise Line", "code": "DCL", "segment": "Experiences"},
+    {"airtable_value": "Disney Store", "central_grid": "STORE", "product": "Consumer Products", "code": "STORE", "segment": "DCP"},
+]
+
+# Channel mapping (from BOAT VLOOKUP Tables)
+CHANNELS = [
+    {"airtable_value": "Display Static", "central_grid": "ProgDisplay", "platform_tax": "CM + DV360"},
+    {"airtable_value": "Display Video", "central_grid": "ProgVideo", "platform_tax": "CM + DV360"},
+    {"airtable_value": "Display Native", "central_grid": "ProgNative", "platform_tax": "CM + DV360"},
+    {"airtable_value": "Display Animated", "central_grid": "ProgDisplay", "platform_tax": "CM + DV360"},
+    {"airtable_value": "Social Static", "central_grid": "Social", "platform_tax": "Meta/TikTok/Snap"},
+    {"airtable_value": "Social Video", "central_grid": "Social", "platform_tax": "Meta/TikTok/Snap"},
+    {"airtable_value": "Search", "central_grid": "Search", "platform_tax": "Google Ads"},
+    {"airtable_value": "CTV", "central_grid": "ProgCTV", "platform_tax": "CM + DV360"},
+    {"airtable_value": "Audio", "central_grid": "ProgAudio", "platform_tax": "CM + DV360/Spotify"},
+    {"airtable_value": "YouTube", "central_grid": "YouTube", "platform_tax": "CM + DV360"},
+]
@@ -0,0 +1,32 @@
+import pytest
+
+from src import data_generator as gen
+
+SOURCE_FILES = {
+    "titles": "01_titles.csv",
+    "campaigns": "02_campaigns.csv",
+    "delivery": "03_delivery.csv",
+    "tickets": "04_tickets.csv",
+    "qa_checks": "05_qa_checks.csv",
+}
+
+REFERENCE_FILES = {
+    "06_brand_mapping.csv": gen.generate_brand_mapping,
+    "07_channel_mapping.csv": gen.generate_channel_mapping,
+    "08_markets.csv": gen.generate_markets,
+    "09_users.csv": gen.generate_users,
+    "10_ticket_types.csv": gen.generate_ticket_types,
+    "11_audiences.csv": gen.generate_audiences,
+}
+
+
+@pytest.fixture(scope="session")
+def lab_data(tmp_path_factory):
+    """The small-profile lab CSVs (all 11 files), written once per test session."""
+    data_dir = tmp_path_factory.mktemp("data")
+    core = gen.generate_core_tables(gen.resolve_profile("small"))
+    for table, file_name in SOURCE_FILES.items():
+        core[table].to_csv(data_dir / file_name, index=False)
+    for file_name, generate in REFERENCE_FILES.items():
+        generate().to_csv(data_dir / file_name, index=False)
+    return data_dir
@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.pipelines import bronze_ingestion as bronze
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_compile_schema_is_memoized_and_consistent():
+    compiled = bronze.compile_schema("delivery")
+    assert bronze.compile_schema("delivery") is compiled
+    assert compiled.arrow_schema_with_metadata is compiled.arrow_schema_with_metadata
+    assert compiled.names == [name for name, _ in bronze.BRONZE_SCHEMAS["delivery"]["columns"]]
+    assert compiled.arrow_schema.field("date").type == pa.date32()
+    assert compiled.spark_ddl.startswith("delivery_id STRING, campaign_id STRING, date DATE")
+
+    sql = bronze.generate_bronze_create_sql("delivery", catalog="c", schema="s")
+    assert "CREATE TABLE IF NOT EXISTS c.s.delivery" in sql
+    assert "    _batch_id STRING\n)" in sql and "PARTITIONED BY (date)" in sql
+
+
+def test_casters():
+    tickets = bronze.compile_schema("tickets")
+    row = tickets.cast_row({"ticket_id": "TKT-1", "eve_eligible": "True", "sla_hours": "8",
+                            "created_date": "2026-02-01", "notes": ""})
+    assert row["eve_eligible"] is True and row["sla_hours"] == 8
+    assert row["created_date"] == date(2026, 2, 1) and row["notes"] is None
+
+    raw = pd.DataFrame({name: ["", ""] for name in tickets.names})
+    raw.loc[0, ["sla_hours", "eve_eligible", "created_date"]] = ["4", "False", "2026-02-03"]
+    typed = tickets.cast_frame(raw)
+    assert str(typed["sla_hours"].dtype) == "Int32" and typed["sla_hours"][0] == 4
+    assert typed["eve_eligible"][0] == False and pd.isna(typed["eve_eligible"][1])  # noqa: E712
+    assert typed["created_date"][0] == pd.Timestamp("2026-02-03")
+
+    # An optional column the file leaves out comes back as NULL
+    delivery = bronze.compile_schema("delivery")
+    daily = pd.DataFrame({name: ["1"] for name in delivery.names if name != "hour"}).assign(date="2026-02-01")
+    assert pd.isna(delivery.cast_frame(daily)["hour"][0])
+
+
+def test_databricks_loads_use_the_declared_types():
+    compiled = bronze.compile_schema("delivery")
+    autoloader = bronze.generate_autoloader_sql("delivery", "/Volumes/landing")
+    assert f'.schema("{compiled.spark_ddl}")' in autoloader and "schemaLocation" not in autoloader
+
+    copy = bronze.generate_batch_ingest_sql("delivery", "/Volumes/landing")
+    assert "'inferSchema' = 'false'" in copy and "inferSchema' = 'true'" not in copy
+    assert "CAST(impressions AS INT) AS impressions" in copy and "CAST(date AS DATE) AS date" in copy
+    assert "hour" not in copy   # optional: a daily file has no such column
+    with pytest.raises(ValueError):
+        bronze.generate_batch_ingest_sql("nope", "/Volumes/landing")
+
+
+def test_imports_without_pyarrow():
+    code = (
+        "import sys; sys.modules['pyarrow'] = None\n"
+        "from src.pipelines import bronze_ingestion as bronze\n"
+        "assert bronze.ARROW_TYPES == {}\n"
+        "assert bronze.compile_schema('delivery').spark_ddl\n"
+        "try:\n"
+        "    bronze.compile_schema('delivery').arrow_schema\n"
+        "except ImportError as e:\n"
+        "    assert 'pip install pyarrow' in str(e)\n"
+        "else:\n"
+        "    raise AssertionError('no ImportError')\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=ROOT)
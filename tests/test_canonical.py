@@ -0,0 +1,67 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.pipelines.canonical import Canonicalizer, generator_canonicalizers, reference_canonicalizers
+from src.pipelines.silver_transforms import (
+    PLATFORM,
+    PLATFORM_STANDARDIZATION,
+    generate_silver_campaign_sql,
+    generate_silver_tickets_sql,
+)
+
+RAW = [" meta", "Facebook ", "DCM", "instagram", "Yahoo DSP ", "  yahoo dsp", None, "snap", "Meta", "Spotify"]
+
+
+def test_encode_remaps_codes_and_keeps_unknowns_trimmed():
+    encoded = PLATFORM.encode(pa.array(RAW * 1000))
+    assert encoded.dictionary.to_pylist()[:len(PLATFORM.categories)] == list(PLATFORM.categories)
+    # Unknowns are appended to the dictionary once each, after the canonical values
+    assert encoded.dictionary.to_pylist()[len(PLATFORM.categories):] == ["Yahoo DSP", "yahoo dsp", "Spotify"]
+    assert encoded.dictionary_decode().to_pylist()[:len(RAW)] == [PLATFORM.lookup(v) for v in RAW]
+    assert PLATFORM.lookup(" FACEBOOK") == "Meta" and PLATFORM.lookup("Other ") == "Other"
+    # The lookup dict is built once, not per call
+    assert PLATFORM.mapping is PLATFORM.mapping
+
+    already_encoded = pa.chunked_array([pa.array(RAW).dictionary_encode()])
+    assert PLATFORM.apply(already_encoded).to_pylist() == PLATFORM.apply(pa.array(RAW)).to_pylist()
+
+
+def test_sql_case_matches_local_apply():
+    duckdb = pytest.importorskip("duckdb")
+    con = duckdb.connect()
+    con.register("raw", pa.table({"i": range(len(RAW)), "platform": RAW}))
+    sql = f"SELECT {PLATFORM.sql_case('platform')} AS platform FROM raw ORDER BY i"
+    assert [r[0] for r in con.execute(sql).fetchall()] == PLATFORM.apply(pa.array(RAW)).to_pylist()
+    for alias, canonical in PLATFORM_STANDARDIZATION.items():
+        assert PLATFORM.lookup(alias) == canonical
+
+
+def test_conflicting_aliases_are_rejected():
+    with pytest.raises(ValueError, match="dcm"):
+        Canonicalizer.compile("platform", [("dcm", "CM360"), ("DCM ", "DV360")])
+
+
+def test_reference_dimensions(lab_data):
+    canonical = reference_canonicalizers(str(lab_data))
+    brand, geo, channel = canonical["brand_code"], canonical["targeting_geo"], canonical["channel_mapped"]
+    assert [brand.lookup(v) for v in ["Marvel", " star ", "STAR+", "DIS"]] == ["MAR", "STAR", "STAR+", "DIS"]
+    assert [geo.lookup(v) for v in ["United States", "US (ES)", "de"]] == ["US", "US", "DE"]
+    assert channel.lookup("social video") == "Social"
+
+    tickets = pd.read_csv(lab_data / "04_tickets.csv")
+    codes = brand.categorical(tickets["brand"])
+    assert isinstance(codes.dtype, pd.CategoricalDtype)
+    assert set(codes.dropna()) <= set(brand.categories)
+
+
+def test_silver_sql_uses_the_same_reference_dimensions(lab_data):
+    # The SQL compiles from src.reference_data, the dashboard from the CSVs
+    canonical = reference_canonicalizers(str(lab_data))
+    assert generator_canonicalizers() == canonical
+
+    campaigns, tickets = generate_silver_campaign_sql(), generate_silver_tickets_sql()
+    for column in ("brand_code", "targeting_geo", "channel_mapped"):
+        assert f"{canonical[column].sql_case(column)} as {column}" in campaigns
+    assert f"{canonical['brand_code'].sql_case('brand')} as brand" in tickets
+    assert f"{canonical['targeting_geo'].sql_case('targeting_geo')} as targeting_geo" in tickets
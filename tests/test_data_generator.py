@@ -0,0 +1,158 @@
+import pandas as pd
+import pytest
+from src import data_generator as gen
+
+
+@pytest.fixture(scope="module")
+def campaigns():
+    titles = gen.generate_titles(20)
+    return gen.generate_campaigns(titles, 60)
+
+
+def test_delivery_is_seed_reproducible(campaigns):
+    first = gen.generate_delivery(campaigns, seed=7)
+    second = gen.generate_delivery(campaigns, seed=7)
+    assert first.equals(second)
+    assert not first.equals(gen.generate_delivery(campaigns, seed=8))
+
+
+def test_delivery_only_for_active_or_completed(campaigns):
+    delivery = gen.generate_delivery(campaigns)
+    delivering = campaigns[campaigns["status"].isin(["Active", "Completed"])]
+    assert set(delivery["campaign_id"]) <= set(delivering["campaign_id"])
+    assert delivery["date"].max() <= "2026-03-01"
+
+
+def test_delivery_ids_are_unique(campaigns):
+    delivery = gen.generate_delivery(campaigns)
+    assert delivery["delivery_id"].is_unique
+    assert delivery["delivery_id"].str.len().eq(8).all()
+
+
+def test_delivery_metric_ranges(campaigns):
+    delivery = gen.generate_delivery(campaigns)
+    assert (delivery["impressions"] >= 0).all()
+    assert (delivery["clicks"] <= delivery["impressions"]).all()
+    assert delivery["viewability_rate"].between(0.40, 0.95).all()
+    assert delivery["vast_errors"].between(0, 50).all()
+
+
+def test_streamed_chunks_match_in_memory(campaigns):
+    chunks = list(gen.iter_delivery_chunks(campaigns, chunk_rows=100))
+    assert all(len(c) == 100 for c in chunks[:-1])
+    streamed = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(streamed, gen.generate_delivery(campaigns))
+
+
+def test_partitioned_writer_layout(campaigns, tmp_path):
+    out_dir = tmp_path / "delivery"
+    total = gen.write_delivery_partitioned(campaigns, str(out_dir), chunk_rows=250)
+    delivery = gen.generate_delivery(campaigns)
+    assert total == len(delivery)
+    assert sorted(p.name for p in out_dir.iterdir()) == [
+        f"date={d}" for d in sorted(delivery["date"].unique())
+    ]
+    part = pd.read_parquet(next(out_dir.glob("date=*/part-00000.parquet")))
+    assert "date" not in part.columns
+
+
+def test_core_tables_identical_across_worker_counts(monkeypatch):
+    monkeypatch.setattr(gen, "SHARD_ROWS", 25)
+    monkeypatch.setattr(gen, "DELIVERY_BLOCK_CAMPAIGNS", 16)
+    profile = gen.resolve_profile("small", campaigns=90, tickets=200)
+    serial = gen.generate_core_tables(profile, seed=3, workers=1)
+    pooled = gen.generate_core_tables(profile, seed=3, workers=3)
+    for table in serial:
+        pd.testing.assert_frame_equal(serial[table], pooled[table])
+    assert serial["campaigns"]["campaign_id"].is_unique
+    assert serial["qa_checks"]["qa_id"].is_unique
+
+
+
+def test_zero_tickets_keep_their_columns():
+    tables = gen.generate_core_tables(gen.resolve_profile("small", campaigns=20, tickets=0))
+    assert tables["tickets"].empty and tables["qa_checks"].empty
+    assert {"ticket_id", "eve_eligible"} <= set(tables["tickets"].columns)
+    assert {"qa_id", "result"} <= set(tables["qa_checks"].columns)
+
+def test_profile_lifts_day_cap_and_cutoff(campaigns):
+    delivery = gen.generate_delivery(campaigns, days=60, cutoff=None)
+    assert delivery.groupby("campaign_id").size().max() == 60
+    assert delivery["date"].max() > "2026-03-01"
+
+
+def test_delivery_stops_at_end_date(campaigns):
+    delivery = gen.generate_delivery(campaigns, days=400, cutoff=None)
+    flights = delivery.merge(campaigns[["campaign_id", "start_date", "end_date"]], on="campaign_id")
+    assert flights["date"].between(flights["start_date"], flights["end_date"]).all()
+
+
+def test_hourly_grain(campaigns):
+    daily = gen.generate_delivery(campaigns)
+    hourly = gen.generate_delivery(campaigns, hourly=True)
+    assert len(hourly) == 24 * len(daily)
+    assert sorted(hourly["hour"].unique()) == list(range(24))
+    assert hourly["delivery_id"].is_unique
+
+
+def test_resolve_profile_overrides():
+    profile = gen.resolve_profile("stress", campaigns=10, hourly=False)
+    assert profile.campaigns == 10 and not profile.hourly
+    assert profile.cutoff is None
+    with pytest.raises(ValueError):
+        gen.resolve_profile("huge")
+
+
+def test_live_landing_injects_duplicates_and_late_rows(campaigns, tmp_path):
+    stats = gen.run_live_landing(campaigns, str(tmp_path), rows_per_sec=10_000,
+                                 batch_seconds=0.01, duplicate_rate=0.1, late_rate=0.2)
+    files = sorted(tmp_path.glob("delivery_*.csv"))
+    assert len(files) == stats.batches
+    assert not list(tmp_path.glob("*.tmp"))
+    landed = pd.concat([pd.read_csv(f) for f in files], ignore_index=True)
+    assert len(landed) == stats.rows
+    assert stats.duplicate_rows > 0 and stats.late_rows > 0
+    # Every generated row lands exactly once, plus the injected re-sends
+    expected = gen.generate_delivery(campaigns)
+    assert set(landed["delivery_id"]) == set(expected["delivery_id"])
+    assert len(landed) == len(expected) + stats.duplicate_rows
+
+
+def test_ticket_sla_override_and_routing(campaigns):
+    tickets = gen.generate_tickets(campaigns, 2000, seed=5)
+    assert (tickets.loc[tickets["urgency"] == "Critical", "sla_hours"] <= 4).all()
+    assert (tickets.loc[tickets["urgency"] == "High", "sla_hours"] <= 8).all()
+    engineers = {u["name"] for u in gen.USERS if u["role"] == "Engineer"}
+    assert set(tickets.loc[tickets["routed_to_role"] == "Engineer", "assignee"]) <= engineers
+    assert tickets["ticket_id"].iloc[0] == "TKT-00001"
+
+
+def test_qa_checks_are_distinct_per_ticket(campaigns):
+    tickets = gen.generate_tickets(campaigns, 500, seed=5)
+    qa = gen.generate_qa_checks(tickets, seed=5)
+    per_ticket = qa.groupby("ticket_id", observed=True)["check_name"]
+    assert per_ticket.size().between(3, len(gen.QA_CHECKS)).all()
+    assert (per_ticket.nunique() == per_ticket.size()).all()
+    eligible = tickets.loc[tickets["stage"].isin(gen.QA_STAGES), "ticket_id"]
+    assert set(qa["ticket_id"]) == set(eligible)
+
+
+def test_hot_key_skew_concentrates_delivery_and_tickets(campaigns):
+    uniform = gen.generate_delivery(campaigns)
+    hot = gen.generate_delivery(campaigns, hot_key_skew=1.2, hot_key_max_rows=50)
+    assert hot["delivery_id"].is_unique
+    per_campaign = hot.groupby("campaign_id").size().sort_values(ascending=False)
+    assert per_campaign.iloc[:3].sum() > 0.4 * len(hot)
+    # Fan-out splits the day's goal, it doesn't multiply it
+    assert hot["impressions"].sum() == pytest.approx(uniform["impressions"].sum(), rel=0.1)
+
+    tickets = gen.generate_tickets(campaigns, 2000, seed=5, hot_key_skew=1.2)
+    assert tickets["campaign_id"].value_counts().iloc[0] > 2000 / 10
+
+
+def test_platform_skew_favors_first_platform(campaigns):
+    titles = gen.generate_titles(20)
+    skewed = gen.generate_campaigns(titles, 600, rng=gen.random.Random(3), platform_skew=1.5)
+    counts = skewed["platform"].value_counts()
+    assert counts.index[0] == "CM360"
+    assert counts.iloc[0] > 2 * counts.iloc[-1]
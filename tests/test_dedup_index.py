@@ -0,0 +1,140 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from src.pipelines import local_bronze as lb
+from src.pipelines.dedup_index import DedupIndex, bloom_contains, build_bloom, key_hashes, row_hashes
+
+
+def _batch(ids, days, impressions=None):
+    start = date(2026, 2, 1)
+    return pa.record_batch({
+        "delivery_id": pa.array(ids, pa.string()),
+        "date": pa.array([start + timedelta(days=d) for d in days], pa.date32()),
+        "impressions": pa.array(impressions or [100] * len(ids), pa.int64()),
+    })
+
+
+def test_key_hashes_are_stable_and_length_aware():
+    values = pa.array(["a", "a\0", "abcdefgh", "abcdefghi", None, "a"], pa.string())
+    h = key_hashes(values)
+    assert len(set(h[:4].tolist())) == 4 and h[0] == h[5] and h[4] == 0
+    # Same answer on a sliced / chunked column
+    assert key_hashes(pa.chunked_array([values[1:3], values[3:]])).tolist() == h[1:].tolist()
+
+
+def test_bloom_has_no_false_negatives_and_reports_fp_rate():
+    rng = np.random.default_rng(7)
+    keys = rng.integers(0, 2**63, 20_000, dtype=np.int64).astype(np.uint64)
+    others = rng.integers(0, 2**63, 20_000, dtype=np.int64).astype(np.uint64)
+    bloom = build_bloom(keys, bits_per_key=10, num_hashes=7)
+    assert bloom_contains(bloom, keys, 7).all()
+    assert bloom_contains(bloom, others, 7).mean() < 0.02
+
+
+def test_filter_drops_resends_across_runs(tmp_path):
+    index = DedupIndex.open(str(tmp_path / "idx"))
+    first = index.filter(_batch(["d1", "d2", "d1", "d3"], [0, 0, 0, 1]))
+    assert first.column("delivery_id").to_pylist() == ["d1", "d2", "d3"]
+    # Later batch in the same run sees the staged keys
+    assert index.filter(_batch(["d2", "d4"], [0, 1])).num_rows == 1
+    stats = index.commit()
+    assert (stats.rows_in, stats.rows_out, stats.duplicates_batch) == (6, 4, 2)
+
+    reopened = DedupIndex.open(str(tmp_path / "idx"))
+    fresh = reopened.filter(_batch(["d1", "d3", "d5", None], [0, 1, 1, 1]))
+    assert fresh.column("delivery_id").to_pylist() == ["d5", None]
+    assert reopened.stats.duplicates_history == 2 and reopened.stats.null_keys == 1
+    assert reopened.stats.partitions_read == 2
+
+    # A rolled-back run leaves the index as it was
+    reopened.rollback()
+    assert DedupIndex.open(str(tmp_path / "idx")).filter(_batch(["d5"], [1])).num_rows == 1
+
+    report = reopened.report()
+    assert report.keys == 4 and report.partitions == 2
+    assert report.bloom_bytes > 0 and 0 < report.expected_fp_rate < 0.05
+
+
+def test_run_with_an_all_duplicate_batch_then_new_rows_for_the_same_date(tmp_path):
+    index = DedupIndex.open(str(tmp_path / "idx"))
+    index.filter(_batch(["d1", "d2"], [0, 0]))
+    index.commit()
+
+    # A re-sent file (nothing new for day 0), then fresh rows for that date
+    assert index.filter(_batch(["d1"], [0])).num_rows == 0
+    assert index.filter(_batch(["d3", "d1"], [0, 0])).column("delivery_id").to_pylist() == ["d3"]
+    assert index.filter(_batch(["d3", "d4"], [0, 0])).column("delivery_id").to_pylist() == ["d4"]
+    stats = index.commit()
+    assert (stats.rows_out, stats.duplicates_history, stats.duplicates_batch) == (2, 2, 1)
+    assert index.report().keys == 4
+
+
+def test_filter_keeps_corrected_resends(tmp_path):
+    index = DedupIndex.open(str(tmp_path / "idx"))
+    index.filter(_batch(["d1", "d2"], [0, 0], [100, 200]))
+    index.commit()
+
+    # d1 re-sent unchanged (dropped) and with corrected metrics (kept); within
+    # the batch the correction is only dropped when it is itself repeated
+    fresh = index.filter(_batch(["d1", "d1", "d2", "d2"], [0, 0, 0, 0], [100, 150, 250, 250]))
+    assert list(zip(fresh.column("delivery_id").to_pylist(), fresh.column("impressions").to_pylist())) == \
+        [("d1", 150), ("d2", 250)]
+    assert (index.stats.duplicates_history, index.stats.duplicates_batch) == (1, 1)
+
+    # Lineage columns don't make a re-load look new
+    stamped = _batch(["d1"], [0], [150]).append_column("_batch_id", pa.array(["b9"]))
+    assert row_hashes(stamped, "delivery_id")[0] == row_hashes(_batch(["d1"], [0], [150]), "delivery_id")[0]
+
+
+def test_ttl_evicts_old_dates_and_passes_late_rows(tmp_path):
+    index = DedupIndex.open(str(tmp_path / "idx"), ttl_days=2)
+    index.filter(_batch(["d1", "d2"], [0, 1]))
+    index.commit()
+    index.filter(_batch(["d3"], [5]))
+    index.commit()
+    assert index.report().partitions == 1
+    assert sorted(p.name for p in (tmp_path / "idx").glob("*.npy")) == \
+        ["date=2026-02-06.bloom.npy", "date=2026-02-06.keys.npy"]
+
+    # d1 is a re-send for an evicted date: can't be checked, so it passes through
+    late = index.filter(_batch(["d1", "d3"], [0, 5]))
+    assert late.column("delivery_id").to_pylist() == ["d1"]
+    assert index.stats.late_rows == 1
+
+    with pytest.raises(ValueError):
+        DedupIndex.open(str(tmp_path / "idx"), bits_per_key=12)
+
+
+def test_incremental_ingest_with_dedup_drops_resent_rows(lab_data, tmp_path):
+    landing = tmp_path / "landing"
+    landing.mkdir()
+    lines = (lab_data / "03_delivery.csv").read_text().splitlines()
+    header, rows = lines[0], lines[1:]
+    (landing / "delivery_000000.csv").write_text("\n".join([header] + rows[:200]) + "\n")
+    bronze = str(tmp_path / "bronze")
+    path = lb.dedup_index_path("delivery", bronze)
+
+    first = lb.ingest_incremental("delivery", str(tmp_path), bronze, pattern="landing/*.csv",
+                                  dedup=DedupIndex.open(path, ttl_days=3650))
+    assert first[0].row_count == 200
+
+    # Half re-sent (a different file, so the manifest can't tell), half new,
+    # and one re-sent row carries corrected impressions
+    fields = rows[100].split(",")
+    fields[3] = str(int(fields[3]) + 1)
+    corrected = ",".join(fields)
+    (landing / "delivery_000001.csv").write_text("\n".join([header, corrected] + rows[101:300]) + "\n")
+    index = DedupIndex.open(path, ttl_days=3650)
+    second = lb.ingest_incremental("delivery", str(tmp_path), bronze, pattern="landing/*.csv",
+                                   dedup=index)
+    assert second[0].row_count == 101
+    assert index.last_stats.duplicates_history == 99
+    bronze_rows = lb.read_bronze("delivery", bronze).to_pandas()
+    assert len(bronze_rows) == 301
+
+    # The correction is the latest-ingested version, so Silver's ROW_NUMBER() keeps it
+    versions = bronze_rows[bronze_rows["delivery_id"] == fields[0]].sort_values("_ingested_at")
+    assert versions["impressions"].tolist() == [int(fields[3]) - 1, int(fields[3])]
@@ -0,0 +1,87 @@
+import os
+
+from src.pipelines import file_manifest
+from src.pipelines.file_manifest import FileManifest
+
+
+def test_manifest_skips_seen_files_and_persists(tmp_path):
+    (tmp_path / "a.csv").write_text("x\n1\n")
+    (tmp_path / "b.csv").write_text("x\n2\n")
+    log = str(tmp_path / "_checkpoints" / "t.jsonl")
+
+    manifest = FileManifest(log)
+    pending = manifest.new_files(["a.csv", "b.csv"], root=str(tmp_path))
+    assert [e.path for e in pending] == ["a.csv", "b.csv"]
+    manifest.commit(pending, "b1")
+
+    reloaded = FileManifest(log)
+    assert len(reloaded) == 2 and reloaded.get("a.csv").batch_id == "b1"
+    assert reloaded.new_files(["a.csv", "b.csv"], root=str(tmp_path)) == []
+
+
+def test_manifest_rehashes_only_on_stat_change(tmp_path):
+    path = tmp_path / "a.csv"
+    path.write_text("x\n1\n")
+    log = str(tmp_path / "m.jsonl")
+    manifest = FileManifest(log)
+    manifest.commit(manifest.new_files(["a.csv"], root=str(tmp_path)), "b1")
+
+    # Touched but unchanged → not new, and the new mtime is recorded
+    os.utime(path, ns=(0, 1_000_000_000))
+    assert manifest.new_files(["a.csv"], root=str(tmp_path)) == []
+    manifest.commit([], "b2")
+    assert FileManifest(log).get("a.csv").mtime_ns == 1_000_000_000
+
+    # Same path, new content → new
+    path.write_text("x\n1\n2\n")
+    assert [e.path for e in manifest.new_files(["a.csv"], root=str(tmp_path))] == ["a.csv"]
+
+
+def test_manifest_records_resent_content_under_a_new_path(tmp_path, monkeypatch):
+    (tmp_path / "a.csv").write_text("x\n1\n")
+    log = str(tmp_path / "m.jsonl")
+    manifest = FileManifest(log)
+    manifest.commit(manifest.new_files(["a.csv"], root=str(tmp_path)), "b1")
+
+    # Re-sent under new names (one of them twice in the same run): skipped, but recorded
+    (tmp_path / "a_copy.csv").write_text("x\n1\n")
+    (tmp_path / "b.csv").write_text("x\n2\n")
+    (tmp_path / "b_copy.csv").write_text("x\n2\n")
+    pending = manifest.new_files(["a_copy.csv", "b.csv", "b_copy.csv"], root=str(tmp_path))
+    assert [e.path for e in pending] == ["b.csv"]
+    manifest.commit(pending, "b2")
+
+    reloaded = FileManifest(log)
+    assert reloaded.get("a_copy.csv").batch_id == "b1" and reloaded.get("b_copy.csv").batch_id == "b2"
+    hashed = []
+    monkeypatch.setattr(file_manifest, "file_sha256", hashed.append)
+    assert reloaded.new_files(["a.csv", "a_copy.csv", "b.csv", "b_copy.csv"], root=str(tmp_path)) == []
+    assert hashed == []
+
+
+def test_manifest_reloads_a_snapshot_that_reverts_to_earlier_content(tmp_path):
+    path = tmp_path / "a.csv"
+    log = str(tmp_path / "m.jsonl")
+    manifest = FileManifest(log)
+    for version, content in enumerate(["x\n1\n", "x\n2\n", "x\n1\n"]):
+        path.write_text(content)
+        os.utime(path, ns=(0, version * 1_000_000_000))
+        # A → B → A: every change at a known path is new data, even content seen before
+        pending = manifest.new_files(["a.csv"], root=str(tmp_path))
+        assert [e.path for e in pending] == ["a.csv"]
+        manifest.commit(pending, f"b{version}")
+    assert FileManifest(log).get("a.csv").batch_id == "b2"
+
+
+def test_snapshot_manifest_reloads_earlier_content_under_a_new_name(tmp_path):
+    manifest = FileManifest(str(tmp_path / "m.jsonl"))
+    for version, content in enumerate(["x\n1\n", "x\n2\n", "x\n1\n"], start=1):
+        (tmp_path / f"tickets_v{version}.csv").write_text(content)
+        pending = manifest.new_files([f"tickets_v{version}.csv"], root=str(tmp_path), aliases=False)
+        assert [e.path for e in pending] == [f"tickets_v{version}.csv"]
+        manifest.commit(pending, f"b{version}")
+    # Copies within one listing are still loaded once
+    (tmp_path / "tickets_v4.csv").write_text("x\n3\n")
+    (tmp_path / "tickets_v4_copy.csv").write_text("x\n3\n")
+    pending = manifest.new_files(["tickets_v4.csv", "tickets_v4_copy.csv"], root=str(tmp_path), aliases=False)
+    assert [e.path for e in pending] == ["tickets_v4.csv"]
@@ -0,0 +1,202 @@
+import re
+
+import pandas as pd
+import pytest
+
+from src.pipelines import local_bronze as lb
+from src.pipelines.gold_aggregations import (
+    PERFORMANCE_WINDOW_DAYS, TRAILING_WINDOWS, WINDOW_TABLE, generate_gold_campaign_performance_sql, generate_gold_daily_ops_summary_sql,
+    generate_gold_campaign_state_sql, generate_gold_refresh_sql, generate_gold_rollup_sql, generate_gold_window_advance_sql,
+    generate_gold_window_sql,
+)
+from src.pipelines.local_sql import to_duckdb_sql
+from src.pipelines.silver_transforms import (
+    generate_silver_campaign_sql, generate_silver_delivery_merge_sql, generate_silver_delivery_sql,
+)
+
+GOLD_DELIVERY_TABLES = ["campaign_performance", "daily_ops_summary"]
+
+
+def _load(con, table, bronze_dir):
+    con.register("staged", lb.read_bronze(table, bronze_dir))
+    con.execute(f"CREATE OR REPLACE TABLE adops_bronze.{table} AS SELECT * FROM staged")
+    con.unregister("staged")
+
+
+def _performance(con):
+    return con.execute("SELECT * EXCLUDE (_gold_refreshed_at) FROM adops_gold.campaign_performance "
+                       "ORDER BY campaign_id").df()
+
+
+def _daily_ops(con):
+    return con.execute("SELECT * EXCLUDE (_gold_refreshed_at) FROM adops_gold.daily_ops_summary "
+                       "ORDER BY delivery_date").df()
+
+
+def _refreshed_at(con):
+    return dict(con.execute("SELECT campaign_id, epoch_us(_gold_refreshed_at) "
+                            "FROM adops_gold.campaign_performance").fetchall())
+
+
+def test_incremental_campaign_performance_matches_full_build(lab_data, tmp_path):
+    duckdb = pytest.importorskip("duckdb")
+    delivery = pd.read_csv(lab_data / "03_delivery.csv")
+    last_days = delivery["date"] >= sorted(delivery["date"].unique())[-5]
+    hot = sorted(delivery.loc[last_days, "campaign_id"].unique())[:3]
+    late = delivery["campaign_id"].isin(hot) & last_days
+    resent = delivery[~late & (delivery["campaign_id"] == hot[0])].head(4).assign(impressions=lambda d: d.impressions + 500)
+
+    bronze_dir = str(tmp_path / "bronze")
+    landing = tmp_path / "landing"
+    landing.mkdir()
+    (landing / "02_campaigns.csv").write_text((lab_data / "02_campaigns.csv").read_text())
+
+    def ingest(frame, batch):
+        frame.to_csv(landing / "03_delivery.csv", index=False)
+        assert lb.ingest_table("delivery", str(landing), bronze_dir, batch_id=batch,
+                               mode="append").status == "success"
+
+    ingest(delivery[~late], "d1")
+    lb.ingest_table("campaigns", str(landing), bronze_dir, batch_id="c1")
+
+    con = duckdb.connect()
+    con.execute("CREATE SCHEMA adops_bronze; CREATE SCHEMA adops_silver; CREATE SCHEMA adops_gold")
+    _load(con, "campaigns", bronze_dir)
+    _load(con, "delivery", bronze_dir)
+    con.execute(to_duckdb_sql(generate_silver_campaign_sql(catalog="memory"), "memory"))
+    con.execute(to_duckdb_sql(generate_silver_delivery_sql(catalog="memory"), "memory"))
+    merge = to_duckdb_sql(generate_silver_delivery_merge_sql(catalog="memory", gold_schema="adops_gold"), "memory")
+    full_refresh = to_duckdb_sql(generate_gold_refresh_sql(GOLD_DELIVERY_TABLES, catalog="memory"), "memory")
+    con.execute(full_refresh)
+    con.execute(merge)      # sets the high-water mark; re-upserting d1 nets out in the state
+    con.execute(full_refresh)
+    refreshed = _refreshed_at(con)
+
+    # The hourly path: one new batch (late days for 3 campaigns + 4 re-sent rows)
+    ingest(pd.concat([delivery[late], resent]), "d2")
+    _load(con, "delivery", bronze_dir)
+    con.execute(merge)
+    con.execute(to_duckdb_sql(generate_gold_campaign_performance_sql(catalog="memory", incremental=True), "memory"))
+    con.execute(to_duckdb_sql(generate_gold_daily_ops_summary_sql(catalog="memory", incremental=True), "memory"))
+    after = _refreshed_at(con)
+    assert {c for c in after if after[c] != refreshed[c]} == set(hot)
+    incremental, incremental_daily = _performance(con), _daily_ops(con)
+
+    con.execute(full_refresh)
+    full = _performance(con)
+    pd.testing.assert_frame_equal(incremental_daily, _daily_ops(con), check_dtype=False)
+    # Lab data carries exact re-sends too; Silver counts each delivery_id once
+    unique = delivery.drop_duplicates("delivery_id")
+    assert int(full.loc[full.campaign_id == hot[0], "total_impressions"].iloc[0]) == \
+        int(unique.loc[unique.campaign_id == hot[0], "impressions"].sum()) + 500 * resent.delivery_id.nunique()
+    pd.testing.assert_frame_equal(incremental, full, check_dtype=False)
+
+
+def test_moved_resends_keep_campaign_days_and_dates_exact(lab_data, tmp_path):
+    duckdb = pytest.importorskip("duckdb")
+    delivery = pd.read_csv(lab_data / "03_delivery.csv")
+    first, second = sorted(delivery["campaign_id"].unique())[:2]
+    days = {c: sorted(delivery.loc[delivery.campaign_id == c, "date"]) for c in (first, second)}
+    # Onto a day the campaign already has (one day fewer), and past its last day (same count, new last)
+    onto_last = delivery[(delivery.campaign_id == first) & (delivery.date == days[first][0])].assign(
+        date=days[first][-1])
+    past_last = delivery[(delivery.campaign_id == second) & (delivery.date == days[second][-1])].assign(
+        date=str(pd.Timestamp(days[second][-1]).date() + pd.Timedelta(days=3)))
+
+    bronze_dir = str(tmp_path / "bronze")
+    landing = tmp_path / "landing"
+    landing.mkdir()
+    con = duckdb.connect()
+    con.execute("CREATE SCHEMA adops_bronze; CREATE SCHEMA adops_silver; CREATE SCHEMA adops_gold")
+    merge = to_duckdb_sql(generate_silver_delivery_merge_sql(catalog="memory", gold_schema="adops_gold"), "memory")
+    state = "SELECT * EXCLUDE (_state_updated_at) FROM adops_gold._campaign_delivery_state ORDER BY campaign_id"
+    for batch, frame in enumerate([delivery, pd.concat([onto_last, past_last])]):
+        frame.to_csv(landing / "03_delivery.csv", index=False)
+        lb.ingest_table("delivery", str(landing), bronze_dir, batch_id=f"d{batch}", mode="append")
+        _load(con, "delivery", bronze_dir)
+        if not batch:
+            con.execute(to_duckdb_sql(generate_silver_delivery_sql(catalog="memory"), "memory"))
+            con.execute(to_duckdb_sql(generate_gold_rollup_sql(catalog="memory"), "memory"))
+            con.execute(to_duckdb_sql(generate_gold_campaign_state_sql(catalog="memory"), "memory"))
+            con.execute(to_duckdb_sql(generate_gold_window_sql(catalog="memory"), "memory"))
+        con.execute(merge)      # the first sets the high-water mark; re-upserting d0 nets out
+    incremental = con.execute(state).df()
+
+    con.execute(to_duckdb_sql(generate_gold_rollup_sql(catalog="memory"), "memory"))
+    con.execute(to_duckdb_sql(generate_gold_campaign_state_sql(catalog="memory"), "memory"))
+    full = con.execute(state).df()
+    moved = full.set_index("campaign_id")
+    assert moved.loc[first, "days_with_delivery"] == len(days[first]) - 1
+    assert str(moved.loc[first, "first_delivery_date"].date()) == days[first][1]
+    assert str(moved.loc[second, "last_delivery_date"].date()) == past_last["date"].iloc[0]
+    pd.testing.assert_frame_equal(incremental, full, check_dtype=False)
+
+
+def test_window_advance_subtracts_expired_days(lab_data, tmp_path):
+    duckdb = pytest.importorskip("duckdb")
+    bronze_dir = str(tmp_path / "bronze")
+    lb.ingest_table("delivery", str(lab_data), bronze_dir, batch_id="d1")
+
+    con = duckdb.connect()
+    con.execute("CREATE SCHEMA adops_bronze; CREATE SCHEMA adops_silver; CREATE SCHEMA adops_gold")
+    _load(con, "delivery", bronze_dir)
+    con.execute(to_duckdb_sql(generate_silver_delivery_sql(catalog="memory"), "memory"))
+    con.execute(to_duckdb_sql(generate_gold_rollup_sql(catalog="memory"), "memory"))
+    last = con.execute("SELECT MAX(delivery_date) FROM adops_silver.delivery").fetchone()[0]
+    three_days_ago = last - pd.Timedelta(days=3)
+
+    def window():
+        return con.execute(f"SELECT * EXCLUDE (_window_updated_at) FROM adops_gold.{WINDOW_TABLE} "
+                           "WHERE delivery_rows <> 0 ORDER BY campaign_id").df()
+
+    con.execute(to_duckdb_sql(generate_gold_window_sql(catalog="memory"), "memory", today=last))
+    rebuilt = window()
+    con.execute(to_duckdb_sql(generate_gold_window_sql(catalog="memory"), "memory", today=three_days_ago))
+    assert not window().equals(rebuilt)
+
+    advance = to_duckdb_sql(generate_gold_window_advance_sql(catalog="memory"), "memory", today=last)
+    con.execute(advance)
+    pd.testing.assert_frame_equal(window(), rebuilt, check_dtype=False)
+    # Already current: the second advance matches nothing
+    assert con.execute(advance).fetchone()[0] == 0
+
+
+def test_campaign_performance_reads_the_window_the_builder_keeps():
+    for incremental in (False, True):
+        sql = generate_gold_campaign_performance_sql(incremental=incremental)
+        joins = set(re.findall(r"w\.window_days = (\d+)", sql))
+        assert joins == {str(PERFORMANCE_WINDOW_DAYS)} and PERFORMANCE_WINDOW_DAYS in TRAILING_WINDOWS
+    assert f"{PERFORMANCE_WINDOW_DAYS} as window_days" in generate_gold_window_sql()
+    with pytest.raises(ValueError):
+        generate_gold_campaign_performance_sql(window_days=PERFORMANCE_WINDOW_DAYS + 1)
+
+
+def test_refresh_builds_the_rollup_once_for_every_delivery_table(lab_data, tmp_path):
+    sql = generate_gold_refresh_sql()
+    assert sql.count("adops_silver.delivery") == 1
+    assert sql.count("TABLE hive_metastore.adops_gold.campaign_delivery_rollup AS") == 1
+    with pytest.raises(ValueError):
+        generate_gold_refresh_sql(["campaign_performance", "nope"])
+
+    duckdb = pytest.importorskip("duckdb")
+    bronze_dir = str(tmp_path / "bronze")
+    for table in ("campaigns", "delivery"):
+        lb.ingest_table(table, str(lab_data), bronze_dir, batch_id="b1")
+    con = duckdb.connect()
+    con.execute("CREATE SCHEMA adops_bronze; CREATE SCHEMA adops_silver; CREATE SCHEMA adops_gold")
+    _load(con, "campaigns", bronze_dir)
+    _load(con, "delivery", bronze_dir)
+    con.execute(to_duckdb_sql(generate_silver_campaign_sql(catalog="memory"), "memory"))
+    con.execute(to_duckdb_sql(generate_silver_delivery_sql(catalog="memory"), "memory"))
+    con.execute(to_duckdb_sql(generate_gold_refresh_sql(["daily_ops_summary", "platform_scorecard"],
+                                                      catalog="memory"), "memory"))
+
+    silver = con.execute("SELECT delivery_date, COUNT(DISTINCT campaign_id), SUM(impressions), "
+                         "ROUND(AVG(cpm), 2) FROM adops_silver.delivery GROUP BY 1 ORDER BY 1").fetchall()
+    daily = con.execute("SELECT delivery_date, active_campaigns, total_impressions, avg_cpm "
+                        "FROM adops_gold.daily_ops_summary ORDER BY 1").fetchall()
+    assert daily == silver
+    by_platform = con.execute("SELECT SUM(d.impressions), SUM(d.vast_errors) FROM adops_silver.delivery d "
+                              "JOIN adops_silver.campaigns c USING (campaign_id)").fetchone()
+    assert con.execute("SELECT SUM(total_impressions), SUM(total_vast_errors) "
+                       "FROM adops_gold.platform_scorecard").fetchone() == by_platform
@@ -0,0 +1,35 @@
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from src.pipelines import local_bronze as lb
+from src.pipelines.bronze_ingestion import BRONZE_SCHEMAS, IngestionRecord, REFERENCE_TABLES
+from src.pipelines.ingestion_ledger import IngestionLedger
+
+
+def test_parallel_load_records_every_table(lab_data, tmp_path):
+    ledger = IngestionLedger(str(tmp_path / "ledger" / "runs.sqlite"))
+    records = lb.load_all_parallel(str(lab_data), str(tmp_path / "bronze"), workers=4,
+                                   ledger=ledger, release="v1", batch_id="run1")
+    assert [r.table_name for r in records] == list(BRONZE_SCHEMAS) + list(REFERENCE_TABLES)
+    assert all(r.status == "success" and r.bytes_read > 0 for r in records)
+
+    runs = ledger.runs("run1")
+    assert len(runs) == len(records)
+    assert runs["row_count"].sum() == sum(r.row_count for r in records)
+    markets = ds.dataset(str(tmp_path / "bronze" / "markets")).to_table()
+    assert markets.num_rows > 0 and set(markets.schema.types[:-3]) == {pa.string()}
+
+
+def test_throughput_groups_by_release(tmp_path):
+    ledger = IngestionLedger(str(tmp_path / "ledger.sqlite"))
+    for run, release, secs in [("r1", "v1", 1.0), ("r2", "v1", 1.0), ("r3", "v2", 4.0)]:
+        rec = IngestionRecord("03_delivery.csv", "delivery", bytes_read=100, elapsed_sec=secs)
+        rec.mark_success(1000)
+        failed = IngestionRecord("02_campaigns.csv", "campaigns")
+        failed.mark_failed("boom")
+        ledger.record(run, [rec, failed], release=release)
+
+    view = ledger.throughput("delivery").set_index("release")
+    assert view.loc["v1", "runs"] == 2 and view.loc["v1", "avg_rows_per_sec"] == 1000
+    assert view.loc["v2", "avg_rows_per_sec"] == 250
+    assert ledger.query("SELECT COUNT(*) AS n FROM ingestion_ledger WHERE status = 'failed'")["n"][0] == 3
@@ -0,0 +1,203 @@
+import gzip
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pytest
+
+from src.pipelines import local_bronze as lb
+from src.pipelines.bronze_ingestion import BRONZE_SCHEMAS
+
+
+def test_ingest_all_uses_declared_types(lab_data, tmp_path):
+    records = lb.ingest_all(str(lab_data), str(tmp_path), batch_id="b1")
+    assert [r.status for r in records] == ["success"] * len(BRONZE_SCHEMAS)
+    for rec in records:
+        table = lb.read_bronze(rec.table_name, str(tmp_path))
+        assert table.num_rows == rec.row_count > 0
+        assert table.schema.equals(lb.arrow_schema(rec.table_name))
+        assert set(table.column("_batch_id").to_pylist()) == {"b1"}
+        assert set(table.column("_source_file").to_pylist()) == {rec.source_file}
+
+
+def test_delivery_is_date_partitioned_and_reloads_overwrite(lab_data, tmp_path):
+    first = lb.ingest_table("delivery", str(lab_data), str(tmp_path), batch_id="b1")
+    partitions = list((tmp_path / "delivery").glob("date=*/part-b1-0.parquet"))
+    assert len(partitions) > 1
+    # A full-file reload replaces the table; appending is explicit
+    lb.ingest_table("delivery", str(lab_data), str(tmp_path), batch_id="b2")
+    assert lb.read_bronze("delivery", str(tmp_path)).num_rows == first.row_count
+    lb.ingest_table("delivery", str(lab_data), str(tmp_path), batch_id="b3", mode="append")
+    assert lb.read_bronze("delivery", str(tmp_path)).num_rows == 2 * first.row_count
+    # Snapshot tables overwrite
+    lb.ingest_table("campaigns", str(lab_data), str(tmp_path), batch_id="b1")
+    again = lb.ingest_table("campaigns", str(lab_data), str(tmp_path), batch_id="b2")
+    assert lb.read_bronze("campaigns", str(tmp_path)).num_rows == again.row_count
+
+
+def test_optional_hour_is_kept_for_hourly_files_and_null_for_daily(tmp_path):
+    header = "delivery_id,campaign_id,date,impressions,clicks,ctr,spend_usd,vast_errors,viewability_rate"
+    (tmp_path / "hourly").mkdir()
+    (tmp_path / "hourly" / "03_delivery.csv").write_text(
+        f"{header},hour\nd1,CMP-0001,2026-02-01,10,1,0.1,1.0,0,0.5,7\n")
+    (tmp_path / "daily").mkdir()
+    (tmp_path / "daily" / "03_delivery.csv").write_text(f"{header}\nd2,CMP-0001,2026-02-01,10,1,0.1,1.0,0,0.5\n")
+    for source in ("hourly", "daily"):
+        assert lb.ingest_table("delivery", str(tmp_path / source), str(tmp_path / "bronze"),
+                               mode="append").status == "success"
+    table = lb.read_bronze("delivery", str(tmp_path / "bronze")).sort_by("delivery_id")
+    assert table.column("hour").to_pylist() == [7, None]
+
+    # A required column is still required
+    (tmp_path / "daily" / "03_delivery.csv").write_text(f"{header[:-17]}\nd3,CMP-0001,2026-02-01,10,1,0.1,1.0,0\n")
+    assert lb.ingest_table("delivery", str(tmp_path / "daily"), str(tmp_path / "bronze")).status == "failed"
+
+
+def test_bad_value_fails_the_record(tmp_path):
+    (tmp_path / "03_delivery.csv").write_text(
+        "delivery_id,campaign_id,date,impressions,clicks,ctr,spend_usd,vast_errors,viewability_rate\n"
+        "d1,CMP-0001,2026-02-01,lots,1,0.1,1.0,0,0.5\n"
+    )
+    rec = lb.ingest_table("delivery", str(tmp_path), str(tmp_path / "bronze"))
+    assert rec.status == "failed" and "lots" in rec.error
+    assert lb.ingest_table("campaigns", str(tmp_path), str(tmp_path / "bronze")).status == "failed"
+    with pytest.raises(ValueError):
+        lb.ingest_table("nope", str(tmp_path))
+
+
+def test_incremental_only_loads_new_files(lab_data, tmp_path):
+    landing = tmp_path / "landing"
+    landing.mkdir()
+    delivery = (lab_data / "03_delivery.csv").read_text().splitlines()
+    header, rows = delivery[0], delivery[1:]
+    for i in range(3):
+        (landing / f"delivery_{i:06d}.csv").write_text("\n".join([header] + rows[i::3]) + "\n")
+    bronze = str(tmp_path / "bronze")
+
+    first = lb.ingest_incremental("delivery", str(tmp_path), bronze, pattern="landing/*.csv")
+    assert [r.status for r in first] == ["success"] * 3
+    assert lb.ingest_incremental("delivery", str(tmp_path), bronze, pattern="landing/*.csv") == []
+
+    # A new drop, plus a re-send of an old file under a new name
+    (landing / "delivery_000003.csv").write_text(header + "\n" + rows[0] + "\n")
+    (landing / "delivery_000004.csv").write_text((landing / "delivery_000000.csv").read_text())
+    second = lb.ingest_incremental("delivery", str(tmp_path), bronze, pattern="landing/*.csv")
+    assert [r.source_file for r in second] == ["landing/delivery_000003.csv"]
+    assert lb.read_bronze("delivery", bronze).num_rows == len(rows) + 1
+
+
+def test_incremental_opens_one_file_at_a_time_and_closes_it(lab_data, tmp_path, monkeypatch):
+    landing = tmp_path / "landing"
+    landing.mkdir()
+    delivery = (lab_data / "03_delivery.csv").read_text().splitlines()
+    header, rows = delivery[0], delivery[1:]
+    for i in range(3):
+        (landing / f"delivery_{i:06d}.csv").write_text("\n".join([header] + rows[i::3]) + "\n")
+    (landing / "delivery_000003.csv").write_text("delivery_id,date\nd1,2026-02-01\n")
+
+    streams, open_input = [], lb._open_input
+
+    def tracked(path, memory_map=False):
+        assert all(s.closed for s in streams)
+        streams.append(open_input(path, memory_map))
+        return streams[-1]
+
+    monkeypatch.setattr(lb, "_open_input", tracked)
+    records = lb.ingest_incremental("delivery", str(tmp_path), str(tmp_path / "bronze"), pattern="landing/*.csv")
+    # The bad header fails alone, before anything is opened for reading
+    assert [r.status for r in records] == ["success"] * 3 + ["failed"]
+    assert "campaign_id" in records[3].error
+    assert len(streams) == 3 and all(s.closed for s in streams)
+
+
+def test_streamed_read_matches_whole_file_read(lab_data, tmp_path):
+    source = lab_data / "03_delivery.csv"
+    reader = lb.open_source(str(source), "delivery", block_size=4096)
+    batches = list(reader)
+    assert len(batches) > 1
+    whole = lb.read_source(str(source), "delivery")
+    assert pa.Table.from_batches(batches).equals(whole)
+
+    gz = tmp_path / "03_delivery.csv.gz"
+    gz.write_bytes(gzip.compress(source.read_bytes()))
+    rec = lb.ingest_table("delivery", str(tmp_path), str(tmp_path / "bronze"),
+                          source_file=gz.name, block_size=4096, memory_map=True)
+    assert rec.status == "success" and rec.row_count == whole.num_rows
+
+
+def test_failed_stream_rolls_back_its_files(lab_data, tmp_path):
+    bronze = str(tmp_path / "bronze")
+    good = lb.ingest_table("delivery", str(lab_data), bronze, batch_id="good")
+    # Bad value far enough in that earlier blocks were already written
+    lines = (lab_data / "03_delivery.csv").read_text().splitlines()
+    lines[-1] = lines[-1].replace(",", ",oops,", 1).rsplit(",", 1)[0]
+    (tmp_path / "03_delivery.csv").write_text("\n".join(lines) + "\n")
+    bad = lb.ingest_table("delivery", str(tmp_path), bronze, batch_id="bad", block_size=1024)
+    assert bad.status == "failed"
+    assert not list((tmp_path / "bronze" / "delivery").glob("*/part-bad-*"))
+    assert lb.read_bronze("delivery", bronze).num_rows == good.row_count
+
+
+def test_hive_partitioned_sources_take_date_from_the_path(lab_data, tmp_path):
+    whole = lb.read_source(str(lab_data / "03_delivery.csv"), "delivery")
+    day = whole["date"][0].as_py()
+    rows = whole.filter(pc.equal(whole["date"], day)).drop_columns(["date"])
+    part_dir = tmp_path / "landing" / "delivery" / f"date={day}"
+    part_dir.mkdir(parents=True)
+    pacsv.write_csv(rows, str(part_dir / "part-00000.csv"))
+
+    records = lb.ingest_incremental("delivery", str(tmp_path), str(tmp_path / "bronze"),
+                                    pattern="landing/delivery/**/*.csv")
+    assert [r.status for r in records] == ["success"]
+    loaded = lb.read_bronze("delivery", str(tmp_path / "bronze"))
+    assert loaded.num_rows == rows.num_rows
+    assert set(loaded["date"].to_pylist()) == {day}
+
+
+def test_empty_overwrite_leaves_an_empty_table(tmp_path):
+    schema = lb.arrow_schema("campaigns")
+    table_dir = str(tmp_path / "campaigns")
+    lb.write_parquet_table(iter([]), table_dir, batch_id="empty", mode="overwrite", schema=schema)
+    assert lb.read_bronze("campaigns", str(tmp_path)).num_rows == 0
+
+
+def test_failed_overwrite_swap_keeps_the_old_table(lab_data, tmp_path, monkeypatch):
+    bronze = str(tmp_path / "bronze")
+    old = lb.ingest_table("campaigns", str(lab_data), bronze, batch_id="old")
+    real_replace = lb.os.replace
+
+    def failing_replace(src, dst):
+        if ".staging-" in str(src):
+            raise OSError("disk full")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(lb.os, "replace", failing_replace)
+    one_row = lb.read_bronze("campaigns", bronze).slice(0, 1)
+    with pytest.raises(OSError, match="disk full"):
+        lb.write_parquet_table(one_row, str(tmp_path / "bronze" / "campaigns"), batch_id="new", mode="overwrite")
+    monkeypatch.undo()
+    # The live table came back from the aside copy; nothing staged or set aside is left
+    assert lb.read_bronze("campaigns", bronze).num_rows == old.row_count
+    assert sorted(p.name for p in (tmp_path / "bronze").iterdir()) == ["campaigns"]
+
+
+def test_incremental_snapshot_reverting_to_old_content_is_reloaded(lab_data, tmp_path):
+    campaigns = (lab_data / "02_campaigns.csv").read_text().splitlines()
+    bronze = str(tmp_path / "bronze")
+    for version, rows in enumerate([campaigns[1:3], campaigns[3:4], campaigns[1:3]]):
+        (tmp_path / "02_campaigns.csv").write_text("\n".join([campaigns[0]] + rows) + "\n")
+        records = lb.ingest_incremental("campaigns", str(tmp_path), bronze, batch_id=f"c{version}")
+        assert [r.status for r in records] == ["success"]
+    # Overwrite mode: Bronze holds the third snapshot, not the second one's row
+    assert lb.read_bronze("campaigns", bronze).num_rows == 2
+
+
+def test_incremental_snapshot_resent_under_a_new_name_is_reloaded(lab_data, tmp_path):
+    tickets = (lab_data / "04_tickets.csv").read_text().splitlines()
+    bronze = str(tmp_path / "bronze")
+    for version, rows in enumerate([tickets[1:3], tickets[3:4], tickets[1:3]], start=1):
+        (tmp_path / f"tickets_v{version}.csv").write_text("\n".join([tickets[0]] + rows) + "\n")
+        records = lb.ingest_incremental("tickets", str(tmp_path), bronze, pattern="tickets_v*.csv")
+        assert [r.source_file for r in records] == [f"tickets_v{version}.csv"]
+    # tickets_v3.csv has v1's content: the table is back to those two rows
+    assert lb.read_bronze("tickets", bronze)["_source_file"].to_pylist() == ["tickets_v3.csv"] * 2
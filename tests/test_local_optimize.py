@@ -0,0 +1,84 @@
+import glob
+
+import pyarrow.parquet as pq
+import pytest
+
+from src.pipelines import local_bronze as lb
+from src.pipelines import local_optimize as opt
+
+
+def _landed_bronze(lab_data, tmp_path, drops=4):
+    """Bronze delivery built from several micro-batches → many small files per date."""
+    lines = (lab_data / "03_delivery.csv").read_text().splitlines()
+    landing = tmp_path / "landing"
+    landing.mkdir()
+    for i in range(drops):
+        (landing / f"delivery_{i}.csv").write_text("\n".join([lines[0]] + lines[1 + i::drops]) + "\n")
+        lb.ingest_incremental("delivery", str(tmp_path), str(tmp_path / "bronze"), pattern="landing/*.csv")
+    return str(tmp_path / "bronze")
+
+
+def test_optimize_compacts_and_clusters(lab_data, tmp_path):
+    bronze = _landed_bronze(lab_data, tmp_path)
+    before = lb.read_bronze("delivery", bronze)
+
+    stats = opt.optimize_table("delivery", bronze, row_group_bytes=2048)
+    assert stats.files_added == stats.partitions_optimized < stats.files_removed
+    assert stats.rows == before.num_rows
+
+    after = lb.read_bronze("delivery", bronze)
+    key = [("delivery_id", "ascending")]
+    assert after.sort_by(key).equals(before.sort_by(key))
+    for part_dir, paths in opt._data_files(f"{bronze}/delivery").items():
+        assert len(paths) == 1
+        meta = pq.ParquetFile(paths[0]).metadata
+        col = meta.schema.names.index("campaign_id")
+        ranges = [(meta.row_group(g).column(col).statistics.min,
+                   meta.row_group(g).column(col).statistics.max) for g in range(meta.num_row_groups)]
+        # Sorted: row groups cover consecutive, non-overlapping campaign ranges
+        assert all(prev[1] <= nxt[0] for prev, nxt in zip(ranges, ranges[1:]))
+
+    # Already optimized → nothing to do
+    assert opt.optimize_table("delivery", bronze).partitions_optimized == 0
+
+
+def test_partitions_compacted_into_several_files_are_not_rewritten(lab_data, tmp_path):
+    bronze = _landed_bronze(lab_data, tmp_path)
+    first = opt.optimize_table("delivery", bronze, row_group_bytes=1024, file_bytes=4096)
+    assert first.files_added > first.partitions_optimized
+    assert opt.optimize_table("delivery", bronze, row_group_bytes=1024, file_bytes=4096).partitions_optimized == 0
+
+    # Only the partitions a new load lands in are rewritten
+    lines = (lab_data / "03_delivery.csv").read_text().splitlines()
+    (tmp_path / "late.csv").write_text("\n".join(lines[:2]) + "\n")
+    lb.ingest_table("delivery", str(tmp_path), bronze, source_file="late.csv", mode="append")
+    assert opt.optimize_table("delivery", bronze, row_group_bytes=1024, file_bytes=4096).partitions_optimized == 1
+
+
+@pytest.mark.parametrize("crash_on", ["os.remove", "os.replace"])
+def test_interrupted_optimize_is_finished_by_the_next_run(lab_data, tmp_path, monkeypatch, crash_on):
+    bronze = _landed_bronze(lab_data, tmp_path)
+    before = lb.read_bronze("delivery", bronze)
+    real = getattr(opt.os, crash_on.split(".")[1])
+    calls = []
+
+    def crash(src, *args):
+        # Die after the marker is in place: between the renames and the deletes,
+        # or halfway through the renames
+        calls.append(src)
+        if crash_on == "os.remove" or (len(calls) > 2 and str(src).endswith(".parquet.tmp")):
+            raise KeyboardInterrupt
+        return real(src, *args)
+
+    monkeypatch.setattr(opt.os, crash_on.split(".")[1], crash)
+    with pytest.raises(KeyboardInterrupt):
+        opt.optimize_table("delivery", bronze, row_group_bytes=1024, file_bytes=4096)
+    monkeypatch.undo()
+    assert glob.glob(f"{bronze}/delivery/**/_optimize-*.json", recursive=True)
+
+    assert opt.finish_interrupted(f"{bronze}/delivery") == 1
+    key = [("delivery_id", "ascending")]
+    assert lb.read_bronze("delivery", bronze).sort_by(key).equals(before.sort_by(key))
+    opt.optimize_table("delivery", bronze, row_group_bytes=1024, file_bytes=4096)
+    assert lb.read_bronze("delivery", bronze).sort_by(key).equals(before.sort_by(key))
+    assert not glob.glob(f"{bronze}/delivery/**/_optimize-*", recursive=True)
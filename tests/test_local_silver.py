@@ -0,0 +1,373 @@
+import hashlib
+from datetime import date
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pytest
+
+from src.pipelines import local_bronze as lb
+from src.pipelines import local_silver as ls
+from src.pipelines.local_sql import to_duckdb_sql
+from src.pipelines.silver_transforms import (
+    QUALITY_RULES,
+    compile_quality_checks,
+    decode_failed_mask,
+    error_mask,
+    generate_silver_campaign_sql,
+    generate_silver_delivery_sql,
+    generate_split_sql,
+)
+
+HEADER = "delivery_id,campaign_id,date,impressions,clicks,ctr,spend_usd,vast_errors,viewability_rate"
+EDGE_ROWS = [
+    "e-neg,CMP-0001,2026-02-01,-50,3,0.1,-2.5,-1,0.5",       # negatives clamped
+    "e-bot,CMP-0001,2026-02-01,10,40,4.0,1.25,0,1.7",        # clicks > impressions, viewability > 1
+    "e-zero,CMP-0002,2026-02-02,0,0,0,12.0,5,-0.3",          # zero delivery with spend
+    "e-null,CMP-0002,2026-02-02,,,,,,",                      # all metrics missing
+    "e-tie,CMP-0003,2026-02-03,1000,7,0.007,2.5,3,0.8125",   # landed twice in one file
+    "e-tie,CMP-0003,2026-02-03,1000,7,0.007,2.5,3,0.8125",
+]
+
+
+def _bronze_batches(lab_data, tmp_path):
+    """Ingest functions for three Bronze delivery batches: base, re-sent rows, edge cases."""
+    bronze_dir = str(tmp_path / "bronze")
+    lines = (lab_data / "03_delivery.csv").read_text().splitlines()
+    resend = [HEADER] + [",".join(r.split(",")[:3] + ["999"] + r.split(",")[4:]) for r in lines[1:40]]
+    (tmp_path / "resend.csv").write_text("\n".join(resend) + "\n")
+    (tmp_path / "edge.csv").write_text("\n".join([HEADER] + EDGE_ROWS) + "\n")
+
+    def ingest(source_dir, name, batch):
+        def run():
+            rec = lb.ingest_table("delivery", str(source_dir), bronze_dir, batch_id=batch,
+                                  source_file=name, mode="append")
+            assert rec.status == "success", rec.error
+        return run
+
+    return bronze_dir, [ingest(lab_data, None, "b1"), ingest(tmp_path, "resend.csv", "b2"),
+                        ingest(tmp_path, "edge.csv", "b3")]
+
+
+@pytest.fixture
+def bronze(lab_data, tmp_path):
+    """Bronze delivery with re-sent rows (later batch wins) and edge-case values."""
+    bronze_dir, batches = _bronze_batches(lab_data, tmp_path)
+    for ingest in batches:
+        ingest()
+    return bronze_dir
+
+
+def _duckdb_bronze(con, bronze_dir):
+    con.execute("CREATE SCHEMA IF NOT EXISTS adops_bronze; CREATE SCHEMA IF NOT EXISTS adops_silver")
+    con.register("bronze_delivery", lb.read_bronze("delivery", bronze_dir))
+    con.execute("CREATE OR REPLACE TABLE adops_bronze.delivery AS SELECT * FROM bronze_delivery")
+    con.unregister("bronze_delivery")
+
+
+def _run_sql(con, sql):
+    con.execute(to_duckdb_sql(sql, catalog="memory"))
+
+
+def test_silver_delivery_matches_sql(bronze, tmp_path):
+    duckdb = pytest.importorskip("duckdb")
+    silver_dir = str(tmp_path / "silver")
+    stats = ls.build_silver_delivery(bronze, silver_dir, batch_rows=64)
+    assert stats.duplicates_removed == 40
+
+    con = duckdb.connect()
+    _duckdb_bronze(con, bronze)
+    _run_sql(con, generate_silver_delivery_sql(catalog="memory"))
+    expected = con.execute(
+        "SELECT * EXCLUDE (_ingested_at, _silver_processed_at), epoch_us(_ingested_at) AS ingested_us "
+        "FROM adops_silver.delivery ORDER BY delivery_id"
+    ).arrow()
+    if isinstance(expected, pa.RecordBatchReader):
+        expected = expected.read_all()
+
+    got = ls.read_silver("delivery", silver_dir).sort_by("delivery_id")
+    assert got.num_rows == expected.num_rows == stats.rows_out
+    assert got["delivery_id"].to_pylist() == expected["delivery_id"].to_pylist()
+    assert pc.cast(got["_ingested_at"], pa.int64()).to_pylist() == expected["ingested_us"].to_pylist()
+    for name in ["campaign_id", "delivery_date", "impressions", "clicks", "vast_errors",
+                 "_suspicious_ctr", "_zero_delivery_nonzero_spend", "_source_file"]:
+        assert got[name].to_pylist() == expected[name].to_pylist(), name
+    for name in ["spend_usd", "ctr", "viewability_rate", "cpm", "cpc", "vast_error_rate"]:
+        for a, b in zip(got[name].to_pylist(), expected[name].to_pylist()):
+            assert (a is None and b is None) or a == pytest.approx(float(b), abs=1e-9), name
+
+
+def test_silver_delivery_rules(bronze, tmp_path):
+    ls.build_silver_delivery(bronze, str(tmp_path / "silver"))
+    rows = {r["delivery_id"]: r for r in ls.read_silver("delivery", str(tmp_path / "silver")).to_pylist()}
+    assert rows["e-neg"]["impressions"] == 0 and rows["e-neg"]["spend_usd"] == 0
+    assert rows["e-bot"]["_suspicious_ctr"] and rows["e-bot"]["viewability_rate"] == 1.0
+    assert rows["e-bot"]["ctr"] == 4.0 and rows["e-bot"]["cpc"] == 0.0313  # HALF_UP, like Spark
+    assert rows["e-zero"]["_zero_delivery_nonzero_spend"] and rows["e-zero"]["cpm"] is None
+    assert rows["e-null"]["impressions"] == 0 and rows["e-null"]["viewability_rate"] == 0.0
+    resent = [r for r in rows.values() if r["_source_file"] == "resend.csv"]
+    assert len(resent) == 39 and all(r["impressions"] == 999 for r in resent)
+
+
+def test_incremental_update_only_reads_new_batches(lab_data, tmp_path):
+    bronze_dir, batches = _bronze_batches(lab_data, tmp_path)
+    silver_dir = str(tmp_path / "silver")
+    batches[0]()
+    first = ls.update_silver_delivery(bronze_dir, silver_dir)
+    assert first.rows_in == first.rows_out > 0
+    assert ls.load_watermark(silver_dir, "delivery")["last_batch_id"] == "b1"
+
+    batches[1]()
+    resend = ls.update_silver_delivery(bronze_dir, silver_dir)
+    assert resend.rows_in == 39 and resend.rows_updated == 39 and resend.rows_out == 39
+    batches[2]()
+    edge = ls.update_silver_delivery(bronze_dir, silver_dir)
+    assert edge.rows_in == len(EDGE_ROWS) and edge.duplicates_removed == 1
+    assert ls.update_silver_delivery(bronze_dir, silver_dir).rows_in == 0
+    assert ls.load_watermark(silver_dir, "delivery")["last_batch_id"] == "b3"
+
+    full_dir = str(tmp_path / "silver_full")
+    ls.build_silver_delivery(bronze_dir, full_dir)
+    merged = ls.read_silver("delivery", silver_dir).sort_by("delivery_id")
+    full = ls.read_silver("delivery", full_dir).sort_by("delivery_id")
+    assert merged.drop_columns(["_silver_processed_at"]).equals(full.drop_columns(["_silver_processed_at"]))
+
+
+def test_merge_moves_a_resend_with_a_corrected_date(lab_data, tmp_path):
+    duckdb = pytest.importorskip("duckdb")
+    bronze_dir = str(tmp_path / "bronze")
+    silver_dir = str(tmp_path / "silver")
+    first = (lab_data / "03_delivery.csv").read_text().splitlines()[1].split(",")
+    moved = first[:2] + [str(date.fromisoformat(first[2]).replace(day=28))] + first[3:]
+    assert moved[2] != first[2]
+    (tmp_path / "corrected.csv").write_text("\n".join([HEADER, ",".join(moved)]) + "\n")
+
+    con = duckdb.connect()
+    for batch, (source_dir, name) in enumerate([(lab_data, None), (tmp_path, "corrected.csv")]):
+        lb.ingest_table("delivery", str(source_dir), bronze_dir, batch_id=f"b{batch}",
+                        source_file=name, mode="append")
+        stats = ls.update_silver_delivery(bronze_dir, silver_dir)
+        _duckdb_bronze(con, bronze_dir)
+        _run_sql(con, generate_silver_delivery_sql(catalog="memory", incremental=bool(batch)))
+    assert stats.rows_out == stats.rows_updated == 1
+
+    # One row for the id, in its corrected partition — as MERGE ... ON delivery_id leaves it
+    rows = ls.read_silver("delivery", silver_dir).filter(pc.equal(pc.field("delivery_id"), first[0]))
+    assert rows["delivery_date"].to_pylist() == [date.fromisoformat(moved[2])]
+    expected = con.execute("SELECT delivery_date FROM adops_silver.delivery WHERE delivery_id = ?",
+                           [first[0]]).fetchall()
+    assert expected == [(date.fromisoformat(moved[2]),)]
+    assert ls.read_silver("delivery", silver_dir).num_rows == \
+        con.execute("SELECT count(*) FROM adops_silver.delivery").fetchone()[0]
+
+
+def test_incremental_merge_sql_matches_full_rebuild(lab_data, tmp_path):
+    duckdb = pytest.importorskip("duckdb")
+    bronze_dir, batches = _bronze_batches(lab_data, tmp_path)
+    con = duckdb.connect()
+    batches[0]()
+    _duckdb_bronze(con, bronze_dir)
+    # Full build once, then one MERGE per new Bronze batch
+    _run_sql(con, generate_silver_delivery_sql(catalog="memory"))
+    _run_sql(con, generate_silver_delivery_sql(catalog="memory", incremental=True))
+    assert con.execute("SELECT count(*) FROM adops_silver._delivery_increment").fetchone()[0] > 0
+    for ingest in batches[1:]:
+        ingest()
+        _duckdb_bronze(con, bronze_dir)
+        _run_sql(con, generate_silver_delivery_sql(catalog="memory", incremental=True))
+        staged = con.execute("SELECT DISTINCT _batch_id FROM adops_silver._delivery_increment").fetchall()
+        assert len(staged) == 1
+    assert con.execute("SELECT last_batch_id FROM adops_silver._silver_watermarks").fetchall() == [("b3",)]
+
+    columns = "* EXCLUDE (_ingested_at, _silver_processed_at)"
+    merged = con.execute(f"SELECT {columns} FROM adops_silver.delivery ORDER BY delivery_id").fetchall()
+    _run_sql(con, generate_silver_delivery_sql(catalog="memory"))
+    assert merged == con.execute(f"SELECT {columns} FROM adops_silver.delivery ORDER BY delivery_id").fetchall()
+
+
+def test_incremental_quarantine_matches_split_build(lab_data, tmp_path):
+    duckdb = pytest.importorskip("duckdb")
+    bronze_dir, batches = _bronze_batches(lab_data, tmp_path)
+    silver_dir, quarantine_dir = str(tmp_path / "silver"), str(tmp_path / "quarantine")
+    con = duckdb.connect()
+    con.execute("CREATE SCHEMA adops_quarantine")
+    for batch, ingest in enumerate(batches):
+        ingest()
+        stats = ls.update_silver_delivery(bronze_dir, silver_dir, quarantine_dir=quarantine_dir)
+        _duckdb_bronze(con, bronze_dir)
+        # Split build once, then the hourly MERGE with the same routing
+        _run_sql(con, generate_silver_delivery_sql(catalog="memory", incremental=bool(batch),
+                                                   quarantine_schema="adops_quarantine"))
+    assert stats.rows_quarantined == 1 and stats.rows_in == len(EDGE_ROWS)
+
+    full_dir, full_quarantine_dir = str(tmp_path / "silver_full"), str(tmp_path / "quarantine_full")
+    ls.build_silver_delivery(bronze_dir, full_dir, quarantine_dir=full_quarantine_dir)
+    merged = ls.read_silver("delivery", silver_dir).sort_by("delivery_id")
+    full = ls.read_silver("delivery", full_dir).sort_by("delivery_id")
+    assert "e-neg" not in merged["delivery_id"].to_pylist()
+    assert merged.drop_columns(["_silver_processed_at"]).equals(full.drop_columns(["_silver_processed_at"]))
+
+    def routed(table):
+        return sorted(zip(table["delivery_id"].to_pylist(), table["_dq_failed_mask"].to_pylist()))
+
+    quarantine = pq.read_table(tmp_path / "quarantine" / "delivery_quarantine")
+    assert routed(quarantine) == routed(pq.read_table(tmp_path / "quarantine_full" / "delivery_quarantine"))
+    assert routed(quarantine) == con.execute("SELECT delivery_id, _dq_failed_mask FROM "
+                                             "adops_quarantine.delivery_quarantine ORDER BY ALL").fetchall()
+    sql_silver = con.execute("SELECT delivery_id FROM adops_silver.delivery ORDER BY delivery_id").fetchall()
+    assert [r[0] for r in sql_silver] == merged["delivery_id"].to_pylist()
+
+
+def _campaign_snapshots(lab_data, tmp_path):
+    """Two Bronze campaign snapshots: the lab data, then 5 status changes + 1 budget change."""
+    bronze_dir = str(tmp_path / "bronze")
+    source = pd.read_csv(lab_data / "02_campaigns.csv")
+    # Raw aliases Silver has to canonicalize (the lab data is already canonical)
+    source.loc[30, ["brand_code", "targeting_geo", "channel_mapped"]] = [" marvel", "United States", "Display Video"]
+    changed = source.copy()
+    changed.loc[:4, "status"] = ["Cancelled" if s == "Paused" else "Paused" for s in changed.loc[:4, "status"]]
+    changed.loc[10, "budget_usd"] = changed.loc[10, "budget_usd"] + 1000
+    changed.loc[20, "title_name"] = "renamed (not tracked)"
+
+    def ingest(frame, batch):
+        def run():
+            frame.to_csv(tmp_path / "02_campaigns.csv", index=False)
+            rec = lb.ingest_table("campaigns", str(tmp_path), bronze_dir, batch_id=batch)
+            assert rec.status == "success", rec.error
+        return run
+
+    return bronze_dir, source["campaign_id"].tolist(), [ingest(source, "c1"), ingest(changed, "c2")]
+
+
+def test_scd2_history_only_touches_changed_keys(lab_data, tmp_path):
+    bronze_dir, ids, snapshots = _campaign_snapshots(lab_data, tmp_path)
+    silver_dir = str(tmp_path / "silver")
+    snapshots[0]()
+    first = ls.update_silver_campaigns(bronze_dir, silver_dir)
+    assert first.rows_out == len(ids) and first.rows_updated == 0
+    opened_at = ls.read_silver("campaigns_history", silver_dir)["_valid_from"][0].as_py()
+    assert ls.update_silver_campaigns(bronze_dir, silver_dir).rows_in == 0
+
+    snapshots[1]()
+    second = ls.update_silver_campaigns(bronze_dir, silver_dir)
+    assert second.rows_in == len(ids)
+    assert second.rows_out == second.rows_updated == 6       # the title rename isn't tracked
+    history = ls.read_silver("campaigns_history", silver_dir)
+    assert history.num_rows == len(ids) + 6
+    assert sorted(pc.unique(history.filter(pc.invert(history["_is_current"]))["campaign_id"]).to_pylist()) \
+        == sorted(ids[:5] + [ids[10]])
+
+    before = {r["campaign_id"]: r for r in ls.campaigns_as_of(opened_at, silver_dir).to_pylist()}
+    now = {r["campaign_id"]: r for r in ls.campaigns_as_of(date(2100, 1, 1), silver_dir).to_pylist()}
+    assert len(before) == len(now) == len(ids)
+    assert before[ids[0]]["status"] != now[ids[0]]["status"]
+    assert before[ids[20]]["title_name"] != "renamed (not tracked)"
+    paused = ls.campaigns_as_of(opened_at, silver_dir, status="Paused")
+    assert set(paused["campaign_id"].to_pylist()) == {i for i, r in before.items() if r["status"] == "Paused"}
+
+
+def test_scd2_sql_matches_local_history(lab_data, tmp_path):
+    duckdb = pytest.importorskip("duckdb")
+    bronze_dir, ids, snapshots = _campaign_snapshots(lab_data, tmp_path)
+    silver_dir = str(tmp_path / "silver")
+    con = duckdb.connect()
+    con.execute("CREATE SCHEMA adops_bronze; CREATE SCHEMA adops_silver")
+    for ingest in snapshots:
+        ingest()
+        ls.update_silver_campaigns(bronze_dir, silver_dir)
+        con.register("bronze_campaigns", lb.read_bronze("campaigns", bronze_dir))
+        con.execute("CREATE OR REPLACE TABLE adops_bronze.campaigns AS SELECT * FROM bronze_campaigns")
+        con.unregister("bronze_campaigns")
+        _run_sql(con, generate_silver_campaign_sql(catalog="memory", scd2=True))
+
+    columns = ["campaign_id", "status", "budget_usd", "end_date", "impressions_goal", "platform",
+               "brand_code", "targeting_geo", "channel_mapped", "target_cpm", "flight_duration_days",
+               "_hash_diff", "_is_current"]
+    expected = con.execute(
+        f"SELECT {', '.join(columns)}, epoch_us(_valid_from) AS valid_from, epoch_us(_valid_to) AS valid_to "
+        "FROM adops_silver.campaigns_history ORDER BY campaign_id, _valid_from").fetchall()
+    got = ls.read_silver("campaigns_history", silver_dir).sort_by([("campaign_id", "ascending"),
+                                                                    ("_valid_from", "ascending")])
+    got_rows = list(zip(*[got[c].to_pylist() for c in columns],
+                        pc.cast(got["_valid_from"], pa.int64()).to_pylist(),
+                        pc.cast(got["_valid_to"], pa.int64()).to_pylist()))
+    assert len(got_rows) == len(expected) == len(ids) + 6
+    for a, b in zip(got_rows, expected):
+        assert a == pytest.approx(b)
+
+
+def test_hash_diff_formats_and_hashes_like_sql():
+    duckdb = pytest.importorskip("duckdb")
+    tracked = pa.table({"status": ["Active", None, "Paused", "Draft"],
+                        "budget_usd": [50000.0, 0.5, None, 2500.25],
+                        "end_date": [date(2026, 3, 1), None, date(2026, 4, 30), date(2026, 5, 2)],
+                        "impressions_goal": pa.array([500000, 8, None, 0], pa.int32())})
+    hash_input = ", ".join(f"COALESCE(CAST({c} AS STRING), '')" for c in tracked.column_names)
+    expected = duckdb.sql(to_duckdb_sql(f"SELECT md5(concat_ws('||', {hash_input})) FROM tracked")).fetchall()
+    assert ls.hash_diff(tracked).to_pylist() == [r[0] for r in expected]
+    # Spark's CAST(double AS STRING) is Java's Double.toString
+    doubles = pa.array([50000.0, 0.1, -0.0, 1e7, 1.5e20, 1e-5, float("nan")])
+    assert ls._sql_string(doubles).to_pylist() == \
+        ["50000.0", "0.1", "-0.0", "1.0E7", "1.5E20", "1.0E-5", "NaN"]
+    # Multi-block and non-ASCII messages, hashed for all rows at once
+    texts = ["", "x" * 55, "x" * 56, "y" * 130, "Pausé||1.0E7"]
+    assert ls.md5_hex(pa.array(texts)).to_pylist() == [hashlib.md5(t.encode()).hexdigest() for t in texts]
+
+
+def test_quality_checks_compile_once_per_distinct_rule():
+    checks = compile_quality_checks("delivery")
+    # QUALITY_RULES and ADOPS_QUALITY_SUITE share every delivery rule except the id check
+    assert len(checks) == 7 and all(c.aliases for c in checks[:6])
+    assert [c.bit for c in checks] == list(range(7))
+    # Routing is the baseline's: only QUALITY_RULES error checks quarantine
+    assert error_mask("delivery") == 1 | 2 | 32
+    assert not checks[6].quarantine and checks[6].name == "delivery_has_id"
+    assert decode_failed_mask("delivery", 1 | 4) == ["non_negative_impressions", "clicks_leq_impressions"]
+
+    table = pa.table({"status": ["Active", "Bogus", None], "x": [0.5, 2.0, None]})
+    status = ls.compile_predicate("status IN ('Active','Paused')").evaluate(table)
+    assert status.to_pylist() == [True, False, None]
+    in_range = ls.compile_predicate("NOT (x >= 0 AND x <= 1.0) OR status IS NULL")
+    assert in_range.evaluate(table).to_pylist() == [False, True, True]
+    assert in_range.columns == ("x", "status")
+
+
+def test_quarantine_routing_matches_baseline_error_rules():
+    for table, rules in QUALITY_RULES.items():
+        routed = {c.name for c in compile_quality_checks(table) if c.mask & error_mask(table)}
+        assert routed == {r["name"] for r in rules if r["severity"] == "error"}
+    assert (error_mask("campaigns"), error_mask("tickets")) == (1 | 2 | 4, 2)
+
+
+@pytest.mark.parametrize("rule", ["x BETWEEN 1 AND 2", "LENGTH(x) > 3", "x > 1 garbage"])
+def test_compile_predicate_rejects_unsupported_rules(rule):
+    with pytest.raises(ValueError, match="unsupported rule"):
+        ls.compile_predicate(rule)
+
+
+def test_split_routes_each_row_once_and_matches_sql(bronze, tmp_path):
+    duckdb = pytest.importorskip("duckdb")
+    silver_dir, quarantine_dir = str(tmp_path / "silver"), str(tmp_path / "quarantine")
+    stats = ls.build_silver_delivery(bronze, silver_dir, batch_rows=64, quarantine_dir=quarantine_dir)
+    quarantine = pq.read_table(tmp_path / "quarantine" / "delivery_quarantine")
+    assert stats.rows_quarantined == quarantine.num_rows > 0
+    assert "e-neg" in quarantine["delivery_id"].to_pylist()
+    silver_ids = set(ls.read_silver("delivery", silver_dir)["delivery_id"].to_pylist())
+    assert not silver_ids & set(quarantine["delivery_id"].to_pylist())
+
+    sql = generate_split_sql("delivery", catalog="memory")
+    assert sql.count("adops_bronze.delivery") == 1           # one Bronze scan
+    con = duckdb.connect()
+    _duckdb_bronze(con, bronze)
+    con.execute("CREATE SCHEMA adops_quarantine")
+    _run_sql(con, sql)
+    expected = con.execute("SELECT delivery_id, _dq_failed_mask FROM adops_quarantine.delivery_quarantine "
+                           "ORDER BY delivery_id, _dq_failed_mask").fetchall()
+    got = sorted(zip(quarantine["delivery_id"].to_pylist(), quarantine["_dq_failed_mask"].to_pylist()))
+    assert got == expected
+    sql_silver = {r[0] for r in con.execute("SELECT delivery_id FROM adops_silver.delivery").fetchall()}
+    assert sql_silver == silver_ids
+    # The checked relation is cached, not written as a table, and released at the end
+    assert "CACHE TABLE _delivery_checked AS" in sql and "CREATE OR REPLACE TABLE memory.adops_silver._" not in sql
+    assert not con.execute("SELECT * FROM duckdb_tables() WHERE table_name = '_delivery_checked'").fetchall()
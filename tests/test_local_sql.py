@@ -0,0 +1,100 @@
+import json
+
+import pandas as pd
+import pytest
+
+from src.pipelines import local_bronze as lb
+from src.pipelines.canonical import Canonicalizer
+from src.pipelines.gold_aggregations import generate_gold_campaign_performance_sql, generate_gold_refresh_sql
+from src.pipelines.local_sql import (
+    DuckDbBackend, run_medallion, save_timings, split_statements, statement_kind, to_duckdb_sql,
+)
+from src.pipelines.silver_transforms import generate_quality_checks_sql, generate_silver_delivery_merge_sql
+
+
+def test_translation_rewrites_databricks_calls_and_names():
+    sql = to_duckdb_sql(
+        "SELECT datediff(LEAST(current_date(), c.end_date), c.start_date), 'date_sub(x, 1)', "
+        "date_sub(current_date(), w.window_days), unix_timestamp(current_timestamp()) "
+        "FROM hive_metastore.adops_silver.campaigns c"
+    )
+    assert sql == (
+        "SELECT date_diff('day', CAST(c.start_date AS DATE), CAST(LEAST(current_date, c.end_date) AS DATE)), "
+        "'date_sub(x, 1)', (CAST(current_date AS DATE) - w.window_days), "
+        "epoch(CAST(current_timestamp AS TIMESTAMP)) FROM adops_silver.campaigns c"
+    )
+    assert to_duckdb_sql("SELECT date_sub(current_date(), 3)", today="2026-02-28") == \
+        "SELECT (CAST(DATE '2026-02-28' AS DATE) - 3)"
+    statements = split_statements("-- step 1; not a split\nCREATE TABLE a AS SELECT ';' x;\n"
+                                  "MERGE INTO hive_metastore.adops_gold.t USING s ON 1 = 1;\n-- done;\n")
+    assert [statement_kind(s) for s in statements] == [
+        ("CREATE", "a"), ("MERGE", "hive_metastore.adops_gold.t"),
+    ]
+
+
+def test_spark_backslash_escapes_become_standard_literals():
+    brand = Canonicalizer.compile("brand", [("Disney's Kids", "DK"), ("back\\slash", "BS")])
+    case = brand.sql_case(r"'  disney\'s kids '")
+    statements = split_statements(f"SELECT {case} AS a; SELECT 'it\\'s; (still one)' AS b")
+    assert len(statements) == 2
+    assert to_duckdb_sql(statements[1]) == "SELECT 'it''s; (still one)' AS b"
+    assert "IN ('disney''s kids', 'dk')" in to_duckdb_sql(statements[0])
+    assert "IN ('back\\slash', 'bs')" in to_duckdb_sql(statements[0])
+
+    duckdb = pytest.importorskip("duckdb")
+    con = duckdb.connect()
+    assert [con.execute(to_duckdb_sql(s)).fetchone()[0] for s in statements] == ["DK", "it's; (still one)"]
+    # The compiled-check lookup table quotes its rules the Spark way too
+    con.execute("CREATE SCHEMA adops_quarantine")
+    con.execute(to_duckdb_sql(generate_quality_checks_sql()))
+    rules = [r for (r,) in con.execute("SELECT rule FROM adops_quarantine._quality_checks").fetchall()]
+    assert any("'" in rule for rule in rules)
+
+
+def test_medallion_rerun_on_one_root_reloads_bronze_instead_of_appending(lab_data, tmp_path):
+    pytest.importorskip("duckdb")
+    root = str(tmp_path / "data")
+    bronze_dir = str(tmp_path / "data" / "bronze")
+    run_medallion(str(lab_data), root, batch_id="b1")
+    first = lb.read_bronze("delivery", bronze_dir).num_rows
+    timings = run_medallion(str(lab_data), root, batch_id="b2")
+    assert lb.read_bronze("delivery", bronze_dir).num_rows == first
+    ingested = {t.target: t.rows for t in timings if t.kind == "INGEST"}
+    assert ingested["adops_bronze.delivery"] == first
+
+
+def test_medallion_chain_runs_locally_and_reattaches(lab_data, tmp_path):
+    pytest.importorskip("duckdb")
+    root = str(tmp_path / "data")
+    timings = run_medallion(str(lab_data), root, batch_id="b1")
+    steps = {t.step for t in timings}
+    assert {"bronze", "silver.delivery", "quality.delivery", "gold"} <= steps
+    assert all(t.seconds >= 0 for t in timings)
+    assert (tmp_path / "data" / "gold" / "campaign_performance" / "part-0.parquet").exists()
+
+    report = save_timings(timings, str(tmp_path / "timings.json"), release="test")
+    assert json.loads((tmp_path / "timings.json").read_text())["release"] == "test"
+    assert report["total_seconds"] == pytest.approx(sum(report["steps"].values()), abs=1e-3)
+
+    # A new process sees the persisted tables; the hourly path runs against them
+    backend = DuckDbBackend(root)
+    count = "SELECT COUNT(*) AS n FROM hive_metastore.adops_silver.delivery"
+    before = backend.query(count)["n"][0].as_py()
+    lines = (lab_data / "03_delivery.csv").read_text().splitlines()
+    landing = tmp_path / "landing"
+    landing.mkdir()
+    (landing / "03_delivery.csv").write_text("\n".join([lines[0]] + [
+        line.replace(line.split(",")[0], line.split(",")[0] + "-late", 1) for line in lines[1:6]
+    ]) + "\n")
+    lb.ingest_table("delivery", str(landing), str(tmp_path / "data" / "bronze"), batch_id="b2", mode="append")
+    backend.attach()
+    backend.run(generate_silver_delivery_merge_sql(gold_schema="adops_gold"), "silver.merge")
+    backend.run(generate_gold_campaign_performance_sql(incremental=True), "gold.incremental")
+    assert backend.query(count)["n"][0].as_py() == before + 5
+    performance = "SELECT * EXCLUDE (_gold_refreshed_at) FROM hive_metastore.adops_gold.campaign_performance " \
+                  "ORDER BY campaign_id"
+    incremental = backend.query(performance).to_pandas()
+    backend.run(generate_gold_refresh_sql(["campaign_performance"]), "gold")
+    pd.testing.assert_frame_equal(incremental, backend.query(performance).to_pandas(), check_dtype=False)
+    # Re-persisting swapped the directories in; no staged or set-aside copies are left
+    assert not [p.name for p in (tmp_path / "data" / "gold").iterdir() if p.name.startswith(".")]
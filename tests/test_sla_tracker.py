@@ -0,0 +1,142 @@
+import sqlite3
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pytest
+
+from src.pipelines import local_bronze as lb
+from src.pipelines.silver_transforms import generate_silver_tickets_breach_sql, generate_silver_tickets_sql
+from src.pipelines.sla_tracker import SlaTracker
+
+
+def _tickets(rows):
+    names = ("ticket_id", "due_date", "stage", "urgency", "assignee")
+    return pa.table({name: pa.array([r[i] for r in rows], pa.string()) for i, name in enumerate(names)})
+
+
+def test_tick_returns_only_newly_breached(tmp_path):
+    tracker = SlaTracker.for_silver(str(tmp_path))
+    assert tracker.last_sync() is None
+    synced = tracker.sync(_tickets([
+        ("T1", "2026-02-01 08:00", "New", "High", "Ana"),
+        ("T2", "2026-02-02 08:00", "QA", "Low", None),
+        ("T3", "2026-02-03", "Trafficking", "Medium", "Bo"),
+        ("T4", "2026-02-01 09:00", "Completed", "High", "Cy"),
+        ("T5", "not a date", "New", "High", "Di"),
+    ]))
+    assert synced == {"tracked": 3, "removed": 2}
+    assert tracker.last_sync() is not None
+    assert tracker.next_due() == "2026-02-01 08:00:00"
+
+    first = tracker.tick(datetime(2026, 2, 2, 12, 0))
+    assert [b.ticket_id for b in first] == ["T1", "T2"]
+    assert first[1].as_alert()["fields"] == {"Ticket ID": "T2", "Urgency": "Low", "Assignee": "Unassigned"}
+    assert tracker.tick(datetime(2026, 2, 2, 13, 0)) == []
+    # Aware datetimes are converted to UTC
+    assert [b.ticket_id for b in tracker.tick(datetime(2026, 2, 3, 0, 1, tzinfo=timezone.utc))] == ["T3"]
+
+    # Re-sync: an unchanged deadline doesn't re-alert, a moved one re-arms,
+    # a completed ticket leaves the index
+    tracker.sync(_tickets([
+        ("T1", "2026-02-01 08:00", "New", "High", "Ana"),
+        ("T2", "2026-02-10 08:00", "QA", "Low", None),
+        ("T3", "2026-02-03", "Live", "Medium", "Bo"),
+    ]))
+    assert [b.ticket_id for b in tracker.breached()] == ["T1"]
+    assert tracker.tick(datetime(2026, 2, 5)) == []
+    assert [b.ticket_id for b in tracker.tick(datetime(2026, 2, 11))] == ["T2"]
+    assert tracker.last_tick() == "2026-02-11 00:00:00"
+
+
+def test_tick_is_an_index_range_scan(tmp_path):
+    tracker = SlaTracker.for_silver(str(tmp_path))
+    conn = sqlite3.connect(tracker.path)
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT ticket_id FROM sla_deadlines INDEXED BY ix_sla_pending "
+        "WHERE breached_at IS NULL AND due_at < '2026-02-01' ORDER BY due_at"
+    ).fetchall()
+    conn.close()
+    assert any("USING INDEX ix_sla_pending (due_at<?)" in row[-1] for row in plan)
+
+
+def test_breach_update_sql_matches_rebuild_and_tracker(lab_data, tmp_path):
+    duckdb = pytest.importorskip("duckdb")
+    bronze = str(tmp_path / "bronze")
+    lb.ingest_table("tickets", str(lab_data), bronze, batch_id="b1")
+    tickets = lb.read_bronze("tickets", bronze)
+
+    con = duckdb.connect()
+    con.execute("CREATE SCHEMA adops_bronze; CREATE SCHEMA adops_silver")
+    con.register("bronze_tickets", tickets)
+    con.execute("CREATE TABLE adops_bronze.tickets AS SELECT * FROM bronze_tickets")
+
+    def run(sql):
+        # duckdb: current_timestamp without parentheses, epoch() for unix_timestamp()
+        con.execute(sql.replace("current_timestamp()", "current_timestamp").replace("unix_timestamp(", "epoch("))
+
+    run(generate_silver_tickets_sql(catalog="memory"))
+    rebuilt = {t for (t,) in con.execute("SELECT ticket_id FROM adops_silver.tickets WHERE is_breached").fetchall()}
+    assert rebuilt
+
+    # As if the table was built long ago: nothing breached yet, then one incremental pass
+    con.execute("UPDATE adops_silver.tickets SET is_breached = false")
+    run(generate_silver_tickets_breach_sql(catalog="memory"))
+    updated = {t for (t,) in con.execute("SELECT ticket_id FROM adops_silver.tickets WHERE is_breached").fetchall()}
+    assert updated == rebuilt
+
+    tracker = SlaTracker.for_silver(str(tmp_path / "silver"))
+    tracker.sync(tickets)
+    assert {b.ticket_id for b in tracker.tick()} == rebuilt
+
+
+def test_full_snapshot_sync_drops_deleted_tickets(tmp_path):
+    tracker = SlaTracker.for_silver(str(tmp_path))
+    tracker.sync(_tickets([("T1", "2026-02-01", "New", "High", "Ana"),
+                           ("T2", "2026-02-01", "New", "High", "Bo")]))
+    # A partial batch leaves the others alone; a full snapshot without T2 drops it
+    assert tracker.sync(_tickets([("T1", "2026-02-01", "New", "High", "Ana")]), snapshot=False)["removed"] == 0
+    assert tracker.sync(_tickets([("T1", "2026-02-01", "New", "High", "Ana")])) == {"tracked": 1, "removed": 1}
+    assert [b.ticket_id for b in tracker.tick(datetime(2026, 2, 2))] == ["T1"]
+
+
+def test_ingestion_syncs_the_tracker_and_the_health_check_only_ticks(lab_data, tmp_path, monkeypatch):
+    pytest.importorskip("pyairtable")
+    from src.orchestrator import Orchestrator
+
+    tracker = SlaTracker.for_silver(str(tmp_path / "silver"))
+    bronze = str(tmp_path / "bronze")
+    orchestrator = Orchestrator(sla_tracker=tracker)
+    orchestrator.airtable.get_breached_tickets = lambda: ["from airtable"]
+
+    # Never synced (no tickets landed yet): the Airtable scan still answers
+    assert orchestrator._breached_tickets() == ["from airtable"]
+    assert tracker.last_sync() is None
+
+    lb.ingest_table("tickets", str(lab_data), bronze, batch_id="b1", sla_tracker=tracker)
+    assert tracker.last_sync() is not None
+    monkeypatch.setattr(tracker, "sync", lambda *a, **k: pytest.fail("health check re-synced"))
+    first = orchestrator._breached_tickets()
+    assert first and {a["id"] for a in first} == {b.ticket_id for b in tracker.breached()}
+    assert orchestrator._breached_tickets() == []
+
+
+def test_ingestion_syncs_the_landed_batch_without_reading_bronze(lab_data, tmp_path, monkeypatch):
+    monkeypatch.setattr(lb, "read_bronze", lambda *a, **k: pytest.fail("read Bronze back to sync"))
+    bronze = str(tmp_path / "bronze")
+    tracker = SlaTracker.for_silver(str(tmp_path / "silver"))
+    lb.load_all_parallel(str(lab_data), bronze, batch_id="b1", sla_tracker=tracker)
+
+    def tracked():
+        conn = sqlite3.connect(tracker.path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM sla_deadlines").fetchone()[0]
+        finally:
+            conn.close()
+
+    snapshot = tracked()
+    assert snapshot > 0
+    # An appended batch is synced on its own: it doesn't drop the tickets already tracked
+    lines = (lab_data / "04_tickets.csv").read_text().splitlines()
+    (tmp_path / "04_tickets.csv").write_text("\n".join(lines[:2]) + "\n")
+    lb.ingest_table("tickets", str(tmp_path), bronze, batch_id="b2", mode="append", sla_tracker=tracker)
+    assert tracked() == snapshot